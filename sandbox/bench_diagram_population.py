@@ -0,0 +1,33 @@
+import sys
+import os
+import time
+
+sys.path.append(os.getcwd())
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+if __name__ == "__main__":
+    from uml_interpreter.deserializer.enterprise_architect.ea_xml_deserializer import (
+        EAXMLDeserializer,
+    )
+    from synthetic_xmi import synthetic_xmi
+
+    CLASSES = 20_000
+    MEMBERS_PER_DIAGRAM = 200
+
+    print("diagrams  memberships  time [s]  time per membership [us]")
+    for diagrams in (25, 50, 100, 200, 400):
+        deserializer = EAXMLDeserializer.from_string(
+            synthetic_xmi(CLASSES, diagrams, MEMBERS_PER_DIAGRAM, attrs=0, meths=0)
+        )
+        tree = deserializer.source.read_tree()
+        root = deserializer._get_root(tree)
+        deserializer._parse_elems(deserializer._get_mandatory_node(root, "model"))
+
+        start = time.perf_counter()
+        deserializer._parse_diagrams(root)
+        elapsed = time.perf_counter() - start
+
+        memberships = diagrams * MEMBERS_PER_DIAGRAM
+        print(
+            f"{diagrams:8d}  {memberships:11d}  {elapsed:8.4f}  {elapsed / memberships * 1e6:10.3f}"
+        )
@@ -0,0 +1,48 @@
+import sys
+import os
+import random
+import time
+
+sys.path.append(os.getcwd())
+
+if __name__ == "__main__":
+    from uml_interpreter.model.diagrams.class_diagram import (
+        ClassDiagram,
+        ClassDiagramClass,
+        RelationshipType,
+    )
+    from uml_interpreter.model.model import UMLModel
+
+    NODES = 100_000
+    EDGES_PER_NODE = 2
+
+    random.seed(0)
+    elements = [ClassDiagramClass(f"Class {index}") for index in range(NODES)]
+    for index, elem in enumerate(elements[1:], 1):
+        # Single inheritance tree and random dependencies, some of them forming cycles.
+        elem.add_relationship_to(
+            elements[random.randrange(index)], RelationshipType.Generalization
+        )
+        for _ in range(EDGES_PER_NODE):
+            elem.add_relationship_to(elements[random.randrange(NODES)])
+    model = UMLModel(diagrams=[ClassDiagram("Synthetic", elements)])
+    model.index
+
+    def timed(label, run):
+        start = time.perf_counter()
+        result = run()
+        print(f"{label:40s} {time.perf_counter() - start:8.3f}s")
+        return result
+
+    graph = model.graph
+    timed("strongly connected components", graph.strongly_connected_components)
+    timed("cycles (memoized components)", graph.cycles)
+    timed(
+        "topological order (Generalization)",
+        lambda: graph.topological_order([RelationshipType.Generalization]),
+    )
+    timed("superclasses of the last element", lambda: graph.superclasses(elements[-1]))
+    timed("reachable from the last element", lambda: graph.reachable_from(elements[-1]))
+    timed("reachable from (memoized)", lambda: graph.reachable_from(elements[-1]))
+    elements[0].add_relationship_to(elements[1])
+    timed("components after adding relationship", graph.strongly_connected_components)
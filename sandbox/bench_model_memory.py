@@ -0,0 +1,65 @@
+import sys
+import os
+import gc
+import tracemalloc
+
+sys.path.append(os.getcwd())
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+if __name__ == "__main__":
+    from uml_interpreter.deserializer.enterprise_architect.ea_xml_deserializer import (
+        EAXMLDeserializer,
+    )
+    from uml_interpreter.model.diagrams.class_diagram import (
+        ClassDiagramAttribute,
+        ClassDiagramClass,
+        ClassDiagramMethod,
+        ClassDiagramMethodParameter,
+        ClassRelationship,
+    )
+    from synthetic_xmi import synthetic_xmi
+
+    OBJECTS = 100_000
+
+    def bytes_per_object(create) -> float:
+        """
+        Memory allocated per object, excluding the values it refers to.
+        """
+        gc.collect()
+        tracemalloc.start()
+        objects = [create() for _ in range(OBJECTS)]
+        allocated, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        # List holding the objects is not a part of their size.
+        allocated -= sys.getsizeof(objects)
+        return allocated / len(objects)
+
+    print("class                                bytes/object")
+    for cls, create in (
+        (ClassDiagramClass, lambda: ClassDiagramClass("name")),
+        (ClassDiagramAttribute, lambda: ClassDiagramAttribute("name", "int")),
+        (ClassDiagramMethod, lambda: ClassDiagramMethod("name", "void")),
+        (ClassDiagramMethodParameter, lambda: ClassDiagramMethodParameter("name", "int")),
+        (ClassRelationship, lambda: ClassRelationship()),
+        (ClassRelationship.RelationshipSide, lambda: ClassRelationship.RelationshipSide()),
+    ):
+        print(f"{cls.__qualname__:36s} {bytes_per_object(create):12.1f}")
+
+    CLASSES = 20_000
+    xmi = synthetic_xmi(
+        CLASSES, members_per_diagram=CLASSES, attrs=10, meths=10, associations=CLASSES
+    )
+    objects = CLASSES * (1 + 10 + 10 * 2) + CLASSES * 3
+
+    gc.collect()
+    tracemalloc.start()
+    model = EAXMLDeserializer.from_string(xmi).read_model()
+    del xmi
+    gc.collect()
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(
+        f"\nsynthetic model: {CLASSES} classes with 10 attributes and 10 methods, "
+        f"{CLASSES} associations"
+    )
+    print(f"{allocated / 2**20:.1f} MiB, {allocated / objects:.1f} bytes/object")
@@ -0,0 +1,60 @@
+import sys
+import os
+import pickle
+import tempfile
+import time
+
+sys.path.append(os.getcwd())
+
+if __name__ == "__main__":
+    from uml_interpreter.model.diagrams.class_diagram import (
+        ClassDiagram,
+        ClassDiagramAttribute,
+        ClassDiagramClass,
+    )
+    from uml_interpreter.model.model import UMLModel
+    from uml_interpreter.model.snapshot import ModelSnapshot
+
+    NODES = 100_000
+
+    elements = [ClassDiagramClass(f"Class {index}") for index in range(NODES)]
+    for index, elem in enumerate(elements):
+        elem.id = f"EAID_{index}"
+        elem.attributes = [ClassDiagramAttribute("attr", "int") for _ in range(3)]
+        if index:
+            elem.add_relationship_to(elements[index // 2])
+    model = UMLModel(diagrams=[ClassDiagram("Diagram", elements)])
+
+    with tempfile.TemporaryDirectory() as directory:
+        snapshot_path = os.path.join(directory, "model.snap")
+        pickle_path = os.path.join(directory, "model.pickle")
+
+        start = time.perf_counter()
+        model.save_snapshot(snapshot_path)
+        print(f"Snapshot written in {time.perf_counter() - start:.2f}s, "
+              f"{os.path.getsize(snapshot_path) / 2**20:.1f} MiB")
+
+        with open(pickle_path, "wb") as file:
+            pickle.dump(model, file)
+
+        start = time.perf_counter()
+        with open(pickle_path, "rb") as file:
+            pickle.load(file)
+        print(f"Pickle loaded in {time.perf_counter() - start:.2f}s")
+
+        start = time.perf_counter()
+        snapshot = ModelSnapshot.open(snapshot_path)
+        opened = snapshot.model()
+        elem = snapshot.element(NODES // 3)
+        print(f"Snapshot opened and element read in {time.perf_counter() - start:.4f}s: "
+              f"{elem.name}, {len(elem.relations_from)} relationships from")
+
+        start = time.perf_counter()
+        len(opened.diagrams[0].elements)
+        print(f"Diagram's elements read in {time.perf_counter() - start:.2f}s")
+
+        start = time.perf_counter()
+        opened.get_by_id("EAID_7")
+        print(f"Snapshot indexed in {time.perf_counter() - start:.2f}s")
+        del opened, elem
+        snapshot.close()
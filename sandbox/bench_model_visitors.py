@@ -0,0 +1,65 @@
+import sys
+import os
+import time
+
+sys.path.append(os.getcwd())
+
+if __name__ == "__main__":
+    from uml_interpreter.model.diagrams.class_diagram import (
+        ClassDiagram,
+        ClassDiagramAttribute,
+        ClassDiagramClass,
+        ClassDiagramMethod,
+    )
+    from uml_interpreter.model.model import UMLModel
+    from uml_interpreter.visitor.model_visitor import ModelVisitor
+    from uml_interpreter.visitor.walker import walk_visitor, walk_visitors
+
+    NODES = 100_000
+
+    class ElementCounter(ModelVisitor):
+        walked = True
+        count = 0
+
+        def visit_class_diagram_class(self, elem):
+            self.count += 1
+
+    class AttributeCounter(ModelVisitor):
+        walked = True
+        count = 0
+
+        def visit_class_diagram_attribute(self, attr):
+            self.count += 1
+
+    class UntypedMethods(ModelVisitor):
+        walked = True
+        found = 0
+
+        def visit_diagram_method(self, meth):
+            self.found += not meth.ret_type
+
+    elements = [ClassDiagramClass(f"Class {index}") for index in range(NODES)]
+    for elem in elements:
+        elem.attributes = [ClassDiagramAttribute("attr", "int") for _ in range(3)]
+        elem.methods = [ClassDiagramMethod("meth", "void")]
+    for source, target in zip(elements, elements[1:]):
+        source.add_relationship_to(target)
+    model = UMLModel(diagrams=[ClassDiagram("Synthetic", elements)])
+
+    def timed(label, run):
+        start = time.perf_counter()
+        run()
+        print(f"{label:40s} {time.perf_counter() - start:8.3f}s")
+
+    timed("walk only", lambda: sum(1 for _ in model.walk()))
+    timed(
+        "3 visitors, one walk each",
+        lambda: [
+            walk_visitor(visitor, model)
+            for visitor in (ElementCounter(), AttributeCounter(), UntypedMethods())
+        ],
+    )
+    timed(
+        "3 visitors, single fused walk",
+        lambda: walk_visitors([ElementCounter(), AttributeCounter(), UntypedMethods()], model),
+    )
@@ -0,0 +1,97 @@
+"""
+Generator of synthetic Enterprise Architect XMI documents used by the benchmarks.
+"""
+
+XMI_HEADER = (
+    "<?xml version='1.0' encoding='utf-8' ?>\n"
+    '<xmi:XMI xmlns:xmi="http://schema.omg.org/spec/XMI/2.1" xmi:version="2.1" '
+    'xmlns:uml="http://schema.omg.org/spec/UML/2.1">\n'
+    '<uml:Model xmi:type="uml:Model" name="EA_Model" visibility="public">\n'
+    '<packagedElement xmi:type="uml:Package" xmi:id="EAPK_SYNTHETIC" name="Synthetic">\n'
+)
+
+INTEGER_HREF = "http://schema.omg.org/spec/UML/2.1/uml.xml#Integer"
+
+
+def class_id(index: int) -> str:
+    return f"EAID_C{index:011d}"
+
+
+def association_id(index: int) -> str:
+    return f"EAID_A{index:011d}"
+
+
+def _class_xml(index: int, attrs: int, meths: int) -> str:
+    parts = [
+        f'<packagedElement xmi:type="uml:Class" xmi:id="{class_id(index)}" name="Class {index}">'
+    ]
+    for attr in range(attrs):
+        parts.append(
+            f'<ownedAttribute xmi:type="uml:Property" xmi:id="EAID_AT{index:07d}_{attr:03d}" '
+            f'name="attr_{attr}"><type xmi:type="uml:PrimitiveType" href="{INTEGER_HREF}"/>'
+            "</ownedAttribute>"
+        )
+    for meth in range(meths):
+        parts.append(
+            f'<ownedOperation xmi:id="EAID_OP{index:07d}_{meth:03d}" name="op_{meth}">'
+            f'<ownedParameter xmi:id="EAID_PA{index:07d}_{meth:03d}" name="param" direction="in">'
+            f'<type xmi:type="uml:PrimitiveType" href="{INTEGER_HREF}"/></ownedParameter>'
+            f'<ownedParameter xmi:id="EAID_RT{index:07d}_{meth:03d}" name="return" '
+            'direction="return" type="EAnone_void"/></ownedOperation>'
+        )
+    parts.append("</packagedElement>")
+    return "".join(parts)
+
+
+def _end_xml(kind: str, rel_id: str, elem_id: str) -> str:
+    return (
+        f'<ownedEnd xmi:type="uml:Property" xmi:id="EAID_{kind}{rel_id[8:]}">'
+        f'<type xmi:idref="{elem_id}"/>'
+        '<lowerValue xmi:type="uml:LiteralInteger" value="0"/>'
+        '<upperValue xmi:type="uml:LiteralUnlimitedNatural" value="-1"/>'
+        "</ownedEnd>"
+    )
+
+
+def _association_xml(index: int, source: int, target: int) -> str:
+    rel_id = association_id(index)
+    return (
+        f'<packagedElement xmi:type="uml:Association" xmi:id="{rel_id}" name="Association {index}">'
+        + _end_xml("dst", rel_id, class_id(target))
+        + _end_xml("src", rel_id, class_id(source))
+        + "</packagedElement>"
+    )
+
+
+def synthetic_xmi(
+    classes: int,
+    diagrams: int = 1,
+    members_per_diagram: int = 0,
+    attrs: int = 2,
+    meths: int = 2,
+    associations: int = 0,
+) -> str:
+    """
+    Returns a document with the given number of classes, associations between
+    consecutive classes and diagrams, each showing a window of consecutive classes.
+    """
+    parts = [XMI_HEADER]
+    parts.extend(_class_xml(index, attrs, meths) for index in range(classes))
+    parts.extend(
+        _association_xml(index, index % classes, (index + 1) % classes)
+        for index in range(associations)
+    )
+    parts.append("</packagedElement>\n</uml:Model>\n")
+    parts.append('<xmi:Extension extender="Enterprise Architect">\n<diagrams>\n')
+    for diag in range(diagrams):
+        parts.append(
+            f'<diagram xmi:id="EAID_D{diag:011d}"><properties name="Diagram {diag}" type="Logical"/><elements>'
+        )
+        start = diag * members_per_diagram
+        parts.extend(
+            f'<element subject="{class_id((start + member) % classes)}"/>'
+            for member in range(members_per_diagram)
+        )
+        parts.append("</elements></diagram>\n")
+    parts.append("</diagrams>\n</xmi:Extension>\n</xmi:XMI>\n")
+    return "".join(parts)
@@ -0,0 +1,27 @@
+from __future__ import annotations
+from pathlib import Path
+
+from uml_interpreter.deserializer.enterprise_architect.batch import load_models
+from uml_interpreter.deserializer.errors import InvalidXMLError
+
+
+SAMPLE_PATH = Path(__file__).parents[3] / "samples" / "sample_1.xml"
+
+
+def test_when_load_models_in_pool_then_results_in_order_with_errors(tmp_path: Path) -> None:
+    # GIVEN
+    invalid_path = tmp_path / "invalid.xml"
+    invalid_path.write_text("<xmi:XMI")
+    paths = [SAMPLE_PATH, invalid_path, SAMPLE_PATH]
+
+    # WHEN
+    results = load_models(paths, jobs=2)
+
+    # THEN
+    assert [result.path for result in results] == [str(path) for path in paths]
+    assert [result.ok for result in results] == [True, False, True]
+    assert isinstance(results[1].error, InvalidXMLError)
+    class_a = next(
+        elem for elem in results[0].model.diagrams[0].elements if elem.name == "Class A"
+    )
+    assert sorted(rel.target.name for rel in class_a.relations_to) == ["Class B", "Class C"]
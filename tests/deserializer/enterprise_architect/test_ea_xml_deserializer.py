@@ -0,0 +1,383 @@
+from __future__ import annotations
+from pathlib import Path
+
+import pytest
+
+from uml_interpreter.deserializer.enterprise_architect.ea_xml_deserializer import (
+    EAXMLDeserializer,
+)
+from uml_interpreter.deserializer.errors import InvalidXMLError
+from uml_interpreter.model.diagrams.class_diagram import ClassDiagram, RelationshipType
+from uml_interpreter.model.model import UMLModel
+from uml_interpreter.source.cache import ParseCache
+from uml_interpreter.source.source import FileSource, StringSource
+
+
+SAMPLE_PATH = Path(__file__).parents[3] / "samples" / "sample_1.xml"
+
+
+def model_summary(model: UMLModel) -> list[tuple]:
+    return [
+        (
+            diagram.name,
+            [
+                (
+                    elem.id,
+                    elem.name,
+                    [(attr.name, attr.type) for attr in elem.attributes],
+                    [(meth.name, meth.ret_type) for meth in elem.methods],
+                    [(rel.id, rel.source.id, rel.target.id) for rel in elem.relations_to],
+                )
+                for elem in diagram.elements
+            ],
+        )
+        for diagram in model.diagrams
+    ]
+
+
+def test_when_read_model_streaming_then_same_as_tree() -> None:
+    # GIVEN
+    tree_deserializer = EAXMLDeserializer.from_path(str(SAMPLE_PATH))
+    streaming_deserializer = EAXMLDeserializer.from_path(str(SAMPLE_PATH), streaming=True)
+
+    # WHEN
+    tree_model = tree_deserializer.read_model()
+    streaming_model = streaming_deserializer.read_model()
+
+    # THEN
+    assert isinstance(streaming_model.diagrams[0], ClassDiagram)
+    assert model_summary(streaming_model) == model_summary(tree_model)
+    assert streaming_model.filename == str(SAMPLE_PATH)
+
+
+def test_when_streaming_without_diagrams_then_error_raised() -> None:
+    # GIVEN
+    TEST_XML = (
+        '<xmi:XMI xmlns:xmi="http://schema.omg.org/spec/XMI/2.1" '
+        'xmlns:uml="http://schema.omg.org/spec/UML/2.1">'
+        '<uml:Model xmi:type="uml:Model" name="EA_Model"/>'
+        "<xmi:Extension/>"
+        "</xmi:XMI>"
+    )
+    deserializer = EAXMLDeserializer.from_string(TEST_XML, streaming=True)
+
+    # WHEN / THEN
+    with pytest.raises(InvalidXMLError):
+        deserializer.read_model()
+
+
+def minimal_xmi(
+    packaged_elements: str, diagram_subjects: list[str], connectors: str = ""
+) -> str:
+    subjects = "".join(f'<element subject="{subject}"/>' for subject in diagram_subjects)
+    return (
+        '<xmi:XMI xmlns:xmi="http://schema.omg.org/spec/XMI/2.1" '
+        'xmlns:uml="http://schema.omg.org/spec/UML/2.1">'
+        f'<uml:Model xmi:type="uml:Model" name="EA_Model">{packaged_elements}</uml:Model>'
+        f"<xmi:Extension><connectors>{connectors}</connectors><diagrams><diagram>"
+        f'<properties name="Test Diagram"/><elements>{subjects}</elements>'
+        "</diagram></diagrams></xmi:Extension>"
+        "</xmi:XMI>"
+    )
+
+
+@pytest.mark.parametrize("streaming", [False, True])
+def test_when_read_diagram_then_elements_in_xml_order(streaming: bool) -> None:
+    # GIVEN
+    TEST_XML = minimal_xmi(
+        '<packagedElement xmi:type="uml:Class" xmi:id="EAID_A" name="A"/>'
+        '<packagedElement xmi:type="uml:Class" xmi:id="EAID_B" name="B"/>'
+        '<packagedElement xmi:type="uml:Class" xmi:id="EAID_C" name="C"/>',
+        ["EAID_C", "EAID_UNKNOWN", "EAID_A", "EAID_C"],
+    )
+
+    # WHEN
+    model = EAXMLDeserializer.from_string(TEST_XML, streaming=streaming).read_model()
+
+    # THEN
+    assert [elem.id for elem in model.diagrams[0].elements] == ["EAID_C", "EAID_A"]
+
+
+def association_xml(rel_id: str, source_id: str, target_id: str) -> str:
+    return (
+        f'<packagedElement xmi:type="uml:Association" xmi:id="{rel_id}">'
+        f'<ownedEnd xmi:id="EAID_src_{rel_id}"><type xmi:idref="{source_id}"/></ownedEnd>'
+        f'<ownedEnd xmi:id="EAID_dst_{rel_id}"><type xmi:idref="{target_id}"/></ownedEnd>'
+        "</packagedElement>"
+    )
+
+
+def test_when_relationship_precedes_ends_then_resolved_and_dangling_reported() -> None:
+    # GIVEN
+    TEST_XML = minimal_xmi(
+        association_xml("EAID_R1", "EAID_A", "EAID_B")
+        + association_xml("EAID_R2", "EAID_A", "EAID_MISSING")
+        + '<packagedElement xmi:type="uml:Class" xmi:id="EAID_A" name="A"/>'
+        '<packagedElement xmi:type="uml:Class" xmi:id="EAID_B" name="B"/>',
+        ["EAID_A", "EAID_B"],
+    )
+    deserializer = EAXMLDeserializer.from_string(TEST_XML)
+
+    # WHEN
+    model = deserializer.read_model()
+
+    # THEN
+    class_a, class_b = model.diagrams[0].elements
+    assert [rel.id for rel in class_a.relations_to] == ["EAID_R1", "EAID_R2"]
+    assert [rel.id for rel in class_b.relations_from] == ["EAID_R1"]
+    assert deserializer.unresolved_references == ["EAID_MISSING"]
+
+
+def attribute_xml(name: str) -> str:
+    return (
+        f'<ownedAttribute name="{name}">'
+        '<type href="http://schema.omg.org/spec/UML/2.1/uml.xml#Integer"/>'
+        "</ownedAttribute>"
+    )
+
+
+@pytest.mark.parametrize("streaming", [False, True])
+def test_when_class_nested_in_class_then_both_built_with_own_members(streaming: bool) -> None:
+    # GIVEN
+    TEST_XML = minimal_xmi(
+        '<packagedElement xmi:type="uml:Package" xmi:id="EAPK_P" name="P">'
+        '<packagedElement xmi:type="uml:Class" xmi:id="EAID_OUTER" name="Outer">'
+        + attribute_xml("outer_attr")
+        + '<packagedElement xmi:type="uml:Class" xmi:id="EAID_INNER" name="Inner">'
+        + attribute_xml("inner_attr")
+        + "</packagedElement></packagedElement></packagedElement>",
+        ["EAID_OUTER", "EAID_INNER"],
+    )
+
+    # WHEN
+    model = EAXMLDeserializer.from_string(TEST_XML, streaming=streaming).read_model()
+
+    # THEN
+    outer, inner = model.diagrams[0].elements
+    assert [(attr.name, attr.type) for attr in outer.attributes] == [("outer_attr", "integer")]
+    assert [(attr.name, attr.type) for attr in inner.attributes] == [("inner_attr", "integer")]
+
+
+def test_when_read_model_lazy_then_same_as_eager() -> None:
+    # GIVEN
+    eager_model = EAXMLDeserializer.from_path(str(SAMPLE_PATH)).read_model()
+
+    # WHEN
+    lazy_model = EAXMLDeserializer.from_path(str(SAMPLE_PATH), lazy=True).read_model()
+
+    # THEN
+    assert model_summary(lazy_model) == model_summary(eager_model)
+
+
+def test_when_lazy_diagram_accessed_then_only_its_elements_built() -> None:
+    # GIVEN
+    TEST_XML = (
+        '<xmi:XMI xmlns:xmi="http://schema.omg.org/spec/XMI/2.1" '
+        'xmlns:uml="http://schema.omg.org/spec/UML/2.1">'
+        '<uml:Model xmi:type="uml:Model" name="EA_Model">'
+        '<packagedElement xmi:type="uml:Class" xmi:id="EAID_A" name="A"/>'
+        '<packagedElement xmi:type="uml:Class" xmi:id="EAID_B" name="B"/>'
+        '<packagedElement xmi:type="uml:Class" xmi:id="EAID_C" name="C"/>'
+        + association_xml("EAID_R1", "EAID_A", "EAID_B")
+        + "</uml:Model><xmi:Extension><diagrams>"
+        '<diagram><properties name="First"/><elements><element subject="EAID_A"/>'
+        '<element subject="EAID_R1"/></elements></diagram>'
+        '<diagram><properties name="Second"/><elements><element subject="EAID_C"/>'
+        "</elements></diagram>"
+        "</diagrams></xmi:Extension></xmi:XMI>"
+    )
+    deserializer = EAXMLDeserializer.from_string(TEST_XML, lazy=True)
+    model = deserializer.read_model()
+
+    # WHEN
+    first = model.get_diagram("First")
+
+    # THEN
+    assert model.diagrams.names == ["First", "Second"]
+    assert model.diagrams.is_loaded(0) and not model.diagrams.is_loaded(1)
+    (class_a,) = first.elements
+    assert [(rel.source.name, rel.target.name) for rel in class_a.relations_to] == [("A", "B")]
+    assert "EAID_C" not in deserializer._id_to_instance_mapping
+
+
+def test_when_lazy_model_read_with_cache_then_error_raised(tmp_path: Path) -> None:
+    # WHEN / THEN
+    with pytest.raises(ValueError):
+        EAXMLDeserializer.from_path(
+            str(SAMPLE_PATH), cache=ParseCache(str(tmp_path / "cache")), lazy=True
+        )
+
+
+def class_xml(elem_id: str, name: str, members: str = "") -> str:
+    return f'<packagedElement xmi:type="uml:Class" xmi:id="{elem_id}" name="{name}">{members}</packagedElement>'
+
+
+def test_when_model_updated_then_only_changes_applied_and_reported() -> None:
+    # GIVEN
+    OLD_XML = minimal_xmi(
+        class_xml("EAID_A", "A")
+        + class_xml("EAID_B", "B")
+        + class_xml("EAID_D", "D")
+        + association_xml("EAID_R1", "EAID_A", "EAID_B"),
+        ["EAID_A", "EAID_B", "EAID_D"],
+    )
+    NEW_XML = minimal_xmi(
+        class_xml("EAID_A", "A")
+        + class_xml("EAID_B", "B", attribute_xml("new_attr"))
+        + class_xml("EAID_C", "C")
+        + association_xml("EAID_R1", "EAID_A", "EAID_C"),
+        ["EAID_A", "EAID_B", "EAID_C"],
+    )
+    deserializer = EAXMLDeserializer(StringSource(OLD_XML), track_changes=True)
+    model = deserializer.read_model()
+    class_a, class_b, _ = model.diagrams[0].elements
+
+    # WHEN
+    update = deserializer.update_model(model, StringSource(NEW_XML))
+
+    # THEN
+    assert [elem.id for elem in update.added] == ["EAID_C"]
+    assert [elem.id for elem in update.removed] == ["EAID_D"]
+    assert sorted(elem.id for elem in update.modified) == ["EAID_B", "EAID_R1"]
+    assert model.diagrams[0].elements[:2] == [class_a, class_b]
+    assert [attr.name for attr in class_b.attributes] == ["new_attr"]
+    assert class_b.relations_from == []
+    (relationship,) = class_a.relations_to
+    assert relationship.target is model.diagrams[0].elements[2]
+    assert relationship.target.relations_from == [relationship]
+
+
+def test_when_model_updated_with_same_content_then_nothing_changed() -> None:
+    # GIVEN
+    deserializer = EAXMLDeserializer(FileSource(str(SAMPLE_PATH)), track_changes=True)
+    model = deserializer.read_model()
+    diagrams = list(model.diagrams)
+
+    # WHEN
+    update = deserializer.update_model(model, FileSource(str(SAMPLE_PATH)))
+
+    # THEN
+    assert not update.changed
+    assert model.diagrams == diagrams
+
+
+def test_when_undrawn_element_updated_then_diagram_not_rebuilt(monkeypatch) -> None:
+    # GIVEN
+    OLD_XML = minimal_xmi(class_xml("EAID_A", "A") + class_xml("EAID_B", "B"), ["EAID_A"])
+    NEW_XML = minimal_xmi(
+        class_xml("EAID_A", "A") + class_xml("EAID_B", "B", attribute_xml("new_attr")),
+        ["EAID_A"],
+    )
+    deserializer = EAXMLDeserializer(StringSource(OLD_XML), track_changes=True)
+    model = deserializer.read_model()
+    diagram = model.diagrams[0]
+    built = []
+    monkeypatch.setattr(deserializer, "_get_filled_diag", built.append)
+
+    # WHEN
+    update = deserializer.update_model(model, StringSource(NEW_XML))
+
+    # THEN
+    assert [elem.id for elem in update.modified] == ["EAID_B"]
+    assert model.diagrams[0] is diagram
+    assert built == []
+
+
+def connector_xml(conn_id: str, ea_type: str, source_id: str, target_id: str) -> str:
+    return (
+        f'<connector xmi:idref="{conn_id}" name="{ea_type} connector">'
+        f'<source xmi:idref="{source_id}"><role name="child"/><type multiplicity="0..*"/></source>'
+        f'<target xmi:idref="{target_id}"><role/><type multiplicity="1"/></target>'
+        f'<properties ea_type="{ea_type}" direction="Source -&gt; Destination"/>'
+        "</connector>"
+    )
+
+
+@pytest.mark.parametrize("mode", [{}, {"streaming": True}, {"lazy": True}])
+def test_when_connectors_in_extension_then_generalization_built_and_duplicates_merged(
+    mode: dict,
+) -> None:
+    # GIVEN
+    TEST_XML = minimal_xmi(
+        class_xml("EAID_A", "A")
+        + class_xml("EAID_B", "B")
+        + association_xml("EAID_R1", "EAID_A", "EAID_B"),
+        ["EAID_A", "EAID_B"],
+        connectors=connector_xml("EAID_R1", "Association", "EAID_A", "EAID_B")
+        + connector_xml("EAID_G1", "Generalization", "EAID_B", "EAID_A")
+        + connector_xml("EAID_N1", "NoteLink", "EAID_A", "EAID_B"),
+    )
+
+    # WHEN
+    model = EAXMLDeserializer.from_string(TEST_XML, **mode).read_model()
+
+    # THEN
+    class_a, class_b = model.diagrams[0].elements
+    (association,) = class_a.relations_to
+    assert association.name == "Association connector"
+    assert association.source_side.role == "child"
+    (generalization,) = class_b.relations_to
+    assert generalization.type is RelationshipType.Generalization
+    assert generalization.target is class_a
+    assert generalization.source_side.min_max_multiplicity == ("0", "inf")
+    assert generalization.target_side.min_max_multiplicity == ("1", "1")
+    assert class_a.relations_from == [generalization]
+
+
+@pytest.mark.parametrize("mode", [{}, {"streaming": True}, {"lazy": True}])
+def test_when_model_read_then_index_seeded_with_undrawn_elements_and_packages(
+    mode: dict,
+) -> None:
+    # GIVEN
+    TEST_XML = minimal_xmi(
+        '<packagedElement xmi:type="uml:Package" xmi:id="EAPK_P" name="P">'
+        + class_xml("EAID_A", "A")
+        + class_xml("EAID_B", "B")
+        + "</packagedElement>"
+        + class_xml("EAID_UNDRAWN", "Undrawn"),
+        ["EAID_A"],
+    )
+
+    # WHEN
+    model = EAXMLDeserializer.from_string(TEST_XML, **mode).read_model()
+
+    # THEN
+    class_a = model.diagrams[0].elements[0]
+    class_b = model.get_by_id("EAID_B")
+    assert model.get_by_id("EAID_A") is class_a and class_b.name == "B"
+    assert model.elements_in_package("P") == model.elements_in_package("EAPK_P") == [
+        class_a,
+        class_b,
+    ]
+    assert [elem.name for elem in model.find_by_name("Undrawn")] == ["Undrawn"]
+
+
+def test_when_models_of_separate_exports_merged_then_cross_references_resolved() -> None:
+    # GIVEN
+    first = EAXMLDeserializer.from_string(
+        minimal_xmi(
+            class_xml("EAID_A", "A") + class_xml("EAID_SHARED", "Shared")
+            + association_xml("EAID_R1", "EAID_A", "EAID_B"),
+            ["EAID_A", "EAID_SHARED"],
+        )
+    ).read_model()
+    second = EAXMLDeserializer.from_string(
+        minimal_xmi(
+            class_xml("EAID_B", "B") + class_xml("EAID_SHARED", "Shared copy")
+            + association_xml("EAID_R2", "EAID_B", "EAID_SHARED"),
+            ["EAID_B", "EAID_SHARED"],
+        )
+    ).read_model()
+    assert list(first.unresolved_references) == ["EAID_B"]
+
+    # WHEN
+    merged = UMLModel.merge(first, second)
+
+    # THEN
+    class_a, class_b, shared = (merged.get_by_id(elem_id) for elem_id in ("EAID_A", "EAID_B", "EAID_SHARED"))
+    assert shared.name == "Shared"
+    assert [diagram.elements for diagram in merged.diagrams] == [[class_a, shared], [class_b, shared]]
+    assert class_a.relations_to[0].target is class_b
+    assert class_b.relations_to[0].target is shared
+    assert [rel.id for rel in shared.relations_from] == ["EAID_R2"]
+    assert not merged.unresolved_references
@@ -1,8 +1,9 @@
 from __future__ import annotations
+import pickle
 import pytest
 from typing import Iterable
 
-from uml_interpreter.model.diagrams.class_diagram import ClassRelationship, RelationshipType, ClassDiagramElement, ClassDiagramClass
+from uml_interpreter.model.diagrams.class_diagram import ClassRelationship, RelationshipType, ClassDiagramElement, ClassDiagramClass, Multiplicity
 
 
 @pytest.fixture
@@ -44,3 +45,117 @@ def test_when_add_relation_to_class_then_target_relations_from_updated(class_fac
     assert len(test_target_class.relations_from) == 1
     is_source_in_target_relations = bool(test_source_class in map(lambda relation: relation.source, test_target_class.relations_from))
     assert is_source_in_target_relations
+
+
+def test_when_class_and_relationship_created_then_no_instance_dict(class_factory) -> None:
+    # GIVEN
+    source = class_factory.make_class('Source')
+    target = class_factory.make_class('Target')
+
+    # WHEN
+    relationship = source.add_relationship_to(target, source_role='role')
+
+    # THEN
+    for obj in (source, relationship, relationship.source_side):
+        assert not hasattr(obj, '__dict__')
+    assert relationship.source is source and relationship.source_side.role == 'role'
+    assert target.relations_from == [relationship]
+
+
+def test_when_sides_have_equal_multiplicities_then_they_are_shared(class_factory) -> None:
+    # GIVEN
+    source = class_factory.make_class('Source')
+    target = class_factory.make_class('Target')
+
+    # WHEN
+    first = source.add_relationship_to(target, source_minmax=('1', 'inf'))
+    second = target.add_relationship_to(source, target_minmax=('1', 'inf'))
+
+    # THEN
+    assert first.source_side.min_max_multiplicity is second.target_side.min_max_multiplicity
+    assert first.source_side.min_max_multiplicity == Multiplicity.of('1', 'inf') == ('1', 'inf')
+    assert pickle.loads(pickle.dumps(Multiplicity.of('1', 'inf'))) is Multiplicity.of('1', 'inf')
+
+
+def test_when_multiplicity_assigned_then_interned(class_factory) -> None:
+    # GIVEN
+    relationship = class_factory.make_class('Source').add_relationship_to(class_factory.make_class('Target'))
+
+    # WHEN
+    relationship.target_side.min_max_multiplicity = ('1', 'inf')
+
+    # THEN
+    assert relationship.target_side.min_max_multiplicity is Multiplicity.of('1', 'inf')
+
+
+def test_when_relationship_added_twice_then_kept_once(class_factory) -> None:
+    # GIVEN
+    source = class_factory.make_class('Source')
+    target = class_factory.make_class('Target')
+    relationship = source.add_relationship_to(target)
+
+    # WHEN
+    relationship.source = source
+    relationship.target = target
+    source.relations_to.append(relationship)
+
+    # THEN
+    assert source.relations_to == [relationship]
+    assert target.relations_from == [relationship]
+
+
+def test_when_relationship_removed_then_both_ends_updated(class_factory) -> None:
+    # GIVEN
+    source = class_factory.make_class('Source')
+    target = class_factory.make_class('Target')
+    other = class_factory.make_class('Other')
+    first = source.add_relationship_to(target)
+    second = source.add_relationship_to(other)
+    third = other.add_relationship_to(source)
+
+    # WHEN
+    target.remove_relationship(first)
+
+    # THEN
+    assert first not in source.relations_to and not target.relations_from
+    assert first.source is None and first.target is None
+    assert source.relations_to == [second]
+
+    # WHEN
+    source.detach()
+
+    # THEN
+    assert not source.relations_to and not source.relations_from
+    assert not other.relations_to and not other.relations_from
+    assert second.target is None and third.source is None
+
+
+def test_when_relationship_target_changed_then_removed_from_previous_target(class_factory) -> None:
+    # GIVEN
+    source = class_factory.make_class('Source')
+    target = class_factory.make_class('Target')
+    other = class_factory.make_class('Other')
+    relationship = source.add_relationship_to(target)
+
+    # WHEN
+    relationship.target = other
+
+    # THEN
+    assert not target.relations_from
+    assert other.relations_from == [relationship]
+
+
+def test_when_relationship_set_changed_then_indexing_follows(class_factory) -> None:
+    # GIVEN
+    source = class_factory.make_class('Source')
+    first = source.add_relationship_to(class_factory.make_class('First'))
+    second = source.add_relationship_to(class_factory.make_class('Second'))
+    assert [source.relations_to[index] for index in range(2)] == [first, second]
+
+    # WHEN
+    source.remove_relationship(first)
+
+    # THEN
+    assert source.relations_to[0] is second and source.relations_to[-1] is second
+    with pytest.raises(IndexError):
+        source.relations_to[1]
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+from uml_interpreter.model.diagrams.class_diagram import (
+    ClassDiagramMethod,
+    ClassDiagramMethodParameter,
+)
+from uml_interpreter.model.diagrams.component_diagram import (
+    Component,
+    ComponentDiagram,
+    ComponentInterface,
+    Port,
+    ProvidedComponentInterface,
+    RequiredComponentInterface,
+)
+
+
+def with_methods(interface: ComponentInterface, *methods: tuple[str, list[str], str]) -> ComponentInterface:
+    for name, parameter_types, ret_type in methods:
+        parameters = [ClassDiagramMethodParameter(f"p{index}", type) for index, type in enumerate(parameter_types)]
+        interface.methods.append(ClassDiagramMethod(name, ret_type, parameters))
+    return interface
+
+
+def test_when_match_interfaces_then_equal_signatures_wired() -> None:
+    # GIVEN
+    diagram = ComponentDiagram("Diagram")
+    server, client, nested = Component(), Component(), Component()
+    port = Port()
+    server.ports.append(port)
+    client.children.append(nested)
+    diagram.components.extend([server, client])
+
+    provided = with_methods(ProvidedComponentInterface(), ("get", ["int"], "str"), ("put", ["int", "str"], "void"))
+    other = with_methods(ProvidedComponentInterface(), ("get", ["str"], "str"))
+    port.interfaces.extend([provided, other])
+    required = with_methods(RequiredComponentInterface(), ("put", ["int", "str"], "void"), ("get", ["int"], "str"))
+    unmatched = with_methods(RequiredComponentInterface(), ("get", ["float"], "str"))
+    nested.interfaces.extend([required, unmatched])
+
+    # WHEN
+    left = diagram.match_interfaces()
+    diagram.match_interfaces()
+
+    # THEN
+    assert left == [unmatched]
+    assert required.fulfilled_by == [provided]
+    assert provided.fulfills == [required]
+    assert not other.fulfills and not unmatched.fulfilled_by
@@ -0,0 +1,105 @@
+from __future__ import annotations
+import pytest
+
+import uml_interpreter.model.diagrams.class_diagram  # noqa: F401 - sequence diagram module is imported through it
+from uml_interpreter.model.diagrams.sequence_diagram import (
+    LoopSequenceFragment,
+    SequenceActor,
+    SequenceDiagram,
+    SyncSequenceMessage,
+)
+
+
+def make_message(sender: SequenceActor, receiver: SequenceActor, time: int) -> SyncSequenceMessage:
+    message = SyncSequenceMessage(sender, receiver)
+    message.time = time
+    return message
+
+
+def test_when_events_added_out_of_order_then_timeline_sorted_and_linked() -> None:
+    # GIVEN
+    diagram = SequenceDiagram("Diagram")
+    client, server = SequenceActor("Client"), SequenceActor("Server")
+    diagram.actors.extend([client, server])
+    late, early, middle = (make_message(client, server, time) for time in (30, 10, 20))
+
+    # WHEN
+    for message in (late, early, middle):
+        diagram.add_event(message)
+
+    # THEN
+    assert list(diagram.timeline) == [early, middle, late]
+    assert early.predecessor is None and early.successor is middle
+    assert middle.predecessor is early and middle.successor is late
+    assert diagram.timeline.between(15, 30) == [middle, late]
+    assert diagram.timeline.rank(late) == 2
+    assert server.events[0] is early
+
+
+def test_when_event_removed_then_neighbours_linked() -> None:
+    # GIVEN
+    diagram = SequenceDiagram("Diagram")
+    actor = SequenceActor("Actor")
+    first, second, third = (make_message(actor, actor, time) for time in (1, 1, 2))
+    for message in (first, second, third):
+        diagram.add_event(message)
+
+    # WHEN
+    diagram.remove_event(second)
+
+    # THEN
+    assert list(diagram.timeline) == [first, third]
+    assert first.successor is third and third.predecessor is first
+    assert second.predecessor is None and second.successor is None
+    assert second not in actor.events and len(actor.events) == 2
+
+
+def test_when_event_rescheduled_then_moved_on_actor_timelines() -> None:
+    # GIVEN
+    diagram = SequenceDiagram("Diagram")
+    client, server = SequenceActor("Client"), SequenceActor("Server")
+    early, late = make_message(client, server, 2), make_message(client, server, 5)
+    for message in (early, late):
+        diagram.add_event(message)
+
+    # WHEN
+    diagram.reschedule_event(early, 8)
+
+    # THEN
+    assert list(diagram.timeline) == list(client.events) == list(server.events) == [late, early]
+    assert client.events.between(4, 6) == [late]
+    assert late.successor is early
+
+
+def test_when_event_missing_from_actor_timeline_then_nothing_removed() -> None:
+    # GIVEN
+    diagram = SequenceDiagram("Diagram")
+    client, server = SequenceActor("Client"), SequenceActor("Server")
+    message = make_message(client, server, 1)
+    diagram.add_event(message)
+    server.events.remove(message)
+
+    # WHEN
+    with pytest.raises(ValueError):
+        diagram.remove_event(message)
+
+    # THEN
+    assert message in diagram.timeline and message in client.events
+
+
+def test_when_fragment_created_then_parent_timeline_and_actors_shared() -> None:
+    # GIVEN
+    diagram = SequenceDiagram("Diagram")
+    actor = SequenceActor("Actor")
+    diagram.actors.append(actor)
+
+    # WHEN
+    fragment = LoopSequenceFragment(diagram, "Loop")
+    fragment.time = 5
+    diagram.add_event(fragment)
+    fragment.add_event(make_message(actor, actor, 7))
+
+    # THEN
+    assert fragment.actors is diagram.actors
+    assert fragment.timeline is diagram.timeline
+    assert [event.time for event in diagram.timeline] == [5, 7]
@@ -0,0 +1,63 @@
+from __future__ import annotations
+import pytest
+
+from uml_interpreter.model.arrays import ClassDiagramArrays
+from uml_interpreter.model.diagrams.class_diagram import (
+    ClassDiagram,
+    ClassDiagramAttribute,
+    ClassDiagramClass,
+    RelationshipType,
+)
+from uml_interpreter.model.model import UMLModel
+
+
+@pytest.fixture
+def diagram() -> ClassDiagram:
+    base, child, other, outside = (ClassDiagramClass(name) for name in ("Base", "Child", "Ćwierć", "Outside"))
+    child.attributes = [ClassDiagramAttribute("first", "int"), ClassDiagramAttribute("second", "int")]
+    child.add_relationship_to(base, RelationshipType.Generalization)
+    child.add_relationship_to(other)
+    child.add_relationship_to(outside)
+    other.add_relationship_to(base)
+    return ClassDiagram("Diagram", [base, child, other])
+
+
+def test_when_export_diagram_then_csr_split_by_type(diagram) -> None:
+    # WHEN
+    arrays = ClassDiagramArrays.from_diagram(diagram)
+
+    # THEN
+    assert len(arrays) == 3
+    assert list(arrays.indptr[RelationshipType.Association]) == [0, 0, 1, 2]
+    assert list(arrays.indices[RelationshipType.Association]) == [2, 0]
+    assert list(arrays.indptr[RelationshipType.Generalization]) == [0, 0, 1, 1]
+    assert list(arrays.indices[RelationshipType.Generalization]) == [0]
+    assert arrays.relationships[RelationshipType.Generalization][0].source is diagram.elements[1]
+    assert list(arrays.attribute_counts) == [0, 2, 0]
+    assert [arrays.name(number) for number in range(3)] == ["Base", "Child", "Ćwierć"]
+
+
+def test_when_export_model_then_elements_outside_diagram_included(diagram) -> None:
+    # GIVEN
+    model = UMLModel(diagrams=[diagram])
+
+    # WHEN
+    arrays = ClassDiagramArrays.from_model(model)
+
+    # THEN
+    assert len(arrays) == 4
+    assert sum(len(indices) for indices in arrays.indices.values()) == 4
+
+
+def test_when_convert_to_numpy_then_memory_shared(diagram) -> None:
+    # GIVEN
+    numpy = pytest.importorskip("numpy")
+    arrays = ClassDiagramArrays.from_diagram(diagram)
+
+    # WHEN
+    columns = arrays.to_numpy()
+
+    # THEN
+    assert columns["indices.Association"].dtype == numpy.int64
+    arrays.attribute_counts[0] = 7
+    assert columns["attribute_counts"][0] == 7
@@ -0,0 +1,130 @@
+from __future__ import annotations
+import pickle
+import pytest
+
+from uml_interpreter.model.diagrams.class_diagram import (
+    ClassDiagram,
+    ClassDiagramAttribute,
+    ClassDiagramClass,
+    RelationshipType,
+)
+from uml_interpreter.model.errors import FrozenModelError
+from uml_interpreter.model.model import UMLModel
+
+
+@pytest.fixture
+def model() -> UMLModel:
+    base, child = ClassDiagramClass("Base"), ClassDiagramClass("Child")
+    child.id = "EAID_CHILD"
+    child.attributes = [ClassDiagramAttribute("attr", "int")]
+    child.add_relationship_to(base, RelationshipType.Generalization)
+    return UMLModel(diagrams=[ClassDiagram("Diagram", [base, child])], filename="model.xml")
+
+
+def test_when_model_frozen_then_copy_mutation_raises(model) -> None:
+    # GIVEN
+    original_base, original_child = model.diagrams[0].elements
+
+    # WHEN
+    frozen = model.freeze()
+    base, child = frozen.diagrams[0].elements
+
+    # THEN
+    assert frozen is not model and frozen.frozen and not model.frozen
+    assert frozen.freeze() is frozen
+    assert isinstance(child, ClassDiagramClass) and child is not original_child
+    assert frozen.get_by_id("EAID_CHILD") is child
+    assert frozen.graph.superclasses(child) == [base]
+    with pytest.raises(FrozenModelError):
+        child.name = "Renamed"
+    with pytest.raises(FrozenModelError):
+        child.attributes[0].type = "float"
+    with pytest.raises(FrozenModelError):
+        child.add_relationship_to(base)
+    with pytest.raises(FrozenModelError):
+        child.relations_to[0].detach()
+    with pytest.raises(FrozenModelError):
+        frozen.filename = "other.xml"
+    assert child.relations_to[0].target is base and len(base.relations_from) == 1
+
+
+def test_when_model_frozen_then_model_stays_mutable(model) -> None:
+    # GIVEN
+    base, child = model.diagrams[0].elements
+    frozen = model.freeze()
+
+    # WHEN
+    child.name = "Renamed"
+    child.relations_to[0].detach()
+
+    # THEN
+    frozen_base, frozen_child = frozen.diagrams[0].elements
+    assert frozen_child.name == "Child"
+    assert frozen_child.relations_to[0].target is frozen_base
+    assert model.get_by_id("EAID_CHILD") is child
+
+
+def test_when_frozen_model_thawed_then_copy_is_mutable(model) -> None:
+    # GIVEN
+    frozen = model.freeze()
+
+    # WHEN
+    thawed = frozen.thaw()
+    base, child = thawed.diagrams[0].elements
+    child.name = "Renamed"
+    child.attributes.append(ClassDiagramAttribute("other", "int"))
+    child.relations_to[0].detach()
+
+    # THEN
+    assert not thawed.frozen and thawed.filename == "model.xml"
+    assert thawed.get_by_id("EAID_CHILD") is child
+    assert not child.relations_to and not base.relations_from
+    original_base, original_child = frozen.diagrams[0].elements
+    assert original_child.name == "Child" and len(original_child.attributes) == 1
+    assert original_child.relations_to[0].target is original_base
+
+
+def test_when_frozen_model_thawed_then_objects_copied_on_access(model) -> None:
+    # GIVEN
+    frozen = model.freeze()
+
+    # WHEN
+    thawed = frozen.thaw()
+    copies = thawed.diagrams[0]._thaw._copies
+    copied_on_thaw = len(copies)
+    base, child = thawed.diagrams[0].elements
+    copied_on_read = len(copies)
+    child.attributes.append(ClassDiagramAttribute("other", "int"))
+
+    # THEN
+    assert copied_on_thaw == 1 and thawed._index is None
+    assert copied_on_read == copied_on_thaw + 3
+    assert len(copies) == copied_on_read + 2
+    assert type(child.attributes) is list and len(child.attributes) == 2
+    assert len(frozen.get_by_id("EAID_CHILD").attributes) == 1
+
+
+def test_when_frozen_model_pickled_then_restored_frozen(model) -> None:
+    # GIVEN
+    frozen = model.freeze()
+
+    # WHEN
+    restored: UMLModel = pickle.loads(pickle.dumps(frozen))
+
+    # THEN
+    assert restored.frozen
+    assert restored.get_by_id("EAID_CHILD").attributes[0].name == "attr"
+
+
+def test_when_thawed_model_pickled_then_restored_mutable(model) -> None:
+    # GIVEN
+    thawed = model.freeze().thaw()
+    thawed.diagrams[0].elements[1].name = "Renamed"
+
+    # WHEN
+    restored: UMLModel = pickle.loads(pickle.dumps(thawed))
+
+    # THEN
+    base, child = restored.diagrams[0].elements
+    assert not restored.frozen and type(child) is ClassDiagramClass
+    assert child.name == "Renamed" and child.relations_to[0].target is base
@@ -0,0 +1,119 @@
+from __future__ import annotations
+import pytest
+
+from uml_interpreter.model.diagrams.class_diagram import (
+    ClassDiagram,
+    ClassDiagramClass,
+    ClassRelationship,
+    RelationshipType,
+)
+from uml_interpreter.model.errors import CyclicGraphError
+from uml_interpreter.model.model import UMLModel
+
+
+def make_model(*elements: ClassDiagramClass) -> UMLModel:
+    return UMLModel(diagrams=[ClassDiagram("Diagram", list(elements))])
+
+
+def test_when_relationships_form_cycle_then_component_found() -> None:
+    # GIVEN
+    first, second, third, outside = (ClassDiagramClass(name) for name in "ABCD")
+    first.add_relationship_to(second)
+    second.add_relationship_to(third)
+    third.add_relationship_to(first)
+    third.add_relationship_to(outside)
+    model = make_model(first, second, third, outside)
+
+    # WHEN
+    components = model.graph.strongly_connected_components()
+    cycles = model.graph.cycles()
+
+    # THEN
+    assert [outside] in components
+    assert components.index([outside]) < len(components) - 1
+    assert len(cycles) == 1 and set(cycles[0]) == {first, second, third}
+    assert model.graph.transitive_closure()[outside] == frozenset()
+    assert model.graph.transitive_closure()[first] == {first, second, third, outside}
+    with pytest.raises(CyclicGraphError) as error:
+        model.graph.topological_order()
+    assert set(error.value.cycle) == {first, second, third}
+
+
+def test_when_generalizations_then_inheritance_chain_found() -> None:
+    # GIVEN
+    base, middle, leaf, other = (ClassDiagramClass(name) for name in ("Base", "Middle", "Leaf", "Other"))
+    leaf.add_relationship_to(middle, RelationshipType.Generalization)
+    middle.add_relationship_to(base, RelationshipType.Generalization)
+    leaf.add_relationship_to(other)
+    model = make_model(base, middle, leaf, other)
+
+    # WHEN
+    superclasses = model.graph.superclasses(leaf)
+    subclasses = model.graph.subclasses(base)
+    order = model.graph.topological_order([RelationshipType.Generalization])
+
+    # THEN
+    assert superclasses == [middle, base]
+    assert subclasses == [middle, leaf]
+    assert order.index(leaf) < order.index(middle) < order.index(base)
+
+
+def test_when_relationship_changed_then_results_invalidated() -> None:
+    # GIVEN
+    first, second, third = (ClassDiagramClass(name) for name in "ABC")
+    relationship = first.add_relationship_to(second)
+    model = make_model(first, second, third)
+    assert model.graph.reachable_from(first) == [second]
+
+    # WHEN
+    second.add_relationship_to(third)
+
+    # THEN
+    assert model.graph.reachable_from(first) == [second, third]
+
+    # WHEN
+    relationship.detach()
+
+    # THEN
+    assert model.graph.reachable_from(first) == []
+    assert model.graph.reaching(third) == [second]
+
+
+def test_when_long_relationship_chain_then_no_recursion_error() -> None:
+    # GIVEN
+    elements = [ClassDiagramClass(f"Class {index}") for index in range(50_000)]
+    for source, target in zip(elements, elements[1:]):
+        source.add_relationship_to(target)
+    model = make_model(*elements)
+
+    # WHEN
+    components = model.graph.strongly_connected_components()
+    order = model.graph.topological_order()
+
+    # THEN
+    assert len(components) == 50_000
+    assert order == elements
+    assert not model.graph.has_cycle()
+
+
+def test_when_relationship_repointed_then_graph_updated() -> None:
+    # GIVEN
+    first, second, outside, other = (ClassDiagramClass(name) for name in "ABCD")
+    rel = first.add_relationship_to(second)
+    model = make_model(first, second)
+    assert model.graph.successors(first) == [second]
+
+    # WHEN
+    rel.target = outside
+
+    # THEN
+    assert model.graph.successors(first) == [outside]
+    assert model.graph.predecessors(second) == []
+    assert outside in model.index
+
+    # WHEN
+    rel.source_side = ClassRelationship.RelationshipSide(other)
+
+    # THEN
+    assert model.graph.successors(first) == []
+    assert model.graph.successors(other) == [outside]
@@ -0,0 +1,44 @@
+from __future__ import annotations
+import pytest
+
+from uml_interpreter.model.diagrams.class_diagram import ClassDiagram, ClassDiagramClass
+from uml_interpreter.model.errors import MergeConflictError
+from uml_interpreter.model.model import UMLModel
+
+
+def make_model(name: str) -> UMLModel:
+    shared, own = ClassDiagramClass(f"Shared of {name}"), ClassDiagramClass(name)
+    shared.id, own.id = "EAID_SHARED", f"EAID_{name}"
+    relationship = own.add_relationship_to(shared)
+    relationship.id = f"EAID_R_{name}"
+    return UMLModel(diagrams=[ClassDiagram(name, [shared, own])])
+
+
+@pytest.mark.parametrize("on_conflict, survivor", [("first", "Shared of A"), ("last", "Shared of B")])
+def test_when_ids_conflict_then_survivor_chosen_by_policy(on_conflict: str, survivor: str) -> None:
+    # WHEN
+    merged = UMLModel.merge(make_model("A"), make_model("B"), on_conflict=on_conflict)
+
+    # THEN
+    shared = merged.get_by_id("EAID_SHARED")
+    assert shared.name == survivor
+    assert sorted(rel.source.name for rel in shared.relations_from) == ["A", "B"]
+    assert [len(diagram.elements) for diagram in merged.diagrams] == [2, 2]
+    assert len(merged.find_by_name("Shared of A" if on_conflict == "last" else "Shared of B")) == 0
+
+
+def test_when_ids_conflict_with_error_policy_then_raised() -> None:
+    # GIVEN
+    first, second = make_model("A"), make_model("B")
+
+    # WHEN / THEN
+    with pytest.raises(MergeConflictError):
+        UMLModel.merge(first, second, on_conflict="error")
+    for model, name in ((first, "A"), (second, "B")):
+        shared, own = model.diagrams[0].elements
+        assert shared._model is model and own._model is model
+        assert model.get_by_id("EAID_SHARED") is shared
+        assert [rel.id for rel in shared.relations_from] == [f"EAID_R_{name}"]
+        assert own.relations_to[0].target is shared
+        rel = own.add_relationship_to(shared)
+        assert rel in model.index and model.graph.successors(own) == [shared, shared]
@@ -0,0 +1,132 @@
+from __future__ import annotations
+import pickle
+
+from uml_interpreter.model.diagrams.class_diagram import (
+    ClassDiagram,
+    ClassDiagramAttribute,
+    ClassDiagramClass,
+    ClassDiagramInterface,
+    ClassDiagramMethod,
+    RelationshipType,
+)
+from uml_interpreter.model.diagrams.sequence_diagram import (
+    SequenceActor,
+    SequenceDiagram,
+    SyncSequenceMessage,
+)
+from uml_interpreter.model.model import UMLModel
+
+
+def make_chain_model(length: int) -> UMLModel:
+    elements = [ClassDiagramClass(f"Class {index}") for index in range(length)]
+    for index, (source, target) in enumerate(zip(elements, elements[1:])):
+        rel = source.add_relationship_to(target, name=f"Rel {index}")
+        rel.id = f"EAID_R{index}"
+    return UMLModel(diagrams=[ClassDiagram("Chain", elements)], filename="chain.xml")
+
+
+def test_when_pickle_long_relationship_chain_then_structure_restored() -> None:
+    # GIVEN
+    model = make_chain_model(20_000)
+
+    # WHEN
+    restored: UMLModel = pickle.loads(pickle.dumps(model))
+
+    # THEN
+    elements = restored.diagrams[0].elements
+    assert restored.filename == "chain.xml"
+    assert len(elements) == 20_000
+    assert elements[0].relations_to[0].target is elements[1]
+    assert elements[1].relations_from[0].source is elements[0]
+    assert elements[-1].relations_from[0].id == "EAID_R19998"
+    assert not elements[-1].relations_to
+
+
+def test_when_pickle_model_then_element_details_restored() -> None:
+    # GIVEN
+    iface = ClassDiagramInterface("Iface")
+    iface.id = "EAID_I"
+    iface.attributes = [ClassDiagramAttribute("attr", "integer")]
+    outside = ClassDiagramClass("Not on diagram")
+    rel = iface.add_relationship_to(
+        outside, RelationshipType.Generalization, source_minmax=("1", "inf")
+    )
+    model = UMLModel(diagrams=[ClassDiagram("Diagram", [iface])])
+
+    # WHEN
+    restored: UMLModel = pickle.loads(pickle.dumps(model))
+
+    # THEN
+    restored_iface = restored.diagrams[0].elements[0]
+    restored_rel = restored_iface.relations_to[0]
+    assert isinstance(restored_iface, ClassDiagramInterface)
+    assert restored_iface.id == "EAID_I"
+    assert [(attr.name, attr.type) for attr in restored_iface.attributes] == [("attr", "integer")]
+    assert restored_rel.type is RelationshipType.Generalization
+    assert restored_rel.source_side.min_max_multiplicity == rel.source_side.min_max_multiplicity
+    assert restored_rel.target.name == "Not on diagram"
+    assert restored_rel.target.relations_from == [restored_rel]
+
+
+def test_when_pickle_model_with_sequence_diagram_then_sequences_restored() -> None:
+    # GIVEN
+    model = make_chain_model(2)
+    first, second = model.diagrams[0].elements
+    first.methods = [ClassDiagramMethod("call", "void")]
+    user = SequenceActor("User")
+    sequence = SequenceDiagram("Sequence", [user, first, second])
+    for time, (sender, receiver) in enumerate([(user, first), (first, second)]):
+        message = SyncSequenceMessage(sender, receiver)
+        message.time = time
+        message.related_method = first.methods[0]
+        sequence.add_event(message)
+    model.diagrams.append(sequence)
+
+    # WHEN
+    restored: UMLModel = pickle.loads(pickle.dumps(model))
+
+    # THEN
+    restored_first, restored_second = restored.diagrams[0].elements
+    restored_sequence = restored.diagrams[1]
+    assert isinstance(restored_sequence, SequenceDiagram)
+    restored_user = restored_sequence.actors[0]
+    assert restored_sequence.actors[1:] == [restored_first, restored_second]
+    to_first, to_second = restored_sequence.timeline
+    assert (to_first.sender, to_first.receiver) == (restored_user, restored_first)
+    assert restored_first.messages_to == [to_first] and restored_first.messages_from == [to_second]
+    assert list(restored_second.events) == [to_second]
+    assert to_first.successor is to_second
+    assert to_second.related_method is restored_first.methods[0]
+
+
+def test_when_pickle_model_then_index_seed_and_packages_restored() -> None:
+    # GIVEN
+    drawn, undrawn = ClassDiagramClass("A"), ClassDiagramClass("B")
+    drawn.id, undrawn.id = "EAID_A", "EAID_B"
+    model = UMLModel(diagrams=[ClassDiagram("Diagram", [drawn])])
+    model.seed_index([drawn, undrawn], {"EAID_A": "EAPK_P", "EAID_B": "EAPK_P"}, {"EAPK_P": "Pkg"})
+
+    # WHEN
+    restored: UMLModel = pickle.loads(pickle.dumps(model))
+
+    # THEN
+    assert restored.get_by_id("EAID_B").name == "B"
+    assert [elem.name for elem in restored.elements_in_package("Pkg")] == ["A", "B"]
+
+
+def test_when_relationship_added_to_indexed_element_then_new_objects_indexed() -> None:
+    # GIVEN
+    model = make_chain_model(3)
+    first = model.get_by_id("EAID_R0").source
+    new_class = ClassDiagramInterface("New")
+    new_class.id = "EAID_NEW"
+
+    # WHEN
+    relationship = first.add_relationship_to(new_class, name="New Rel")
+    relationship.id = "EAID_NEW_REL"
+
+    # THEN
+    assert model.get_by_id("EAID_NEW") is new_class
+    assert model.find_by_name("New Rel") == [relationship]
+    assert model.elements_of_type(ClassDiagramInterface) == [new_class]
+    assert len(model.elements_of_type(ClassDiagramClass)) == 3
@@ -0,0 +1,185 @@
+from __future__ import annotations
+import io
+import pickle
+from pathlib import Path
+
+import pytest
+
+from uml_interpreter.deserializer.enterprise_architect.ea_xml_deserializer import (
+    EAXMLDeserializer,
+)
+from uml_interpreter.model.diagrams.class_diagram import (
+    ClassDiagram,
+    ClassDiagramAttribute,
+    ClassDiagramClass,
+    ClassDiagramInterface,
+    ClassDiagramMethod,
+    ClassDiagramMethodParameter,
+    ClassRelationship,
+    RelationshipType,
+)
+from uml_interpreter.model.errors import FrozenModelError
+from uml_interpreter.model.frozen import mutable_class
+from uml_interpreter.model.model import UMLModel
+from uml_interpreter.model.snapshot import ModelSnapshot, write_snapshot
+
+SAMPLE_PATH = Path(__file__).parents[2] / "samples" / "sample_1.xml"
+
+
+def make_model() -> UMLModel:
+    first, second = ClassDiagramClass("A"), ClassDiagramInterface("B")
+    first.id, second.id = "EAID_A", "EAID_B"
+    first.attributes = [ClassDiagramAttribute("attr", "int", "0")]
+    first.methods = [
+        ClassDiagramMethod("meth", "void", [ClassDiagramMethodParameter("param", "str")])
+    ]
+    first.add_relationship_to(second, RelationshipType.Realization, target_minmax=("1", "inf"))
+    dangling = ClassRelationship(source=first, object_id="EAID_R")
+    model = UMLModel(diagrams=[ClassDiagram("Diagram", [first, second])], filename="model.xml")
+    model.unresolved_references = {"EAID_MISSING": [(dangling, "target")]}
+    return model
+
+
+def test_when_model_snapshot_read_then_proxies_expose_model() -> None:
+    # GIVEN
+    stream = io.BytesIO()
+    write_snapshot(make_model(), stream)
+
+    # WHEN
+    model = ModelSnapshot(stream.getbuffer()).model()
+
+    # THEN
+    first, second = model.diagrams[0].elements
+    realization = first.relations_to[0]
+    assert isinstance(first, ClassDiagramClass) and isinstance(second, ClassDiagramInterface)
+    assert (first.name, second.id, model.filename) == ("A", "EAID_B", "model.xml")
+    assert [(attr.name, attr.type, attr.init_value) for attr in first.attributes] == [
+        ("attr", "int", "0")
+    ]
+    assert [(param.name, param.type) for param in first.methods[0].parameters] == [("param", "str")]
+    assert realization.type is RelationshipType.Realization
+    assert realization.target is second and second.relations_from[0] is realization
+    assert realization.target_side.min_max_multiplicity == ("1", "inf")
+    (dangling, side), = model.unresolved_references["EAID_MISSING"]
+    assert (dangling.id, dangling.source, dangling.target, side) == ("EAID_R", first, None, "target")
+    assert model.get_by_id("EAID_B") is second
+
+
+def test_when_element_on_no_diagram_then_kept_in_snapshot() -> None:
+    # GIVEN
+    model = make_model()
+    hidden = ClassDiagramClass("Hidden")
+    hidden.id = "EAID_HIDDEN"
+    model.seed_index([hidden], {"EAID_HIDDEN": "EAID_PACKAGE"}, {"EAID_PACKAGE": "Package"})
+    stream = io.BytesIO()
+
+    # WHEN
+    write_snapshot(model, stream)
+    restored = ModelSnapshot(stream.getbuffer()).model()
+
+    # THEN
+    assert restored.get_by_id("EAID_HIDDEN").name == "Hidden"
+    assert [elem.id for elem in restored.elements_in_package("Package")] == ["EAID_HIDDEN"]
+    assert len(restored.diagrams[0].elements) == 2
+
+
+def test_when_proxy_collections_read_again_then_same_returned() -> None:
+    # GIVEN
+    stream = io.BytesIO()
+    write_snapshot(make_model(), stream)
+    diagram = ModelSnapshot(stream.getbuffer()).model().diagrams[0]
+    first, second = diagram.elements
+
+    # WHEN / THEN
+    assert diagram.elements is diagram.elements
+    assert first.relations_to is first.relations_to
+    assert second.relations_from is second.relations_from
+    assert first.attributes is first.attributes and first.methods is first.methods
+    assert first.methods[0].parameters is first.methods[0].parameters
+
+
+def test_when_snapshot_object_changed_then_raised() -> None:
+    # GIVEN
+    stream = io.BytesIO()
+    write_snapshot(make_model(), stream)
+    first = ModelSnapshot(stream.getbuffer()).element(0)
+
+    # WHEN / THEN
+    with pytest.raises(FrozenModelError):
+        first.name = "C"
+    with pytest.raises(FrozenModelError):
+        first.relations_to.add(first.relations_to[0])
+
+
+def test_when_snapshot_model_thawed_then_mutable_copy_returned() -> None:
+    # GIVEN
+    stream = io.BytesIO()
+    write_snapshot(make_model(), stream)
+    model = ModelSnapshot(stream.getbuffer()).model()
+
+    # WHEN
+    thawed = model.thaw()
+
+    # THEN
+    assert model.frozen and not thawed.frozen
+    first, second = thawed.diagrams[0].elements
+    assert mutable_class(type(first)) is ClassDiagramClass
+    assert mutable_class(type(second)) is ClassDiagramInterface
+    assert mutable_class(type(thawed.diagrams[0])) is ClassDiagram
+    assert [(param.name, param.type) for param in first.methods[0].parameters] == [("param", "str")]
+    realization = first.relations_to[0]
+    assert realization.target is second and second.relations_from[0] is realization
+    assert realization.target_side.min_max_multiplicity == ("1", "inf")
+    (dangling, side), = thawed.unresolved_references["EAID_MISSING"]
+    assert (dangling.id, dangling.source, side) == ("EAID_R", first, "target")
+    first.name = "C"
+    first.add_relationship_to(second, name="Added")
+    assert thawed.get_by_id("EAID_A").name == "C" and model.get_by_id("EAID_A").name == "A"
+    with pytest.raises(FrozenModelError):
+        model.filename = "other.xml"
+
+
+def test_when_snapshot_model_merged_then_merged_model_mutable() -> None:
+    # GIVEN
+    stream = io.BytesIO()
+    write_snapshot(make_model(), stream)
+    model = ModelSnapshot(stream.getbuffer()).model()
+    other_elem = ClassDiagramClass("D")
+    other_elem.id = "EAID_D"
+    other = UMLModel(diagrams=[ClassDiagram("Other", [other_elem])])
+
+    # WHEN
+    merged = UMLModel.merge(model, other)
+
+    # THEN
+    assert not merged.frozen
+    assert [diagram.name for diagram in merged.diagrams] == ["Diagram", "Other"]
+    merged.get_by_id("EAID_A").add_relationship_to(merged.get_by_id("EAID_D"), name="New")
+    assert merged.find_by_name("New")
+
+
+def test_when_sample_snapshot_opened_then_printed_as_model(tmp_path: Path) -> None:
+    # GIVEN
+    model = EAXMLDeserializer.from_path(str(SAMPLE_PATH)).read_model()
+    path = tmp_path / "sample.snap"
+    model.save_snapshot(str(path))
+    expected = io.StringIO()
+    model.print(stream=expected)
+
+    # WHEN
+    snapshot = pickle.loads(pickle.dumps(ModelSnapshot.open(str(path))))
+    restored = snapshot.model()
+
+    # THEN
+    printed = io.StringIO()
+    restored.print(stream=printed)
+    assert printed.getvalue() == expected.getvalue()
+    assert restored.index.package_names() == model.index.package_names()
+    del restored
+    snapshot.close()
+
+
+def test_when_data_is_not_snapshot_then_raised() -> None:
+    # WHEN / THEN
+    with pytest.raises(ValueError):
+        ModelSnapshot(b"<?xml version='1.0'?>" + bytes(1000))
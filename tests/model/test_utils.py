@@ -0,0 +1,16 @@
+from __future__ import annotations
+import gc
+
+from uml_interpreter.model.utils import paused_gc
+
+
+def test_when_pausing_not_enabled_then_gc_kept_running() -> None:
+    # WHEN
+    with paused_gc():
+        default = gc.isenabled()
+    with paused_gc(True):
+        forced = gc.isenabled()
+
+    # THEN
+    assert default and not forced
+    assert gc.isenabled()
@@ -0,0 +1,151 @@
+from __future__ import annotations
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+from uml_interpreter.deserializer.enterprise_architect.constants import DESERIALIZER_CONSTANTS
+from uml_interpreter.deserializer.enterprise_architect.ea_xml_deserializer import (
+    EAXMLDeserializer,
+)
+from uml_interpreter.model.diagrams.class_diagram import (
+    ClassDiagram,
+    ClassDiagramAttribute,
+    ClassDiagramClass,
+    ClassDiagramInterface,
+    ClassDiagramMethod,
+    ClassDiagramMethodParameter,
+    RelationshipType,
+)
+from uml_interpreter.model.diagrams.abstract import UMLDiagram
+from uml_interpreter.model.model import UMLModel
+from uml_interpreter.serializer.serializer import EnterpriseArchitectXMLSerializer
+
+
+SAMPLE_PATH = Path(__file__).parents[2] / "samples" / "sample_1.xml"
+
+
+def model_summary(model: UMLModel) -> list[tuple]:
+    return [
+        (
+            type(diagram).__name__,
+            diagram.name,
+            [
+                (
+                    type(elem).__name__,
+                    elem.id,
+                    elem.name,
+                    [(attr.name, attr.type) for attr in elem.attributes],
+                    [
+                        (meth.name, meth.ret_type, [(param.name, param.type) for param in meth.parameters])
+                        for meth in elem.methods
+                    ],
+                    [
+                        (
+                            rel.id,
+                            rel.type,
+                            rel.name,
+                            rel.source.id,
+                            rel.target.id,
+                            rel.source_side.role,
+                            rel.source_side.min_max_multiplicity,
+                            rel.target_side.role,
+                            rel.target_side.min_max_multiplicity,
+                        )
+                        for rel in elem.relations_to
+                    ],
+                )
+                for elem in getattr(diagram, "elements", ())
+            ],
+        )
+        for diagram in model.diagrams
+    ]
+
+
+def test_when_sample_written_and_read_then_same_model(tmp_path: Path) -> None:
+    # GIVEN
+    model = EAXMLDeserializer.from_path(str(SAMPLE_PATH)).read_model()
+    path = tmp_path / "written.xml"
+
+    # WHEN
+    EnterpriseArchitectXMLSerializer().save_to_file(model, str(path))
+    restored = EAXMLDeserializer.from_path(str(path), streaming=True).read_model()
+
+    # THEN
+    assert model_summary(restored) == model_summary(model)
+    assert restored.index.package_names() == model.index.package_names()
+
+
+def test_when_model_written_and_read_then_relationships_and_ids_kept() -> None:
+    # GIVEN
+    base, iface, derived = ClassDiagramClass("Base"), ClassDiagramInterface("Iface"), ClassDiagramClass("Derived")
+    base.id, iface.id = "EAID_11111111_0000_0000_0000_000000000001", "EAID_22222222_0000_0000_0000_000000000002"
+    derived.attributes = [ClassDiagramAttribute("count", "integer")]
+    derived.methods = [
+        ClassDiagramMethod("run", "void", [ClassDiagramMethodParameter("times", "integer")]),
+        ClassDiagramMethod("stop", ""),
+    ]
+    derived.add_relationship_to(base, RelationshipType.Generalization, source_minmax=("1", "inf"))
+    derived.add_relationship_to(iface, RelationshipType.Realization)
+    association = base.add_relationship_to(
+        iface, name="uses", source_role="user", target_role="used", target_minmax=("0", "inf")
+    )
+    association.id = "EAID_33333333_0000_0000_0000_000000000003"
+    model = UMLModel(diagrams=[ClassDiagram("Classes", [base, iface, derived]), UMLDiagram("Other")])
+
+    # WHEN
+    data = EnterpriseArchitectXMLSerializer(indent=None).to_bytes(model)
+    restored = EAXMLDeserializer.from_bytes(data).read_model()
+
+    # THEN
+    summary, restored_summary = model_summary(model), model_summary(restored)
+    # Derived had no ID, so it's given a new one, together with its relationships.
+    assert restored_summary[0][2][2][1].startswith("EAID_")
+    derived_summary = restored_summary[0][2][2]
+    assert [rel[1:3] + rel[5:] for rel in derived_summary[5]] == [
+        rel[1:3] + rel[5:] for rel in summary[0][2][2][5]
+    ]
+    assert restored_summary[0][2][:2] == summary[0][2][:2]
+    assert restored_summary[0][2][2][2:5] == summary[0][2][2][2:5]
+    assert restored_summary[1] == ("UMLDiagram", "Other", [])
+
+
+def test_when_model_with_unresolved_reference_written_then_reference_kept() -> None:
+    # GIVEN
+    elem = ClassDiagramClass("A")
+    elem.id = "EAID_A"
+    model = UMLModel(diagrams=[ClassDiagram("Diagram", [elem])])
+    rel = elem.add_relationship_to(ClassDiagramClass("Placeholder"))
+    rel.id = "EAID_R"
+    rel.detach()
+    rel.source = elem
+    model.unresolved_references = {"EAID_OTHER_EXPORT": [(rel, "target")]}
+
+    # WHEN
+    restored = EAXMLDeserializer.from_bytes(
+        EnterpriseArchitectXMLSerializer().to_bytes(model)
+    ).read_model()
+
+    # THEN
+    restored_rel = restored.get_by_id("EAID_R")
+    assert restored_rel.source is restored.get_by_id("EAID_A")
+    assert restored.unresolved_references == {"EAID_OTHER_EXPORT": [(restored_rel, "target")]}
+
+
+def test_when_relationships_have_non_ea_ids_then_end_ids_unique() -> None:
+    # GIVEN
+    first, second = ClassDiagramClass("A"), ClassDiagramClass("B")
+    first.id, second.id = "A", "B"
+    first.add_relationship_to(second, name="R1").id = "R1"
+    second.add_relationship_to(first, name="R2").id = "R2"
+    model = UMLModel(diagrams=[ClassDiagram("Diagram", [first, second])])
+
+    # WHEN
+    data = EnterpriseArchitectXMLSerializer().to_bytes(model)
+    restored = EAXMLDeserializer.from_bytes(data).read_model()
+
+    # THEN
+    end_ids = [
+        end.get(f"{DESERIALIZER_CONSTANTS['XMI2_1']}id") for end in ET.fromstring(data).iter("ownedEnd")
+    ]
+    assert len(end_ids) == 4 and len(set(end_ids)) == 4
+    assert restored.get_by_id("R1").target is restored.get_by_id("B")
+    assert restored.get_by_id("R2").target is restored.get_by_id("A")
@@ -0,0 +1,130 @@
+from __future__ import annotations
+import os
+import shutil
+from pathlib import Path
+
+import pytest
+
+import uml_interpreter.source.cache as cache_module
+from uml_interpreter.deserializer import abstract
+from uml_interpreter.deserializer.enterprise_architect.ea_xml_deserializer import (
+    EAXMLDeserializer,
+)
+from uml_interpreter.source.cache import ParseCache
+
+
+SAMPLE_PATH = Path(__file__).parents[2] / "samples" / "sample_1.xml"
+
+
+@pytest.fixture
+def sample_copy(tmp_path: Path) -> Path:
+    path = tmp_path / "sample.xml"
+    shutil.copy(SAMPLE_PATH, path)
+    return path
+
+
+def test_when_read_twice_then_second_model_loaded_from_cache(tmp_path: Path, sample_copy: Path) -> None:
+    # GIVEN
+    cache = ParseCache(str(tmp_path / "cache"))
+    deserializer = EAXMLDeserializer.from_path(str(sample_copy), cache=cache)
+    parsed = deserializer.read_model()
+
+    # WHEN
+    cached = cache.get(str(sample_copy), deserializer._cache_reader())
+
+    # THEN
+    assert cached is not None and cached is not parsed
+    assert cached.filename == str(sample_copy)
+    assert [elem.id for elem in cached.diagrams[0].elements] == [
+        elem.id for elem in parsed.diagrams[0].elements
+    ]
+
+
+def test_when_file_changed_then_cache_missed(tmp_path: Path, sample_copy: Path) -> None:
+    # GIVEN
+    cache = ParseCache(str(tmp_path / "cache"))
+    deserializer = EAXMLDeserializer.from_path(str(sample_copy), cache=cache)
+    deserializer.read_model()
+
+    # WHEN
+    sample_copy.write_text(sample_copy.read_text(encoding="cp1252").replace("Class A", "Class X"), encoding="cp1252")
+
+    # THEN
+    assert cache.get(str(sample_copy), deserializer._cache_reader()) is None
+    model = EAXMLDeserializer.from_path(str(sample_copy), cache=cache).read_model()
+    assert "Class X" in [elem.name for elem in model.diagrams[0].elements]
+
+
+def test_when_entry_corrupted_then_removed_and_rebuilt(tmp_path: Path, sample_copy: Path) -> None:
+    # GIVEN
+    cache_dir = tmp_path / "cache"
+    cache = ParseCache(str(cache_dir))
+    deserializer = EAXMLDeserializer.from_path(str(sample_copy), cache=cache)
+    deserializer.read_model()
+    (entry,) = cache_dir.glob("*" + ParseCache.ENTRY_SUFFIX)
+    entry.write_bytes(entry.read_bytes()[:-10])
+
+    # WHEN
+    missed = cache.get(str(sample_copy), deserializer._cache_reader())
+    model = deserializer.read_model()
+
+    # THEN
+    assert missed is None
+    assert model.diagrams[0].elements
+    assert cache.get(str(sample_copy), deserializer._cache_reader()) is not None
+
+
+def test_when_read_in_other_mode_then_cache_missed(tmp_path: Path, sample_copy: Path) -> None:
+    # GIVEN
+    cache = ParseCache(str(tmp_path / "cache"))
+    EAXMLDeserializer.from_path(str(sample_copy), cache=cache).read_model()
+
+    # WHEN
+    streaming = EAXMLDeserializer.from_path(str(sample_copy), streaming=True, cache=cache)
+
+    # THEN
+    assert cache.get(str(sample_copy), streaming._cache_reader()) is None
+    streaming.read_model()
+    assert cache.get(str(sample_copy), streaming._cache_reader()) is not None
+
+
+def test_when_parser_or_state_changed_then_cache_missed(
+    tmp_path: Path, sample_copy: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    # GIVEN
+    cache = ParseCache(str(tmp_path / "cache"))
+    deserializer = EAXMLDeserializer.from_path(str(sample_copy), cache=cache)
+    deserializer.read_model()
+    reader = deserializer._cache_reader()
+
+    # WHEN
+    monkeypatch.setattr(abstract, "_code_hash", lambda cls: "changed")
+    changed_reader = deserializer._cache_reader()
+    monkeypatch.setattr(cache_module, "STATE_VERSION", -1)
+
+    # THEN
+    assert changed_reader != reader
+    assert cache.get(str(sample_copy), reader) is None
+
+
+def test_when_size_budget_exceeded_then_least_recently_used_evicted(tmp_path: Path) -> None:
+    # GIVEN
+    paths = []
+    for index in range(3):
+        path = tmp_path / f"sample_{index}.xml"
+        path.write_bytes(SAMPLE_PATH.read_bytes() + b" " * index)
+        paths.append(path)
+    cache = ParseCache(str(tmp_path / "cache"))
+    model = EAXMLDeserializer.from_path(str(paths[0])).read_model()
+    cache.put(str(paths[0]), model)
+    cache.max_size = cache.size() * 2
+
+    # WHEN
+    cache.put(str(paths[1]), model)
+    os.utime(cache._entry_path(str(paths[0])), (0, 0))
+    cache.put(str(paths[2]), model)
+
+    # THEN
+    assert cache.get(str(paths[0])) is None
+    assert cache.get(str(paths[1])) is not None
+    assert cache.get(str(paths[2])) is not None
@@ -0,0 +1,125 @@
+from __future__ import annotations
+import gzip
+import lzma
+import mmap
+import zipfile
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import Callable
+
+import pytest
+
+from uml_interpreter.deserializer.enterprise_architect.ea_xml_deserializer import (
+    EAXMLDeserializer,
+)
+from uml_interpreter.source.source import (
+    BytesSource,
+    FileSource,
+    GzipFileSource,
+    MmapFileSource,
+    XMLSource,
+    XzFileSource,
+    ZipFileSource,
+)
+
+
+SAMPLE_PATH = Path(__file__).parents[2] / "samples" / "sample_1.xml"
+
+
+def gzip_source(tmp_path: Path) -> XMLSource:
+    path = tmp_path / "sample.xml.gz"
+    path.write_bytes(gzip.compress(SAMPLE_PATH.read_bytes()))
+    return GzipFileSource(str(path))
+
+
+def xz_source(tmp_path: Path) -> XMLSource:
+    path = tmp_path / "sample.xml.xz"
+    path.write_bytes(lzma.compress(SAMPLE_PATH.read_bytes()))
+    return XzFileSource(str(path))
+
+
+def zip_source(tmp_path: Path) -> XMLSource:
+    path = tmp_path / "sample.zip"
+    with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        archive.write(SAMPLE_PATH, "sample.xml")
+    return ZipFileSource(str(path))
+
+
+def bytes_source(tmp_path: Path) -> XMLSource:
+    return BytesSource(bytearray(SAMPLE_PATH.read_bytes()))
+
+
+def mmap_source(tmp_path: Path) -> XMLSource:
+    return MmapFileSource(str(SAMPLE_PATH))
+
+
+@pytest.mark.parametrize("streaming", [False, True])
+@pytest.mark.parametrize(
+    "make_source", [gzip_source, xz_source, zip_source, bytes_source, mmap_source]
+)
+def test_when_read_from_source_then_same_as_plain_file(
+    tmp_path: Path, make_source: Callable[[Path], XMLSource], streaming: bool
+) -> None:
+    # GIVEN
+    expected = EAXMLDeserializer(FileSource(str(SAMPLE_PATH))).read_model()
+    deserializer = EAXMLDeserializer(make_source(tmp_path), streaming=streaming)
+
+    # WHEN
+    model = deserializer.read_model()
+
+    # THEN
+    assert [diagram.name for diagram in model.diagrams] == [
+        diagram.name for diagram in expected.diagrams
+    ]
+    assert [
+        (elem.id, [attr.name for attr in elem.attributes])
+        for elem in model.diagrams[0].elements
+    ] == [
+        (elem.id, [attr.name for attr in elem.attributes])
+        for elem in expected.diagrams[0].elements
+    ]
+
+
+def test_when_bytes_source_over_mmap_then_model_read() -> None:
+    # GIVEN
+    with open(SAMPLE_PATH, "rb") as file, mmap.mmap(
+        file.fileno(), 0, access=mmap.ACCESS_READ
+    ) as mapped:
+        deserializer = EAXMLDeserializer.from_bytes(mapped, streaming=True)
+
+        # WHEN
+        model = deserializer.read_model()
+
+    # THEN
+    assert len(model.diagrams[0].elements) == 3
+
+
+def test_when_zip_has_many_files_and_no_member_then_error_raised(tmp_path: Path) -> None:
+    # GIVEN
+    path = tmp_path / "samples.zip"
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.write(SAMPLE_PATH, "first.xml")
+        archive.write(SAMPLE_PATH, "second.xml")
+
+    # WHEN / THEN
+    with pytest.raises(ValueError):
+        ZipFileSource(str(path)).read_tree()
+    assert ZipFileSource(str(path), "second.xml").read_tree().getroot() is not None
+
+
+class TreeOnlySource(XMLSource):
+    def read_tree(self) -> ET.ElementTree:
+        return ET.parse(SAMPLE_PATH)
+
+
+def test_when_source_reads_only_tree_then_streamed_from_tree() -> None:
+    # GIVEN
+    expected = EAXMLDeserializer(FileSource(str(SAMPLE_PATH))).read_model()
+
+    # WHEN
+    model = EAXMLDeserializer(TreeOnlySource(), streaming=True).read_model()
+
+    # THEN
+    assert [elem.id for elem in model.diagrams[0].elements] == [
+        elem.id for elem in expected.diagrams[0].elements
+    ]
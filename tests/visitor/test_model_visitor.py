@@ -0,0 +1,78 @@
+from __future__ import annotations
+import io
+from itertools import islice
+
+from uml_interpreter.model.diagrams.class_diagram import (
+    ClassDiagram,
+    ClassDiagramClass,
+)
+from uml_interpreter.model.model import UMLModel
+from uml_interpreter.visitor.model_visitor import ModelPrinter
+
+
+def make_chain_model(length: int) -> UMLModel:
+    elements = [ClassDiagramClass(f"Class {index}") for index in range(length)]
+    for source, target in zip(elements, elements[1:]):
+        source.add_relationship_to(target, name="Rel")
+    return UMLModel(diagrams=[ClassDiagram("Chain", elements)])
+
+
+def test_when_print_to_stream_then_buffered_lines_written() -> None:
+    # GIVEN
+    model = make_chain_model(1_000)
+    stream = io.StringIO()
+    printer = ModelPrinter(stream=stream, buffer_size=1_000)
+
+    # WHEN
+    printer.write(model)
+
+    # THEN
+    lines = stream.getvalue().split("\n")
+    assert lines[-1] == ""
+    assert lines[:-1] == list(ModelPrinter().lines(model))
+    # Classes with headers and relationships at both of their ends, but the first and last.
+    assert len(lines) - 1 == 2 + 1_000 * 5 - 2 * 2
+    assert lines[4] == (
+        "|--------RelationshipType.Association (Rel) - Class 0 (None)[0...1] -> [0...1] (None) Class 1"
+    )
+    assert lines[7] == lines[4]
+
+
+def test_when_lines_consumed_partially_then_nothing_written(capsys) -> None:
+    # GIVEN
+    model = make_chain_model(10)
+
+    # WHEN
+    lines = list(islice(ModelPrinter(indent=1, buffer_size=1).lines(model), 3))
+
+    # THEN
+    assert lines == ["|-Model:", '|---Class Diagram: "Chain"', '|-----Class: "Class 0" id: None']
+    assert capsys.readouterr().out == ""
+
+
+def test_when_model_accepts_printer_then_whole_model_printed() -> None:
+    # GIVEN
+    model = make_chain_model(10)
+    stream = io.StringIO()
+
+    # WHEN
+    model.accept(ModelPrinter(stream=stream))
+
+    # THEN
+    assert stream.getvalue() == "\n".join([*ModelPrinter().lines(model), ""])
+
+
+def test_when_element_accepts_printer_then_element_printed() -> None:
+    # GIVEN
+    model = make_chain_model(3)
+    elem = model.diagrams[0].elements[1]
+    stream = io.StringIO()
+
+    # WHEN
+    elem.accept(ModelPrinter(stream=stream))
+
+    # THEN
+    lines = stream.getvalue().split("\n")
+    assert lines[0] == '|Class: "Class 1" id: None'
+    assert lines == [*ModelPrinter().lines(elem), ""]
+    assert len(lines) - 1 == 5
@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+from uml_interpreter.model.diagrams.class_diagram import (
+    ClassDiagram,
+    ClassDiagramAttribute,
+    ClassDiagramClass,
+    ClassDiagramMethod,
+    ClassDiagramMethodParameter,
+)
+from uml_interpreter.model.model import UMLModel
+from uml_interpreter.visitor.model_visitor import ModelVisitor
+from uml_interpreter.visitor.walker import (
+    WalkAction,
+    WalkEvent,
+    _DispatchTable,
+    walk_visitor,
+    walk_visitors,
+)
+
+
+def make_model() -> tuple[UMLModel, ClassDiagramClass, ClassDiagramClass]:
+    first, second = ClassDiagramClass("A"), ClassDiagramClass("B")
+    first.id, second.id = "EAID_A", "EAID_B"
+    first.attributes = [ClassDiagramAttribute("attr", "int")]
+    first.methods = [
+        ClassDiagramMethod("meth", "void", [ClassDiagramMethodParameter("param", "int")])
+    ]
+    first.add_relationship_to(second, name="Rel")
+    return UMLModel(diagrams=[ClassDiagram("Diagram", [first, second])]), first, second
+
+
+def test_when_walk_model_then_objects_yielded_depth_first() -> None:
+    # GIVEN
+    model, first, second = make_model()
+    diagram = model.diagrams[0]
+    rel = first.relations_to[0]
+
+    # WHEN
+    steps = list(model.walk())
+
+    # THEN
+    assert steps == [
+        (0, model),
+        (1, diagram),
+        (2, first),
+        (3, rel),
+        (3, first.attributes[0]),
+        (3, first.methods[0]),
+        (4, first.methods[0].parameters[0]),
+        (2, second),
+        (3, rel),
+    ]
+
+
+def test_when_walk_pruned_then_children_skipped_and_left() -> None:
+    # GIVEN
+    model, first, second = make_model()
+    walk = model.walk(events=True)
+    steps = []
+
+    # WHEN
+    for event, depth, obj in walk:
+        steps.append((event, obj))
+        if event is WalkEvent.ENTER and obj is first:
+            walk.prune()
+
+    # THEN
+    assert steps[2:6] == [
+        (WalkEvent.ENTER, first),
+        (WalkEvent.LEAVE, first),
+        (WalkEvent.ENTER, second),
+        (WalkEvent.ENTER, first.relations_to[0]),
+    ]
+    assert steps[-2:] == [(WalkEvent.LEAVE, model.diagrams[0]), (WalkEvent.LEAVE, model)]
+
+
+def test_when_print_model_then_hierarchy_printed(capsys) -> None:
+    # GIVEN
+    model, _, _ = make_model()
+
+    # WHEN
+    model.print()
+
+    # THEN
+    assert capsys.readouterr().out.splitlines() == [
+        "|Model:",
+        '|--Class Diagram: "Diagram"',
+        '|----Class: "A" id: EAID_A',
+        "|------Relationships (source):",
+        "|--------RelationshipType.Association (Rel) - A (None)[0...1] -> [0...1] (None) B",
+        "|------Attributes:",
+        "|--------attr: int",
+        "|------Methods:",
+        "|--------meth: ['param: int'] -> void",
+        '|----Class: "B" id: EAID_B',
+        "|------Relationships (target):",
+        "|--------RelationshipType.Association (Rel) - A (None)[0...1] -> [0...1] (None) B",
+    ]
+
+
+class ClassCounter(ModelVisitor):
+    walked = True
+
+    def __init__(self, prune_diagrams: bool = False) -> None:
+        self.prune_diagrams = prune_diagrams
+        self.classes: list[str] = []
+        self.left: list[object] = []
+
+    def visit_class_diagram(self, diagram: ClassDiagram):
+        return WalkAction.PRUNE if self.prune_diagrams else None
+
+    def visit_class_diagram_class(self, elem: ClassDiagramClass):
+        self.classes.append(elem.name)
+
+    def leave(self, obj: object) -> None:
+        self.left.append(obj)
+
+
+class RecursiveClassCounter(ModelVisitor):
+    def __init__(self) -> None:
+        self.classes: list[str] = []
+
+    def visit_model(self, model: UMLModel):
+        for diagram in model.diagrams:
+            diagram.accept(self)
+
+    def visit_class_diagram(self, diagram: ClassDiagram):
+        for elem in diagram.elements:
+            elem.accept(self)
+
+    def visit_class_diagram_class(self, elem: ClassDiagramClass):
+        self.classes.append(elem.name)
+
+
+def test_when_walk_recursive_visitor_then_objects_visited_once() -> None:
+    # GIVEN
+    model, first, second = make_model()
+    visitor = RecursiveClassCounter()
+
+    # WHEN
+    walk_visitor(visitor, model)
+    model.accept(visitor)
+
+    # THEN
+    assert visitor.classes == ["A", "B", "A", "B"]
+
+
+def test_when_walk_visitors_then_each_prunes_own_subtrees() -> None:
+    # GIVEN
+    model, first, second = make_model()
+    pruning, counting = ClassCounter(prune_diagrams=True), ClassCounter()
+
+    # WHEN
+    walk_visitors([pruning, counting], model)
+
+    # THEN
+    assert pruning.classes == []
+    assert pruning.left == [model.diagrams[0], model]
+    assert counting.classes == ["A", "B"]
+    assert counting.left[-1] is model and first in counting.left
+
+
+def test_when_visit_method_not_overridden_then_not_dispatched() -> None:
+    # GIVEN
+    table = _DispatchTable([ClassCounter()])
+
+    # WHEN
+    handlers = {cls: table[cls] for cls in (ClassDiagramClass, ClassDiagramAttribute, UMLModel)}
+
+    # THEN
+    assert len(handlers[ClassDiagramClass]) == 1
+    assert handlers[ClassDiagramAttribute] == ()
+    assert handlers[UMLModel] == ()
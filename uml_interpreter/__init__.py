@@ -0,0 +1,7 @@
+from importlib.metadata import PackageNotFoundError, version
+
+try:
+    __version__ = version("uml-interpreter")
+except PackageNotFoundError:
+    # Running from a source tree without the package installed.
+    __version__ = "0+unknown"
@@ -1,8 +1,32 @@
+import hashlib
+import sys
 import xml.etree.ElementTree as ET
 from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from functools import cache
+from typing import Iterator
 from uml_interpreter.deserializer.errors import InvalidXMLError
+from uml_interpreter.model.abstract import UMLObject
 from uml_interpreter.model.model import UMLModel
-from uml_interpreter.source.source import XMLSource
+from uml_interpreter.model.utils import paused_gc
+from uml_interpreter.source.source import FileSource, XMLSource
+
+
+@dataclass
+class ModelUpdate:
+    """
+    Changes applied to the model by XMLDeserializer.update_model.
+    Modified elements of unchanged type are patched in place, other modified
+    elements are listed as their new instances.
+    """
+
+    added: list[UMLObject] = field(default_factory=list)
+    removed: list[UMLObject] = field(default_factory=list)
+    modified: list[UMLObject] = field(default_factory=list)
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.added or self.removed or self.modified)
 
 
 class Deserializer(ABC):
@@ -22,13 +46,57 @@ class Deserializer(ABC):
 
 
 class XMLDeserializer(Deserializer):
+    streaming: bool = False
+    """
+    If set to True, the model is built from incremental parser events
+    and the whole XML tree is never held in memory.
+    """
+
     def read_model(self) -> UMLModel:
+        if (cache := self.source.cache) is not None:
+            if (model := cache.get(self.source.path, self._cache_reader())) is not None:
+                return model
+
+        try:
+            with paused_gc():
+                if self.streaming:
+                    model = self._parse_model_events(self.source.read_events())
+                else:
+                    tree: ET.ElementTree = self.source.read_tree()
+                    model = self._parse_model(tree)
+        except ET.ParseError as exc:
+            raise InvalidXMLError(exc.msg)
+
+        if cache is not None:
+            cache.put(self.source.path, model, self._cache_reader())
+        return model
+
+    def _cache_reader(self) -> str:
+        """
+        Identifies the deserializer's class, its code and mode in the keys of cached models.
+        """
+        cls = type(self)
+        return f"{cls.__module__}.{cls.__qualname__}:{_code_hash(cls)}:streaming={self.streaming}"
+
+    def update_model(self, model: UMLModel, source: XMLSource) -> ModelUpdate:
+        """
+        Updates the model read before by the deserializer to match the new source,
+        building only the elements that changed and the diagrams referring to them.
+        The new document is still parsed and hashed as a whole, so only building
+        the objects takes time proportional to the size of the change. The new
+        source replaces the deserializer's source afterwards.
+        """
         try:
-            tree: ET.ElementTree = self.source.read_tree()
-            return self._parse_model(tree)
+            with paused_gc():
+                update = self._update_model(model, source.read_tree())
         except ET.ParseError as exc:
             raise InvalidXMLError(exc.msg)
 
+        self.source = source
+        if isinstance(source, FileSource):
+            model.filename = source.path
+        return update
+
     @property
     def source(self) -> XMLSource:
         return self._source
@@ -40,3 +108,30 @@ class XMLDeserializer(Deserializer):
     @abstractmethod
     def _parse_model(self, tree: ET.ElementTree) -> UMLModel:
         pass
+
+    @abstractmethod
+    def _update_model(self, model: UMLModel, tree: ET.ElementTree) -> ModelUpdate:
+        pass
+
+    @abstractmethod
+    def _parse_model_events(
+        self, events: Iterator[tuple[str, ET.Element]]
+    ) -> UMLModel:
+        pass
+
+
+@cache
+def _code_hash(cls: type) -> str:
+    """
+    Returns the hash of the source files of the library's modules defining
+    the class and its bases, which changes with the parsing code.
+    """
+    digest = hashlib.sha256()
+    for module_name in dict.fromkeys(klass.__module__ for klass in cls.__mro__):
+        module = sys.modules.get(module_name)
+        if module_name.startswith("uml_interpreter.") and (
+            path := getattr(module, "__file__", None)
+        ):
+            with open(path, "rb") as source_file:
+                digest.update(source_file.read())
+    return digest.hexdigest()[:16]
@@ -0,0 +1,85 @@
+"""
+Batch loading of many Enterprise Architect XML files
+
+The module includes the following:
+- LoadResult
+- load_models
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Iterable, Optional
+
+from uml_interpreter.deserializer.enterprise_architect.ea_xml_deserializer import (
+    EAXMLDeserializer,
+)
+from uml_interpreter.deserializer.errors import InvalidXMLError
+from uml_interpreter.model.model import UMLModel
+from uml_interpreter.model import utils
+from uml_interpreter.model.utils import paused_gc
+
+
+@dataclass
+class LoadResult:
+    path: str
+    model: Optional[UMLModel] = None
+    error: Optional[Exception] = None
+    """
+    InvalidXMLError (or IdMismatchException) raised while reading the file,
+    or OSError if the file couldn't be opened.
+    """
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def _load_model(path: str, streaming: bool) -> LoadResult:
+    try:
+        return LoadResult(path, EAXMLDeserializer.from_path(path, streaming).read_model())
+    except (InvalidXMLError, OSError) as exc:
+        return LoadResult(path, error=exc)
+
+
+def _init_worker() -> None:
+    # Worker processes only build models, so pausing the collector doesn't
+    # affect any other work.
+    utils.PAUSE_GC = True
+
+
+def load_models(
+    paths: Iterable[str],
+    jobs: Optional[int] = None,
+    streaming: bool = False,
+    chunksize: int = 1,
+) -> list[LoadResult]:
+    """
+    Reads models from many files using a pool of processes.
+    Results are returned in the order of given paths. Errors of a single file
+    are stored in its result and don't stop the other files from being read.
+
+    :arg jobs - number of worker processes, os.cpu_count() by default.
+        With a single job files are read in the current process.
+    :arg streaming - whether files should be read in the streaming mode.
+    :arg chunksize - number of files sent to a worker at once.
+    """
+    paths = [os.fspath(path) for path in paths]
+    jobs = jobs or os.cpu_count() or 1
+
+    if jobs == 1 or len(paths) <= 1:
+        return [_load_model(path, streaming) for path in paths]
+
+    with ProcessPoolExecutor(
+        max_workers=min(jobs, len(paths)), initializer=_init_worker
+    ) as executor:
+        # Models are unpickled while results are collected.
+        with paused_gc():
+            return list(
+                executor.map(
+                    _load_model,
+                    paths,
+                    [streaming] * len(paths),
+                    chunksize=chunksize,
+                )
+            )
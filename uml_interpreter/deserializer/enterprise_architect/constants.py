@@ -9,6 +9,8 @@ The module includes the following:
 - EA_ATTR_EXT
 - CLASS_DIAGRAM_TYPES
 - CLASS_IFACE_MAPPING
+- CLASS_REL_MAPPING_TYPE
+- CONN_REL_MAPPING_TYPE
 - ERROR_MESS
 - TAGS_ERRORS
 - ErrorType
@@ -103,6 +105,8 @@ EA_TAGS_EXT: dict[str, str] = {
     "conn": "connector",
     "conn_src": "source",
     "conn_trgt": "target",
+    "conn_end_role": "role",
+    "conn_end_type": "type",
     "conn_propty": "properties",
     "diags": "diagrams",
     "diag": "diagram",
@@ -124,6 +128,8 @@ EA_ATTR_EXT: dict[str, str] = {
     "conn_name": "name",
     "conn_src_id": f"{DESERIALIZER_CONSTANTS['XMI2_1']}idref",
     "conn_trgt_id": f"{DESERIALIZER_CONSTANTS['XMI2_1']}idref",
+    "conn_end_role_name": "name",
+    "conn_end_multiplicity": "multiplicity",
     "conn_propty_type": "ea_type",
     "conn_propty_dir": "direction",
     "diag_id": f"{DESERIALIZER_CONSTANTS['XMI2_1']}id",
@@ -147,6 +153,18 @@ CLASS_REL_MAPPING_TYPE: dict[str, RelationshipType] = {
 Mapping of relationship elements to their type name
 """
 
+CONN_REL_MAPPING_TYPE: dict[str, RelationshipType] = {
+    "Association": RelationshipType.Association,
+    "Aggregation": RelationshipType.Association,
+    "Generalization": RelationshipType.Generalization,
+    "Realisation": RelationshipType.Realization,
+    "Dependency": RelationshipType.Dependency,
+    "Usage": RelationshipType.Dependency,
+}
+"""
+Mapping of extension section connectors' ea_type to their type name
+"""
+
 CLASS_IFACE_MAPPING: dict[str, type[ClassDiagramElement]] = {
     "uml:Class": ClassDiagramClass,
     "uml:Interface": ClassDiagramInterface,
@@ -1,6 +1,7 @@
-from typing import Any, Optional, Callable
+from typing import Any, Iterator, Optional, Callable, Sequence
 from functools import wraps
-from collections import defaultdict, deque
+from collections import deque
+from itertools import chain
 import logging
 
 import xml.etree.ElementTree as ET
@@ -9,12 +10,16 @@ from uml_interpreter.deserializer.enterprise_architect.constants import (
     CLASS_IFACE_MAPPING,
     CLASS_REL_MAPPING_TYPE,
     CLASS_RELATIONSHIPS_TYPES,
+    CONN_REL_MAPPING_TYPE,
     EA_ATTR,
+    EA_ATTR_EXT,
     EA_ATTR_MAPPING,
     EA_TAGS,
+    EA_TAGS_EXT,
 )
-from uml_interpreter.deserializer.abstract import XMLDeserializer
+from uml_interpreter.deserializer.abstract import ModelUpdate, XMLDeserializer
 from uml_interpreter.deserializer.enterprise_architect.utils import (
+    RelationshipEditor,
     SourceDestinationPair,
     SetRelationshipSource,
     SetRelationshipTarget,
@@ -28,7 +33,8 @@ from uml_interpreter.deserializer.errors import (
 )
 from uml_interpreter.model.diagrams.abstract import UMLDiagram
 from uml_interpreter.model.abstract import UMLObject
-from uml_interpreter.model.model import UMLModel
+from uml_interpreter.model.frozen import mutable_class
+from uml_interpreter.model.model import LazyDiagrams, RelationshipEnd, UMLModel
 from uml_interpreter.model.diagrams.class_diagram import (
     ClassDiagram,
     ClassDiagramAttribute,
@@ -36,13 +42,61 @@ from uml_interpreter.model.diagrams.class_diagram import (
     ClassDiagramMethod,
     ClassDiagramMethodParameter,
     ClassRelationship,
+    Multiplicity,
+    RelationshipType,
 )
-from uml_interpreter.source.source import FileSource, StringSource, XMLSource
+from uml_interpreter.source.cache import ParseCache
+from uml_interpreter.source.source import (
+    BytesSource,
+    FileSource,
+    StringSource,
+    XMLSource,
+)
+
+
+# Tags and namespaced attribute keys resolved once, for use in the builders' loops.
+_ELEM = EA_TAGS["elem"]
+_ELEM_ID = EA_ATTR["elem_id"]
+_ELEM_TYPE = EA_ATTR["elem_type"]
+_ELEM_NAME = EA_ATTR["elem_name"]
+_ATTR_TAG = EA_TAGS["elem_attr"]
+_ATTR_NAME = EA_ATTR["elem_attr_name"]
+_ATTR_TYPE_TAG = EA_TAGS["elem_attr_type"]
+_ATTR_TYPE = EA_ATTR["elem_attr_type"]
+_METH_TAG = EA_TAGS["elem_meth"]
+_METH_NAME = EA_ATTR["elem_meth_name"]
+_PARAM_TAG = EA_TAGS["elem_meth_param"]
+_PARAM_NAME = EA_ATTR["elem_meth_param_name"]
+_PARAM_TYPE_TAG = EA_TAGS["elem_meth_param_type"]
+_PARAM_TYPE = EA_ATTR["elem_meth_param_type"]
+_RET_TYPE = EA_ATTR["elem_meth_ret_type"]
+_END_TAG = EA_TAGS["end"]
+_END_ID = EA_ATTR["end_id"]
+_END_NAME = EA_ATTR["end_name"]
+_END_TYPE_TAG = EA_TAGS["end_type"]
+_END_TYPE_REF = EA_ATTR["end_type_src"]
+_END_LOW_TAG = EA_TAGS["end_low"]
+_END_HIGH_TAG = EA_TAGS["end_high"]
+_END_VAL = EA_ATTR["end_low_val"]
+_END_VAL_TYPE = EA_ATTR["end_low_type"]
+_CONNS_TAG = EA_TAGS_EXT["conns"]
+_CONN_TAG = EA_TAGS_EXT["conn"]
+_CONN_ID = EA_ATTR_EXT["conn_id"]
+_CONN_NAME = EA_ATTR_EXT["conn_name"]
+_CONN_SRC_TAG = EA_TAGS_EXT["conn_src"]
+_CONN_TRGT_TAG = EA_TAGS_EXT["conn_trgt"]
+_CONN_END_ID = EA_ATTR_EXT["conn_src_id"]
+_CONN_ROLE_TAG = EA_TAGS_EXT["conn_end_role"]
+_CONN_ROLE_NAME = EA_ATTR_EXT["conn_end_role_name"]
+_CONN_END_TYPE_TAG = EA_TAGS_EXT["conn_end_type"]
+_CONN_MULTIPLICITY = EA_ATTR_EXT["conn_end_multiplicity"]
+_CONN_PROPTY_TAG = EA_TAGS_EXT["conn_propty"]
+_CONN_TYPE = EA_ATTR_EXT["conn_propty_type"]
 
 
 def evaluate_elements_afterwards(blocking: bool = False) -> Callable:
     """
-    Decorator that evaluates all elements from the evaluation queue.
+    Decorator that reports the references left in the evaluation queue.
     :arg blocking - if set to True, it raises IdMismatchException when ID present as a key in evaluation
         queue is not present in the ID to instance mapping.
     """
@@ -62,65 +116,506 @@ def evaluate_elements_afterwards(blocking: bool = False) -> Callable:
     return wrapper
 
 
+class _LazyIndexSeed:
+    """
+    Objects seeding the index of a lazily read model. Elements not built yet
+    are built once the index is (i.e. on the first lookup), so that it's complete.
+    """
+
+    def __init__(self, deserializer: "EAXMLDeserializer") -> None:
+        self._deserializer = deserializer
+
+    def __iter__(self) -> Iterator[UMLObject]:
+        deserializer = self._deserializer
+        while deserializer._id_to_node:
+            deserializer._load_elem(next(iter(deserializer._id_to_node)))
+        return iter(list(deserializer._id_to_instance_mapping.values()))
+
+
 class EAXMLDeserializer(XMLDeserializer):
     IGNORED_XML_ELEMENTS = ["uml:Package"]
     """
     Classes ignored during parsing.
     """
 
-    def __init__(self, source: XMLSource) -> None:
+    PACKAGE_TYPE = "uml:Package"
+    """
+    Type of the packagedElement nodes grouping other elements into packages.
+    """
+
+    def __init__(
+        self,
+        source: XMLSource,
+        streaming: bool = False,
+        lazy: bool = False,
+        track_changes: bool = False,
+    ) -> None:
+        """
+        :arg streaming - build the model from incremental parser events.
+        :arg lazy - only index the elements and diagrams while reading the model,
+            building each diagram with the elements it references on its first access.
+            The whole document is still parsed into an XML tree and all its elements
+            are indexed upfront, so reading the model takes time proportional
+            to the document's size - only building the objects is deferred.
+            The XML tree is kept in memory until all diagrams are built.
+        :arg track_changes - record content hashes of the parsed elements,
+            so that the model can be refreshed with update_model afterwards.
+        """
+        if streaming and lazy:
+            raise ValueError("Lazy model can't be read in the streaming mode.")
         self._source: XMLSource = source
+        self.streaming = streaming
+        self.lazy = lazy
+        self.track_changes = track_changes
+        self._model: Optional[UMLModel] = None
+        """
+        Model most recently read or updated by the deserializer.
+        """
+        self._content_hashes: dict[str, int] = dict()
+        """
+        ID -> content hash of each built element's node (if changes are tracked).
+        """
+        self._diagram_contents: list[tuple[int, frozenset[str]]] = []
+        """
+        Content hash and member IDs of each built diagram's node (if changes are tracked).
+        """
         self._id_to_instance_mapping: dict[str, UMLObject] = dict()
-        self._id_to_evaluation_queue: dict[str, deque[Callable]] = defaultdict(deque)
+        self._elem_builders: dict[str, Callable] = {
+            **dict.fromkeys(CLASS_IFACE_MAPPING, self._build_class_or_iface),
+            **dict.fromkeys(CLASS_RELATIONSHIPS_TYPES, self._build_relationship),
+        }
+        """
+        Builders of packagedElement nodes, dispatched on their xmi:type.
+        """
+        self._class_member_builders: dict[str, Callable] = {
+            _ATTR_TAG: self._build_attribute,
+            _METH_TAG: self._build_method,
+        }
+        """
+        Builders of class and interface children nodes, dispatched on their tag.
+        """
+        self._id_to_evaluation_queue: dict[str, deque[Callable]] = dict()
         """
         Queue of functions to be called when Instance of the Object with given ID is available.
         The Instance has to be given as an argument to function call.
+        Queues are drained as soon as the instance is registered, so only ids
+        which are still unresolved are kept.
+        """
+        self._id_to_node: dict[str, ET.Element] = dict()
+        """
+        Nodes of indexed elements, not built yet (used by the lazy mode).
+        """
+        self._id_to_relationship_nodes: dict[str, list[ET.Element]] = dict()
+        """
+        Relationship nodes indexed by IDs of their ends (used by the lazy mode).
+        """
+        self._id_to_package: dict[str, str] = dict()
+        """
+        Element ID -> ID of the package the element is placed in.
+        """
+        self._package_names: dict[str, str] = dict()
+        """
+        Package ID -> package name.
+        """
+        self._id_to_duplicate_connector: dict[str, ET.Element] = dict()
+        """
+        Connector nodes of relationships indexed in the UML section,
+        merged into them when they are built (used by the lazy mode).
         """
 
-    def _evaluate_elements(self, blocking: bool = False) -> None:
+    @property
+    def unresolved_references(self) -> list[str]:
         """
-        Function that evaluates all elements from the evaluation queue.
-        :arg blocking - if set to True, it raises IdMismatchException when ID present as key in the evaluation
-            queue is not present in the ID to instance mapping. Used for partial evaluation.
+        IDs referred to by parsed objects, but not matching any known instance.
         """
-        for element_id, evaluation_queue in self._id_to_evaluation_queue.items():
-            try:
-                element_instance = self._id_to_instance_mapping[element_id]
-            except KeyError as ex:
-                message = f"Couldn't associate given referred object id: {element_id} with any known instance."
-                if blocking:
-                    raise IdMismatchException(message) from ex
-                else:
-                    logging.log(logging.INFO, message)
-                    continue
+        return list(self._id_to_evaluation_queue)
 
+    def _register_instance(self, element_id: str, element_instance: UMLObject) -> None:
+        """
+        Adds the instance to the ID to instance mapping and calls the functions
+        waiting for it.
+        """
+        self._id_to_instance_mapping[element_id] = element_instance
+        if evaluation_queue := self._id_to_evaluation_queue.pop(element_id, None):
             while evaluation_queue:
                 function_to_call = evaluation_queue.popleft()
                 function_to_call(element_instance)
 
+    def _defer_evaluation(self, element_id: str, function_to_call: Callable) -> None:
+        """
+        Calls the function with the instance of given ID, or queues the call
+        until the instance is registered.
+        """
+        if (element_instance := self._id_to_instance_mapping.get(element_id)) is not None:
+            function_to_call(element_instance)
+        else:
+            self._id_to_evaluation_queue.setdefault(element_id, deque()).append(
+                function_to_call
+            )
+
+    def _evaluate_elements(self, blocking: bool = False) -> None:
+        """
+        Function that reports references left in the evaluation queue.
+        :arg blocking - if set to True, it raises IdMismatchException when ID present as key in the evaluation
+            queue is not present in the ID to instance mapping. Used for partial evaluation.
+        """
+        if not self._id_to_evaluation_queue:
+            return
+
+        message = (
+            f"Couldn't associate {len(self._id_to_evaluation_queue)} referred object ids "
+            f"with any known instance: {', '.join(self._id_to_evaluation_queue)}"
+        )
+        if blocking:
+            raise IdMismatchException(message)
+        logging.log(logging.INFO, message)
+
     @classmethod
-    def from_string(cls, string):
-        return cls(StringSource(string))
+    def from_string(cls, string, streaming: bool = False, lazy: bool = False):
+        return cls(StringSource(string), streaming, lazy)
 
     @classmethod
-    def from_path(cls, path):
-        return cls(FileSource(path))
+    def from_bytes(cls, data, streaming: bool = False, lazy: bool = False):
+        return cls(BytesSource(data), streaming, lazy)
+
+    @classmethod
+    def from_path(
+        cls,
+        path,
+        streaming: bool = False,
+        cache: Optional[ParseCache] = None,
+        lazy: bool = False,
+    ):
+        """
+        :arg cache - if given, the model is read from the cache when the file's
+            content was parsed before, and stored in it otherwise. Lazy models
+            aren't cached, as storing them would build all their diagrams.
+        """
+        if lazy and cache is not None:
+            raise ValueError("Lazy model can't be read with a cache.")
+        return cls(FileSource(path, cache), streaming, lazy)
 
     def _parse_model(self, tree: ET.ElementTree) -> UMLModel:
         root = self._get_root(tree)
 
         model_node = self._get_mandatory_node(root, "model")
 
-        elems: list[UMLObject] = self._parse_elems(model_node)
+        if self.lazy:
+            return self._parse_model_lazy(root, model_node)
 
-        diagrams: list[UMLDiagram] = self._parse_diagrams(
-            root, [elem for elem in elems if isinstance(elem, ClassDiagramElement)]
-        )
+        self._parse_elems(model_node)
+        self._parse_connectors(self._get_mandatory_node(root, "ext"))
 
-        return UMLModel(
-            diagrams=diagrams,
-            filename=self.source.path if isinstance(self.source, FileSource) else None,
+        diagrams: list[UMLDiagram] = self._parse_diagrams(root)
+
+        return self._create_model(diagrams)
+
+    def _parse_model_events(
+        self, events: Iterator[tuple[str, ET.Element]]
+    ) -> UMLModel:
+        """
+        Builds the model from incremental parser events. Every packagedElement
+        and diagram is built as soon as its end tag arrives and its subtree
+        is cleared right afterwards, so only the currently open branch of
+        the document is kept in memory.
+        """
+        diagrams: list[UMLDiagram] = []
+        ancestors: list[ET.Element] = []
+        model_node: Optional[ET.Element] = None
+        ext_node: Optional[ET.Element] = None
+        diags_node: Optional[ET.Element] = None
+        conns_node: Optional[ET.Element] = None
+
+        for event, node in events:
+            if event == "start":
+                depth = len(ancestors)
+                if depth == 1 and node.tag == EA_TAGS["model"] and model_node is None:
+                    model_node = node
+                elif depth == 1 and node.tag == EA_TAGS["ext"] and ext_node is None:
+                    ext_node = node
+                elif (
+                    depth == 2
+                    and ancestors[1] is ext_node
+                    and node.tag == EA_TAGS["diags"]
+                    and diags_node is None
+                ):
+                    diags_node = node
+                elif (
+                    depth == 2
+                    and ancestors[1] is ext_node
+                    and node.tag == _CONNS_TAG
+                    and conns_node is None
+                ):
+                    conns_node = node
+                ancestors.append(node)
+                continue
+
+            ancestors.pop()
+            depth = len(ancestors)
+
+            if node is model_node:
+                node.clear()
+
+            elif depth > 1 and ancestors[1] is model_node:
+                if node.tag == EA_TAGS["elem"]:
+                    if node.get(_ELEM_TYPE) == self.PACKAGE_TYPE:
+                        self._add_package(node)
+                    elif (parsed_elem := self._parse_elem(node)) is not None:
+                        for ancestor in reversed(ancestors):
+                            if ancestor.get(_ELEM_TYPE) == self.PACKAGE_TYPE:
+                                self._id_to_package[parsed_elem.id] = ancestor.get(_ELEM_ID)
+                                break
+                    node.clear()
+
+            elif depth > 2 and ancestors[2] is diags_node:
+                if node.tag == EA_TAGS["diag"]:
+                    diagrams.append(self._get_filled_diag(node))
+                    node.clear()
+
+            elif depth > 2 and ancestors[2] is conns_node:
+                if depth == 3 and node.tag == _CONN_TAG:
+                    self._parse_connector(node)
+                    node.clear()
+
+            elif depth in (2, 3) and ancestors[1] is ext_node:
+                # Extension sections and their direct entries are not needed
+                # once closed.
+                node.clear()
+
+        if model_node is None:
+            raise InvalidXMLError(ERROR_MESS[ErrorType.MODEL_ERROR])
+        if ext_node is None:
+            raise InvalidXMLError(ERROR_MESS[ErrorType.EXT_ERROR])
+        if diags_node is None:
+            raise InvalidXMLError(ERROR_MESS[ErrorType.DIAGS_ERROR])
+
+        self._evaluate_elements()
+        return self._create_model(diagrams)
+
+    def _update_model(self, model: UMLModel, tree: ET.ElementTree) -> ModelUpdate:
+        """
+        Matches the packagedElement nodes of the new document with the model's
+        elements by their IDs and compares their content hashes, so that only
+        added, removed and modified elements are built or detached.
+        New elements are built before the model is changed, so an invalid
+        element leaves the model untouched.
+        """
+        if self.lazy or not self.track_changes:
+            raise ValueError("Only models read with tracked changes can be updated.")
+        if model is not self._model:
+            raise ValueError("Model wasn't read by this deserializer.")
+
+        root = self._get_root(tree)
+        model_node = self._get_mandatory_node(root, "model")
+        ext = self._get_mandatory_node(root, "ext")
+        diags = self._get_mandatory_node(ext, "diags")
+
+        new_hashes: dict[str, tuple[ET.Element, int]] = self._hash_elems(model_node, ext)
+        old_hashes = self._content_hashes
+        removed_ids = [elem_id for elem_id in old_hashes if elem_id not in new_hashes]
+        changed_ids = [
+            elem_id
+            for elem_id, (_, content_hash) in new_hashes.items()
+            if old_hashes.get(elem_id) != content_hash
+        ]
+
+        built: dict[str, tuple[UMLObject, Optional[SourceDestinationPair]]] = {}
+        for elem_id in changed_ids:
+            node = new_hashes[elem_id][0]
+            if node.tag == _CONN_TAG:
+                built[elem_id] = self._read_connector(node)
+            elif node.get(_ELEM_TYPE) in CLASS_RELATIONSHIPS_TYPES:
+                built[elem_id] = self._read_relationship(node)
+            else:
+                built[elem_id] = (self._build_class_or_iface(node, None), None)
+            built[elem_id][0].id = elem_id
+
+        update = ModelUpdate()
+        reindexed: list[UMLObject] = []
+        """
+        Objects patched in place, or replaced by the new instances.
+        """
+        mapping = self._id_to_instance_mapping
+        detached: set[int] = set()
+        """
+        Python ids of relationships taken out of the model.
+        """
+
+        for elem_id in removed_ids:
+            removed = mapping.pop(elem_id)
+            del old_hashes[elem_id]
+            update.removed.append(removed)
+            if isinstance(removed, ClassRelationship):
+                self._detach_relationship(removed)
+                detached.add(id(removed))
+            else:
+                self._detach_element(removed)
+
+        for elem_id in changed_ids:
+            if isinstance(old := mapping.get(elem_id), ClassRelationship):
+                self._detach_relationship(old)
+                detached.add(id(old))
+
+        if detached:
+            self._drop_deferred_edits(detached)
+
+        for elem_id in changed_ids:
+            new, ends_ids = built[elem_id]
+            old = mapping.get(elem_id)
+            if old is None:
+                update.added.append(new)
+            elif isinstance(new, ClassRelationship) or mutable_class(type(old)) is not type(new):
+                update.modified.append(new)
+            else:
+                # Elements of unchanged type are patched in place, keeping
+                # their relationships and the references held by users.
+                old.name, old.attributes, old.methods = new.name, new.attributes, new.methods
+                update.modified.append(old)
+                reindexed.append(old)
+                continue
+
+            if old is not None:
+                reindexed.append(old)
+            if isinstance(old, ClassDiagramElement):
+                self._move_relationships(old, new)
+            if ends_ids is not None:
+                self._wire_relationship(new, ends_ids)
+            self._register_instance(elem_id, new)
+
+        for elem_id in changed_ids:
+            old_hashes[elem_id] = new_hashes[elem_id][1]
+
+        model.diagrams = self._update_diagrams(
+            model.diagrams, diags, {*removed_ids, *changed_ids}
+        )
+        model.update_index(
+            removed=chain(update.removed, reindexed),
+            added=chain(update.added, update.modified),
         )
+        self._evaluate_elements()
+        model.unresolved_references = self._unresolved_relationship_ends()
+        return update
+
+    def _hash_elems(
+        self, model_node: ET.Element, ext: ET.Element
+    ) -> dict[str, tuple[ET.Element, int]]:
+        """
+        Returns buildable packagedElement and connector nodes with their content
+        hashes, by their IDs in the order they would be built in.
+        """
+        hashes: dict[str, tuple[ET.Element, int]] = {}
+        to_visit: list[ET.Element] = [
+            child for child in reversed(model_node) if child.tag == _ELEM
+        ]
+        while to_visit:
+            node = to_visit.pop()
+            elem_type = node.get(_ELEM_TYPE)
+            elem_id = node.get(_ELEM_ID)
+            if elem_type in self._elem_builders:
+                if not elem_id:
+                    raise InvalidXMLError(ERROR_MESS[ErrorType.MODEL_ID_MISSING])
+                hashes[elem_id] = (node, self._content_hash(node))
+                if elem_type in CLASS_RELATIONSHIPS_TYPES:
+                    continue
+            elif elem_type not in self.IGNORED_XML_ELEMENTS and not elem_id:
+                raise InvalidXMLError(ERROR_MESS[ErrorType.MODEL_ID_MISSING])
+            to_visit.extend(child for child in reversed(node) if child.tag == _ELEM)
+
+        if (conns := ext.find(_CONNS_TAG)) is not None:
+            for conn in conns:
+                if conn.tag != _CONN_TAG:
+                    continue
+                if not (conn_id := conn.get(_CONN_ID)):
+                    raise InvalidXMLError(ERROR_MESS[ErrorType.MODEL_ID_MISSING])
+                if conn_id not in hashes and self._connector_type(conn) is not None:
+                    hashes[conn_id] = (conn, self._content_hash(conn))
+        return hashes
+
+    def _content_hash(self, node: ET.Element) -> int:
+        """
+        Hash of the node's tags, attributes and texts, including its descendants
+        apart from nested packagedElements, which are hashed separately.
+        Built-in hash is used, so hashes are valid only within the process.
+        """
+        parts: list[Any] = [node.tag, tuple(node.attrib.items())]
+        to_visit = [child for child in node if child.tag != _ELEM]
+        while to_visit:
+            child = to_visit.pop()
+            parts.append((child.tag, tuple(child.attrib.items()), child.text and child.text.strip()))
+            to_visit.extend(child)
+        return hash(tuple(parts))
+
+    def _detach_relationship(self, relationship: ClassRelationship) -> None:
+        relationship.detach()
+
+    def _detach_element(self, element: UMLObject) -> None:
+        """
+        Unsets the removed element on the sides of its relationships,
+        which wait for an element of the same ID to be registered again.
+        """
+        if not isinstance(element, ClassDiagramElement):
+            return
+        for relationship in element.relations_to:
+            relationship.source_side.element = None
+            self._defer_evaluation(element.id, SetRelationshipSource(relationship))
+        for relationship in element.relations_from:
+            relationship.target_side.element = None
+            self._defer_evaluation(element.id, SetRelationshipTarget(relationship))
+
+    def _drop_deferred_edits(self, relationships: set[int]) -> None:
+        """
+        Removes queued edits of the relationships (given by their python ids).
+        """
+        for elem_id, evaluation_queue in list(self._id_to_evaluation_queue.items()):
+            kept = deque(
+                edit
+                for edit in evaluation_queue
+                if not (
+                    isinstance(edit, RelationshipEditor)
+                    and id(edit.relationship) in relationships
+                )
+            )
+            if kept:
+                self._id_to_evaluation_queue[elem_id] = kept
+            else:
+                del self._id_to_evaluation_queue[elem_id]
+
+    def _move_relationships(
+        self, old: ClassDiagramElement, new: UMLObject
+    ) -> None:
+        """
+        Moves relationships of the replaced element to the new one.
+        """
+        if not isinstance(new, ClassDiagramElement):
+            return
+        for relationship in old.relations_to:
+            relationship.source_side.element = new
+        for relationship in old.relations_from:
+            relationship.target_side.element = new
+        new.relations_to.extend(old.relations_to)
+        new.relations_from.extend(old.relations_from)
+
+    def _update_diagrams(
+        self, diagrams: list[UMLDiagram], diags: ET.Element, changed_ids: set[str]
+    ) -> list[UMLDiagram]:
+        """
+        Returns the diagrams of the new document. Existing diagrams whose nodes
+        didn't change and which don't refer to any of the changed (added, removed
+        or modified) elements are kept, only the others are built again.
+        """
+        old_contents, self._diagram_contents = self._diagram_contents, []
+        updated: list[UMLDiagram] = []
+        for position, diag in enumerate(diags.iter(EA_TAGS["diag"])):
+            if position < min(len(diagrams), len(old_contents)):
+                content_hash, member_ids = old_contents[position]
+                if content_hash == self._content_hash(diag) and member_ids.isdisjoint(
+                    changed_ids
+                ):
+                    self._diagram_contents.append(old_contents[position])
+                    updated.append(diagrams[position])
+                    continue
+            updated.append(self._get_filled_diag(diag))
+        return updated
 
     def _get_root(self, tree: ET.ElementTree) -> ET.Element:
         root = tree.getroot()
@@ -140,249 +635,529 @@ class EAXMLDeserializer(XMLDeserializer):
     def _get_node_by_tag(self, root: ET.Element, tag: str) -> Optional[ET.Element]:
         return root.find(EA_TAGS[tag])
 
-    def _parse_elem(self, elem: ET.Element) -> Optional[UMLObject]:
-        if not self._is_supported_element(elem):
-            return None
-
-        if elem_id := elem.attrib.get(EA_ATTR["elem_id"]):
-            if parsed_elem := self._try_build_class_or_iface(elem):
-                parsed_elem.id = elem_id
-                self._id_to_instance_mapping[elem_id] = parsed_elem
-
-            elif parsed_elem := self._try_build_relationship(elem):
-                parsed_elem.id = elem_id
-                self._id_to_instance_mapping[elem_id] = parsed_elem
+    def _parse_elem(
+        self, elem: ET.Element, nested: Optional[list[ET.Element]] = None
+    ) -> Optional[UMLObject]:
+        """
+        Builds the object described by packagedElement node, visiting each of its
+        children once. Nested packagedElement children are not built, but appended
+        to the nested list (if given) to be parsed afterwards.
+        """
+        elem_type = elem.get(_ELEM_TYPE)
+        build = self._elem_builders.get(elem_type)
 
-            else:
+        if build is None:
+            if elem_type not in self.IGNORED_XML_ELEMENTS:
+                if not elem.get(_ELEM_ID):
+                    raise InvalidXMLError(ERROR_MESS[ErrorType.MODEL_ID_MISSING])
                 logging.log(
                     logging.INFO,
                     """Retrieved object is unknown - couldn't build class or
                     interface or their relationship based on the object data.""",
                 )
-                return None
-
-            return parsed_elem
+            if nested is not None:
+                nested.extend(child for child in elem if child.tag == _ELEM)
+            return None
 
-        else:
+        if not (elem_id := elem.get(_ELEM_ID)):
             raise InvalidXMLError(ERROR_MESS[ErrorType.MODEL_ID_MISSING])
 
-    @evaluate_elements_afterwards()
+        parsed_elem = build(elem, nested)
+        parsed_elem.id = elem_id
+        if self.track_changes:
+            self._content_hashes[elem_id] = self._content_hash(elem)
+        self._register_instance(elem_id, parsed_elem)
+        return parsed_elem
+
     def _parse_elems(self, model_node: ET.Element) -> list[UMLObject]:
         """
-        Functions dependent on the initialization of the element with id given as the key of the dictionary.
+        Parses all packagedElement nodes of the model in document order, using
+        an explicit stack instead of a recursive search of the subtrees.
         """
-        elements_info = [
-            element_info
-            for element in model_node.iter(EA_TAGS["elem"])
-            if (element_info := self._parse_elem(element)) is not None
+        elements_info: list[UMLObject] = []
+        to_visit: list[tuple[ET.Element, Optional[str]]] = [
+            (child, None) for child in reversed(model_node) if child.tag == _ELEM
         ]
+        nested: list[ET.Element] = []
+        while to_visit:
+            node, package_id = to_visit.pop()
+            if (element_info := self._parse_elem(node, nested)) is not None:
+                elements_info.append(element_info)
+                if package_id is not None:
+                    self._id_to_package[element_info.id] = package_id
+            if nested:
+                if node.get(_ELEM_TYPE) == self.PACKAGE_TYPE:
+                    package_id = self._add_package(node)
+                to_visit.extend((child, package_id) for child in reversed(nested))
+                nested.clear()
         return elements_info
 
-    def _parse_diagrams(
-        self,
-        root: ET.Element,
-        elems: list[UMLObject],
-    ) -> list[UMLDiagram]:
+    @evaluate_elements_afterwards()
+    def _parse_connectors(self, ext: ET.Element) -> list[UMLObject]:
+        """
+        Parses the connectors of the extension section, which are the only
+        source of e.g. generalizations. Connectors of relationships already
+        built from the UML section are merged into them.
+        """
+        connectors_info: list[UMLObject] = []
+        if (conns := ext.find(_CONNS_TAG)) is None:
+            return connectors_info
+        for conn in conns:
+            if conn.tag == _CONN_TAG and (connector := self._parse_connector(conn)) is not None:
+                connectors_info.append(connector)
+        return connectors_info
+
+    def _parse_connector(self, conn: ET.Element) -> Optional[ClassRelationship]:
+        if not (conn_id := conn.get(_CONN_ID)):
+            raise InvalidXMLError(ERROR_MESS[ErrorType.MODEL_ID_MISSING])
+
+        if (existing := self._id_to_instance_mapping.get(conn_id)) is not None:
+            if isinstance(existing, ClassRelationship):
+                self._merge_connector(existing, conn)
+                return existing
+            return None
+
+        if (read := self._read_connector(conn)) is None:
+            logging.log(
+                logging.INFO,
+                f"Connector {conn_id} is of unknown type - couldn't build its relationship.",
+            )
+            return None
+
+        relationship, ends_ids = read
+        relationship.id = conn_id
+        if self.track_changes:
+            self._content_hashes[conn_id] = self._content_hash(conn)
+        self._wire_relationship(relationship, ends_ids)
+        self._register_instance(conn_id, relationship)
+        return relationship
+
+    def _connector_type(self, conn: ET.Element) -> Optional[RelationshipType]:
+        for child in conn:
+            if child.tag == _CONN_PROPTY_TAG:
+                return CONN_REL_MAPPING_TYPE.get(child.get(_CONN_TYPE))
+        return None
+
+    def _read_connector(
+        self, conn: ET.Element
+    ) -> Optional[tuple[ClassRelationship, SourceDestinationPair]]:
+        """
+        Builds the relationship of the connector with placeholder sides.
+        Returns it with the IDs of elements on its ends, or None if the connector's
+        type is unknown.
+        """
+        rel_type = None
+        processed_relation = ClassRelationship(name=conn.get(_CONN_NAME))
+        ends_ids = SourceDestinationPair()
+
+        for child in conn:
+            tag = child.tag
+            if tag == _CONN_SRC_TAG:
+                ends_ids.source, processed_relation.source_side = (
+                    self._create_connector_side(child)
+                )
+            elif tag == _CONN_TRGT_TAG:
+                ends_ids.target, processed_relation.target_side = (
+                    self._create_connector_side(child)
+                )
+            elif tag == _CONN_PROPTY_TAG:
+                rel_type = CONN_REL_MAPPING_TYPE.get(child.get(_CONN_TYPE))
+
+        if rel_type is None:
+            return None
+        if not (ends_ids.source and ends_ids.target):
+            raise InvalidXMLError(ERROR_MESS[ErrorType.REL_ENDS])
+
+        processed_relation.type = rel_type
+        return processed_relation, ends_ids
+
+    def _create_connector_side(
+        self, end: ET.Element
+    ) -> tuple[Optional[str], ClassRelationship.RelationshipSide]:
+        """
+        Builds relationship side from the connector's source or target node.
+        Returns the ID of the element on this side and the side itself.
+        """
+        side = ClassRelationship.RelationshipSide()
+        for child in end:
+            if child.tag == _CONN_ROLE_TAG:
+                side.role = child.get(_CONN_ROLE_NAME) or None
+            elif child.tag == _CONN_END_TYPE_TAG and (
+                multiplicity := child.get(_CONN_MULTIPLICITY)
+            ):
+                low, _, high = multiplicity.partition("..")
+                if not high:
+                    low, high = ("0", low) if low == "*" else (low, low)
+                side.min_max_multiplicity = Multiplicity.of(
+                    "inf" if low == "*" else low,
+                    "inf" if high == "*" else high,
+                )
+        return end.get(_CONN_END_ID), side
+
+    def _merge_connector(self, relationship: ClassRelationship, conn: ET.Element) -> None:
+        """
+        Fills in the data missing in the relationship built from the UML section.
+        """
+        if relationship.name is None:
+            relationship.name = conn.get(_CONN_NAME)
+        for child in conn:
+            if child.tag == _CONN_SRC_TAG:
+                side = relationship.source_side
+            elif child.tag == _CONN_TRGT_TAG:
+                side = relationship.target_side
+            else:
+                continue
+            if side.role is None:
+                side.role = self._create_connector_side(child)[1].role
+
+    def _parse_model_lazy(self, root: ET.Element, model_node: ET.Element) -> UMLModel:
+        self._index_elems(model_node)
+
+        ext = self._get_mandatory_node(root, "ext")
+        self._index_connectors(ext)
+        diags = self._get_mandatory_node(ext, "diags")
+        diags_info = [self._read_diag(diag) for diag in diags.iter(EA_TAGS["diag"])]
+
+        def load_diagram(index: int) -> UMLDiagram:
+            diag_name, elem_ids = diags_info[index]
+            if elem_ids is None:
+                return UMLDiagram(diag_name)
+            return self._build_diag(diag_name, elem_ids, self._load_elem_with_relationships)
+
+        return self._create_model(
+            LazyDiagrams([diag_name for diag_name, _ in diags_info], load_diagram)
+        )
+
+    def _create_model(self, diagrams: Sequence[UMLDiagram]) -> UMLModel:
+        """
+        Creates the model, with its index seeded with all the built objects
+        (also those not placed on any diagram) and their packages. Objects
+        of lazy models are built when the index is.
+        """
+        self._model = UMLModel(
+            diagrams=diagrams,
+            filename=self.source.path if isinstance(self.source, FileSource) else None,
+        )
+        self._model.seed_index(
+            _LazyIndexSeed(self) if self.lazy else self._id_to_instance_mapping.values(),
+            self._id_to_package,
+            self._package_names,
+        )
+        if not self.lazy:
+            self._model.unresolved_references = self._unresolved_relationship_ends()
+        return self._model
+
+    def _unresolved_relationship_ends(self) -> dict[str, list[RelationshipEnd]]:
+        """
+        Returns unresolved ID -> ends of the relationships referring to it.
+        """
+        sides = {SetRelationshipSource: "source", SetRelationshipTarget: "target"}
+        return {
+            elem_id: [
+                (editor.relationship, sides[type(editor)])
+                for editor in evaluation_queue
+                if type(editor) in sides
+            ]
+            for elem_id, evaluation_queue in self._id_to_evaluation_queue.items()
+        }
+
+    def _add_package(self, package: ET.Element) -> str:
+        package_id = package.get(_ELEM_ID)
+        self._package_names[package_id] = package.get(_ELEM_NAME, "")
+        return package_id
+
+    def _index_elems(self, model_node: ET.Element) -> None:
+        """
+        Indexes buildable packagedElement nodes by their IDs, and relationship
+        nodes by IDs of their ends, without building any of them.
+        """
+        to_visit: list[tuple[ET.Element, Optional[str]]] = [
+            (child, None) for child in reversed(model_node) if child.tag == _ELEM
+        ]
+        while to_visit:
+            node, package_id = to_visit.pop()
+            elem_type = node.get(_ELEM_TYPE)
+            if (elem_id := node.get(_ELEM_ID)) and elem_type in self._elem_builders:
+                self._id_to_node[elem_id] = node
+                if package_id is not None:
+                    self._id_to_package[elem_id] = package_id
+                if elem_type in CLASS_RELATIONSHIPS_TYPES:
+                    self._index_relationship_node(node)
+                    continue
+            elif elem_type == self.PACKAGE_TYPE:
+                package_id = self._add_package(node)
+            to_visit.extend(
+                (child, package_id) for child in reversed(node) if child.tag == _ELEM
+            )
+
+    def _index_connectors(self, ext: ET.Element) -> None:
+        if (conns := ext.find(_CONNS_TAG)) is None:
+            return
+        for conn in conns:
+            if conn.tag != _CONN_TAG or not (conn_id := conn.get(_CONN_ID)):
+                continue
+            if conn_id in self._id_to_node:
+                self._id_to_duplicate_connector[conn_id] = conn
+            else:
+                self._id_to_node[conn_id] = conn
+                self._index_relationship_node(conn)
+
+    def _index_relationship_node(self, node: ET.Element) -> None:
+        for end_id in self._relationship_end_ids(node):
+            self._id_to_relationship_nodes.setdefault(end_id, []).append(node)
+
+    def _relationship_end_ids(self, node: ET.Element) -> list[str]:
+        """
+        Returns IDs of elements on the ends of the relationship
+        (packagedElement or connector) node.
+        """
+        if node.tag == _CONN_TAG:
+            return [
+                end.get(_CONN_END_ID)
+                for end in node
+                if end.tag in (_CONN_SRC_TAG, _CONN_TRGT_TAG)
+            ]
+        return [
+            end_type.get(_END_TYPE_REF)
+            for end in node
+            if end.tag == _END_TAG and (end_type := end.find(_END_TYPE_TAG)) is not None
+        ]
+
+    def _load_elem(self, elem_id: str) -> Optional[UMLObject]:
+        """
+        Returns the instance of given ID, building it from the indexed node if needed.
+        """
+        if (instance := self._id_to_instance_mapping.get(elem_id)) is not None:
+            return instance
+        if (node := self._id_to_node.pop(elem_id, None)) is None:
+            return None
+        if node.tag == _CONN_TAG:
+            return self._parse_connector(node)
+
+        instance = self._parse_elem(node)
+        if (conn := self._id_to_duplicate_connector.pop(elem_id, None)) is not None:
+            self._parse_connector(conn)
+        return instance
+
+    def _load_elem_with_relationships(self, elem_id: str) -> Optional[UMLObject]:
+        """
+        Returns the instance of given ID with all of its relationships built,
+        together with the elements on their other ends.
+        """
+        if (node := self._id_to_node.get(elem_id)) is not None and (
+            node.tag == _CONN_TAG or node.get(_ELEM_TYPE) in CLASS_RELATIONSHIPS_TYPES
+        ):
+            return None
+
+        instance = self._load_elem(elem_id)
+        for rel_node in self._id_to_relationship_nodes.pop(elem_id, ()):
+            self._load_elem(rel_node.get(_CONN_ID if rel_node.tag == _CONN_TAG else _ELEM_ID))
+            for end_id in self._relationship_end_ids(rel_node):
+                self._load_elem(end_id)
+        return instance
+
+    def _parse_diagrams(self, root: ET.Element) -> list[UMLDiagram]:
         diagrams: list[UMLDiagram] = []
 
         ext = self._get_mandatory_node(root, "ext")
         diags = self._get_mandatory_node(ext, "diags")
 
-        self._populate_diagrams(elems, diagrams, diags)
+        self._populate_diagrams(diagrams, diags)
 
         return diagrams
 
     def _populate_diagrams(
         self,
-        elems: list[UMLObject],
         diagrams: list[UMLDiagram],
         diags: ET.Element,
     ) -> None:
         for diag in diags.iter(EA_TAGS["diag"]):
-            diagrams.append(self._get_filled_diag(diag, elems))
+            diagrams.append(self._get_filled_diag(diag))
+
+    def _get_filled_diag(self, diag: ET.Element) -> UMLDiagram:
+        """
+        Builds the diagram with its members looked up in the ID to instance mapping.
+        """
+        diag_name, elem_ids = self._read_diag(diag)
+        if self.track_changes:
+            self._diagram_contents.append((self._content_hash(diag), frozenset(elem_ids or ())))
+        if elem_ids is None:
+            return UMLDiagram(diag_name)
+        return self._build_diag(diag_name, elem_ids, self._id_to_instance_mapping.get)
 
-    def _get_filled_diag(self, diag: ET.Element, elems: list[UMLObject]) -> UMLDiagram:
+    def _read_diag(self, diag: ET.Element) -> tuple[Optional[str], Optional[list[str]]]:
+        """
+        Returns the name of the diagram and IDs of its members,
+        or None if the diagram has no elements node.
+        """
         diag_name = self._get_mandatory_node(diag, "diag_propty").attrib.get(
             EA_ATTR["diag_propty_name"]
         )
 
         if not (diag_elems := diag.find(EA_TAGS["diag_elems"])):
-            return UMLDiagram(diag_name)
+            return diag_name, None
 
-        elem_ids: list[str] = [
+        return diag_name, [
             diag_elem.attrib[EA_ATTR["diag_elem_id"]]
             for diag_elem in diag_elems.iter(EA_TAGS["diag_elem"])
         ]
 
-        uml_elems: list[UMLObject] = [elem for elem in elems if elem.id in elem_ids]
-
-        if all(isinstance(elem, ClassDiagramElement) for elem in uml_elems):
-            return ClassDiagram(diag_name, uml_elems)
+    def _build_diag(
+        self,
+        diag_name: Optional[str],
+        elem_ids: list[str],
+        get_instance: Callable[[str], Optional[UMLObject]],
+    ) -> UMLDiagram:
+        """
+        Builds the diagram with its members in the order they are listed in the XML.
+        Relationships drawn on the diagram are skipped, as they are reachable
+        through their ends.
+        """
+        uml_elems: dict[str, UMLObject] = {}
+        for elem_id in elem_ids:
+            elem = get_instance(elem_id)
+            if elem is not None and not isinstance(elem, ClassRelationship):
+                uml_elems.setdefault(elem_id, elem)
+
+        if all(isinstance(elem, ClassDiagramElement) for elem in uml_elems.values()):
+            return ClassDiagram(diag_name, list(uml_elems.values()))
         else:
             raise InvalidXMLError(ERROR_MESS[ErrorType.MIXED_ELEMS])
 
-    def _is_supported_element(self, elem: ET.Element) -> bool:
-        is_supported_element = (
-            elem.attrib[EA_ATTR["elem_type"]] not in self.IGNORED_XML_ELEMENTS
+    def _build_class_or_iface(
+        self, elem: ET.Element, nested: Optional[list[ET.Element]]
+    ) -> ClassDiagramElement:
+        curr_elem = CLASS_IFACE_MAPPING[elem.get(_ELEM_TYPE)](elem.get(_ELEM_NAME, ""))
+
+        member_builders = self._class_member_builders
+        for child in elem:
+            if (build_member := member_builders.get(child.tag)) is not None:
+                build_member(child, curr_elem)
+            elif child.tag == _ELEM and nested is not None:
+                nested.append(child)
+
+        return curr_elem
+
+    def _build_attribute(self, attr: ET.Element, owner: ClassDiagramElement) -> None:
+        type_node = None
+        for child in attr:
+            if child.tag == _ATTR_TYPE_TAG:
+                type_node = child
+                break
+        if type_node is None:
+            raise InvalidXMLError(TAGS_ERRORS["elem_attr_type"])
+
+        type_name = EA_ATTR_MAPPING.get(type_node.get(_ATTR_TYPE), "")
+        owner.attributes.append(ClassDiagramAttribute(attr.get(_ATTR_NAME), type_name))
+
+    def _build_method(self, meth: ET.Element, owner: ClassDiagramElement) -> None:
+        ret_type = ""
+        params: list[ClassDiagramMethodParameter] = []
+        for param in meth:
+            if param.tag != _PARAM_TAG:
+                continue
+
+            if (param_name := param.get(_PARAM_NAME)) == "return":
+                ret_type = EA_ATTR_MAPPING.get(param.get(_RET_TYPE), "")
+                continue
+
+            type_node = None
+            for child in param:
+                if child.tag == _PARAM_TYPE_TAG:
+                    type_node = child
+                    break
+            if type_node is None:
+                raise InvalidXMLError(TAGS_ERRORS["elem_meth_param_type"])
+
+            type_name = EA_ATTR_MAPPING.get(type_node.get(_PARAM_TYPE), "")
+            params.append(ClassDiagramMethodParameter(param_name, type_name))
+
+        owner.methods.append(
+            ClassDiagramMethod(meth.get(_METH_NAME) or "", ret_type, params)
         )
-        return is_supported_element
-
-    def _try_build_class_or_iface(
-        self, elem: ET.Element
-    ) -> Optional[ClassDiagramElement]:
-        if ElemClass := CLASS_IFACE_MAPPING.get(elem.attrib[EA_ATTR["elem_type"]]):
-            curr_elem = ElemClass(elem.attrib[EA_ATTR["elem_name"]])
-
-            attrs: list[ClassDiagramAttribute] = self._build_attributes(elem)
-            meths: list[ClassDiagramMethod] = self._build_methods(elem)
-
-            curr_elem.attributes = attrs
-            curr_elem.methods = meths
-            return curr_elem
-
-        return None
-
-    def _build_attributes(self, elem: ET.Element) -> list[ClassDiagramAttribute]:
-        attrs: list[ClassDiagramAttribute] = []
-        for attr in elem.iter(EA_TAGS["elem_attr"]):
-            name: str = attr.attrib[EA_ATTR["elem_attr_name"]]
-            if not (
-                type_name := EA_ATTR_MAPPING.get(
-                    self._get_mandatory_node(attr, "elem_attr_type").attrib[
-                        EA_ATTR["elem_attr_type"]
-                    ]
-                )
-            ):
-                type_name = ""
-            attrs.append(ClassDiagramAttribute(name, type_name))
-        return attrs
-
-    def _build_methods(self, elem: ET.Element) -> list[ClassDiagramMethod]:
-        meths: list[ClassDiagramMethod] = []
-        for meth in elem.iter(EA_TAGS["elem_meth"]):
-            if (name := meth.attrib.get(EA_ATTR["elem_meth_name"])) is None:
-                name = ""
-
-            ret_type: Optional[str] = ""
-            params: list[ClassDiagramMethodParameter] = []
-            for param in meth.iter(EA_TAGS["elem_meth_param"]):
-                if (
-                    param_name := param.attrib.get(EA_ATTR["elem_meth_param_name"])
-                ) == "return":
-                    if not (
-                        ret_type := EA_ATTR_MAPPING.get(
-                            param.attrib[EA_ATTR["elem_meth_ret_type"]]
-                        )
-                    ):
-                        ret_type = ""
-
-                else:
-                    if not (
-                        type_name := EA_ATTR_MAPPING.get(
-                            self._get_mandatory_node(
-                                param, "elem_meth_param_type"
-                            ).attrib[EA_ATTR["elem_meth_param_type"]]
-                        )
-                    ):
-                        type_name = ""
-
-                    params.append(ClassDiagramMethodParameter(param_name, type_name))
-
-            meths.append(ClassDiagramMethod(name, ret_type, params))
-        return meths
 
-    def _create_relation_source_side(
+    def _create_relation_side(
         self, end: ET.Element
-    ) -> ClassRelationship.RelationshipSide:
-        source_side = ClassRelationship.RelationshipSide()
+    ) -> tuple[Optional[str], ClassRelationship.RelationshipSide]:
+        """
+        Builds relationship side from the ownedEnd node.
+        Returns the ID of the element on this side and the side itself.
+        """
+        side = ClassRelationship.RelationshipSide()
 
+        elem_id = None
         low = "inf"
         high = "inf"
-        for src_vals in end.findall(EA_TAGS["end_low"]):
-            src_low = src_vals.attrib[EA_ATTR["end_low_type"]]
-            # TODO: use configuration / constants file with types mappings
-            if src_low == "uml:LiteralUnlimitedNatural":
-                low = "inf"
-            else:
-                low = src_vals.attrib[EA_ATTR["end_low_val"]]
+        for child in end:
+            tag = child.tag
+            if tag == _END_TYPE_TAG:
+                elem_id = child.get(_END_TYPE_REF)
+            elif tag == _END_LOW_TAG:
+                # TODO: use configuration / constants file with types mappings
+                if child.get(_END_VAL_TYPE) == "uml:LiteralUnlimitedNatural":
+                    low = "inf"
+                else:
+                    low = child.get(_END_VAL)
+            elif tag == _END_HIGH_TAG:
+                if child.get(_END_VAL_TYPE) == "uml:LiteralUnlimitedNatural":
+                    high = "inf"
+                else:
+                    high = child.get(_END_VAL)
 
-        for src_vals in end.findall(EA_TAGS["end_high"]):
-            src_high = src_vals.attrib[EA_ATTR["end_high_type"]]
-            if src_high == "uml:LiteralUnlimitedNatural":
-                high = "inf"
-            else:
-                high = src_vals.attrib[EA_ATTR["end_high_val"]]
+        side.min_max_multiplicity = Multiplicity.of(low, high)
 
-        source_side.min_max_multiplicity = (low, high)
+        if role := end.get(_END_NAME):
+            side.role = role
 
-        if role := end.attrib.get(EA_ATTR["end_name_src"]):
-            source_side.role = role
+        return elem_id, side
 
-        return source_side
+    def _build_relationship(
+        self, elem: ET.Element, nested: Optional[list[ET.Element]]
+    ) -> ClassRelationship:
+        processed_relation, ends_ids = self._read_relationship(elem)
+        self._wire_relationship(processed_relation, ends_ids)
+        return processed_relation
 
-    def _create_relation_target_side(
-        self, end: ET.Element
-    ) -> ClassRelationship.RelationshipSide:
-        target_side = ClassRelationship.RelationshipSide()
+    def _read_relationship(
+        self, elem: ET.Element
+    ) -> tuple[ClassRelationship, SourceDestinationPair]:
+        """
+        Builds the relationship with placeholder sides.
+        Returns it with the IDs of elements on its ends.
+        """
+        elem_type = elem.get(_ELEM_TYPE)
+        rel_name = elem.get(_ELEM_NAME)
+        type_name = CLASS_REL_MAPPING_TYPE[elem_type]
+
+        # Final relationship uninitialized placeholder
+        processed_relation = ClassRelationship(type_name, rel_name)
+        ends_ids = SourceDestinationPair()
+
+        for end in elem:
+            if end.tag != _END_TAG:
+                continue
+
+            end_id = end.get(_END_ID, "")
+            if end_id.startswith("EAID_src"):
+                ends_ids.source, processed_relation.source_side = (
+                    self._create_relation_side(end)
+                )
+            elif end_id.startswith("EAID_dst"):
+                ends_ids.target, processed_relation.target_side = (
+                    self._create_relation_side(end)
+                )
 
-        low = "inf"
-        high = "inf"
-        for src_vals in end.findall(EA_TAGS["end_low"]):
-            dst_low = src_vals.attrib[EA_ATTR["end_low_type"]]
-            if dst_low == "uml:LiteralUnlimitedNatural":
-                low = "inf"
-            else:
-                low = src_vals.attrib[EA_ATTR["end_low_val"]]
+        if not (ends_ids.source and ends_ids.target):
+            raise InvalidXMLError(ERROR_MESS[ErrorType.REL_ENDS])
 
-        for src_vals in end.findall(EA_TAGS["end_high"]):
-            dst_high = src_vals.attrib[EA_ATTR["end_high_type"]]
-            if dst_high == "uml:LiteralUnlimitedNatural":
-                high = "inf"
-            else:
-                high = src_vals.attrib[EA_ATTR["end_high_val"]]
-
-        target_side.min_max_multiplicity = (low, high)
-
-        if role := end.attrib.get(EA_ATTR["end_name_dst"]):
-            target_side.role = role
-
-        return target_side
-
-    def _try_build_relationship(self, elem: ET.Element) -> Optional[ClassRelationship]:
-        if elem.attrib[EA_ATTR["elem_type"]] in CLASS_RELATIONSHIPS_TYPES:
-            rel_name = elem.attrib.get(EA_ATTR["end_name"])
-            type_name = CLASS_REL_MAPPING_TYPE[elem.attrib[EA_ATTR["elem_type"]]]
-
-            # Final relationship uninitialized placeholder
-            processed_relation = ClassRelationship(type_name, rel_name)
-            ends_ids = SourceDestinationPair()
-
-            for end in elem.iter(EA_TAGS["end"]):
-                if end.attrib[EA_ATTR["end_id"]].startswith("EAID_src"):
-                    ends_ids.source = self._get_mandatory_node(end, "end_type").attrib[
-                        EA_ATTR["end_type_src"]
-                    ]
-                    processed_relation.source_side = self._create_relation_source_side(
-                        end
-                    )
-
-                elif end.attrib[EA_ATTR["end_id"]].startswith("EAID_dst"):
-                    ends_ids.target = self._get_mandatory_node(end, "end_type").attrib[
-                        EA_ATTR["end_type_dst"]
-                    ]
-                    processed_relation.target_side = self._create_relation_target_side(
-                        end
-                    )
-
-            if not (all(vars(ends_ids).values())):
-                raise InvalidXMLError(ERROR_MESS[ErrorType.REL_ENDS])
-
-            self._id_to_evaluation_queue[ends_ids.source].append(
-                SetRelationshipSource(processed_relation)
-            )
-            self._id_to_evaluation_queue[ends_ids.target].append(
-                SetRelationshipTarget(processed_relation)
-            )
+        return processed_relation, ends_ids
 
-            return processed_relation
-        return None
+    def _wire_relationship(
+        self, processed_relation: ClassRelationship, ends_ids: SourceDestinationPair
+    ) -> None:
+        self._defer_evaluation(
+            ends_ids.source, SetRelationshipSource(processed_relation)
+        )
+        self._defer_evaluation(
+            ends_ids.target, SetRelationshipTarget(processed_relation)
+        )
@@ -11,6 +11,10 @@ class RelationshipEditor(ABC):
     def __init__(self, relationship: ClassRelationship) -> None:
         self._relationship = relationship
 
+    @property
+    def relationship(self) -> ClassRelationship:
+        return self._relationship
+
     @abstractmethod
     def __call__(self, *args: Any, **kwds: Any) -> ClassRelationship:
         pass
@@ -1,8 +1,15 @@
 from abc import ABC
-from typing import Optional
+from typing import Any, Optional
 
 
 class UMLObject(ABC):
+    __slots__ = ("_id",)
+    """
+    Model objects are numerous, so the classes of their hierarchy declare slots
+    instead of having per-instance dictionaries. Subclasses without own slots
+    (e.g. diagrams) still get a dictionary.
+    """
+
     def __init__(self, object_id: Optional[str] = None) -> None:
         self._id = object_id
         super().__init__()
@@ -13,4 +20,12 @@ class UMLObject(ABC):
 
     @id.setter
     def id(self, new_id: str) -> None:
-        self._id = new_id
+        old_id, self._id = self._id, new_id
+        if old_id != new_id and (model := self._indexing_model()) is not None:
+            model._on_id_changed(self, old_id)
+
+    def _indexing_model(self) -> Any:
+        """
+        Returns the model indexing the object by its ID, if any.
+        """
+        return None
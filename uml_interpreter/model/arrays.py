@@ -0,0 +1,156 @@
+"""
+Columnar export of class diagram graphs
+
+Elements are numbered densely in the order of the diagram (or the model's index)
+and their relationships are exported as CSR (compressed sparse row) adjacency
+arrays, one per relationship type. All columns are stdlib arrays of 64-bit
+integers, exposing the buffer protocol, so they can be wrapped by NumPy (or any
+other buffer consumer) without copying.
+
+The module includes the following:
+- ClassDiagramArrays
+"""
+
+from __future__ import annotations
+
+from array import array
+from dataclasses import dataclass
+from itertools import accumulate
+from typing import TYPE_CHECKING, Any, Iterable
+
+from uml_interpreter.model.diagrams.class_diagram import (
+    ClassDiagram,
+    ClassDiagramElement,
+    ClassRelationship,
+    RelationshipType,
+)
+
+if TYPE_CHECKING:
+    from uml_interpreter.model.model import UMLModel
+
+INT_TYPECODE = "q"
+"""
+Typecode of all integer columns (signed 64-bit, NumPy's int64).
+"""
+
+
+@dataclass
+class ClassDiagramArrays:
+    elements: list[ClassDiagramElement]
+    """
+    Element number -> element.
+    """
+    indptr: dict[RelationshipType, array]
+    """
+    Relationship type -> CSR row pointers. Targets of the relationships
+    of element i are indices[type][indptr[type][i] : indptr[type][i + 1]].
+    """
+    indices: dict[RelationshipType, array]
+    """
+    Relationship type -> CSR column indices (numbers of the target elements).
+    """
+    relationships: dict[RelationshipType, list[ClassRelationship]]
+    """
+    Relationship type -> relationships, in the order of their CSR entries.
+    """
+    attribute_counts: array
+    method_counts: array
+    name_offsets: array
+    """
+    Offsets of elements' names in names_buffer, element i's name is
+    names_buffer[name_offsets[i] : name_offsets[i + 1]].
+    """
+    names_buffer: bytes
+    """
+    UTF-8 encoded names of all elements, concatenated.
+    """
+
+    @classmethod
+    def from_diagram(cls, diagram: ClassDiagram) -> ClassDiagramArrays:
+        """
+        Exports the diagram's elements. Relationships leading to elements
+        placed outside of the diagram are skipped.
+        """
+        return cls.from_elements(diagram.elements)
+
+    @classmethod
+    def from_model(cls, model: UMLModel) -> ClassDiagramArrays:
+        """
+        Exports all the class diagram elements of the model's index.
+        """
+        return cls.from_elements(model.index.elements_of_type(ClassDiagramElement))
+
+    @classmethod
+    def from_elements(cls, elements: Iterable[ClassDiagramElement]) -> ClassDiagramArrays:
+        elements = list(dict.fromkeys(elements))
+        numbers = {elem: number for number, elem in enumerate(elements)}
+
+        indices = {rel_type: array(INT_TYPECODE) for rel_type in RelationshipType}
+        relationships: dict[RelationshipType, list[ClassRelationship]] = {
+            rel_type: [] for rel_type in RelationshipType
+        }
+        row_counts: dict[RelationshipType, array] = {}
+        """
+        Relationship type -> number of its relationships of each element, allocated
+        for the types met only.
+        """
+        item_size = array(INT_TYPECODE).itemsize
+        zeros = bytes(len(elements) * item_size)
+        # Python code runs once per relationship, rows of all types are built by C loops.
+        for number, elem in enumerate(elements):
+            for rel in elem.relations_to:
+                if (target := numbers.get(rel.target)) is not None:
+                    indices[rel.type].append(target)
+                    relationships[rel.type].append(rel)
+                    if (counts := row_counts.get(rel.type)) is None:
+                        counts = row_counts[rel.type] = array(INT_TYPECODE, zeros)
+                    counts[number] += 1
+
+        indptr = {
+            rel_type: array(INT_TYPECODE, accumulate(row_counts[rel_type], initial=0))
+            if rel_type in row_counts
+            else array(INT_TYPECODE, bytes(item_size) + zeros)
+            for rel_type in RelationshipType
+        }
+
+        encoded_names = [(elem.name or "").encode() for elem in elements]
+        return cls(
+            elements=elements,
+            indptr=indptr,
+            indices=indices,
+            relationships=relationships,
+            attribute_counts=array(INT_TYPECODE, [len(elem.attributes) for elem in elements]),
+            method_counts=array(INT_TYPECODE, [len(elem.methods) for elem in elements]),
+            name_offsets=array(INT_TYPECODE, accumulate(map(len, encoded_names), initial=0)),
+            names_buffer=b"".join(encoded_names),
+        )
+
+    def __len__(self) -> int:
+        return len(self.elements)
+
+    def name(self, number: int) -> str:
+        return self.names_buffer[
+            self.name_offsets[number] : self.name_offsets[number + 1]
+        ].decode()
+
+    def to_numpy(self) -> dict[str, Any]:
+        """
+        Returns NumPy views of the columns, sharing memory with the arrays.
+        CSR arrays are keyed "indptr.<type>" and "indices.<type>".
+        Requires NumPy to be installed.
+        """
+        import numpy
+
+        columns: dict[str, Any] = {}
+        for rel_type in RelationshipType:
+            columns[f"indptr.{rel_type.value}"] = numpy.frombuffer(
+                self.indptr[rel_type], dtype=numpy.int64
+            )
+            columns[f"indices.{rel_type.value}"] = numpy.frombuffer(
+                self.indices[rel_type], dtype=numpy.int64
+            )
+        columns["attribute_counts"] = numpy.frombuffer(self.attribute_counts, dtype=numpy.int64)
+        columns["method_counts"] = numpy.frombuffer(self.method_counts, dtype=numpy.int64)
+        columns["name_offsets"] = numpy.frombuffer(self.name_offsets, dtype=numpy.int64)
+        columns["names_buffer"] = numpy.frombuffer(self.names_buffer, dtype=numpy.uint8)
+        return columns
@@ -10,7 +10,13 @@ class UMLDiagram(UMLObject):
         super().__init__(**kwargs)
 
     def accept(self, visitor: ModelVisitor):
-        visitor.visit_diagram(self)
+        """
+        Visits the diagram - and all its objects, if the visitor is walked
+        (see ModelVisitor).
+        """
+        if getattr(visitor, "walked", False):
+            return visitor.walk(self)
+        return visitor.visit_diagram(self)
 
 
 class StructuralDiagram(UMLDiagram):
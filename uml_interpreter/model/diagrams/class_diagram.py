@@ -1,7 +1,8 @@
 from __future__ import annotations
-from dataclasses import dataclass
+import sys
+from collections.abc import Iterable, Iterator, MutableSet, Sequence
 from enum import Enum
-from typing import Any, Optional, Union
+from typing import TYPE_CHECKING, Any, NamedTuple, Optional, Union
 
 import uml_interpreter.model.diagrams.abstract as dg
 import uml_interpreter.model.diagrams.sequence_diagram as sd
@@ -9,14 +10,25 @@ import uml_interpreter.visitor.model_visitor as v
 from uml_interpreter.model.abstract import UMLObject
 from uml_interpreter.model.errors import InvalidModelInitialization
 
+if TYPE_CHECKING:
+    from uml_interpreter.model.model import UMLModel
+
 
 class ClassDiagram(dg.StructuralDiagram):
+    _child_fields = ("elements",)
+
     def __init__(self, name: Optional[str] = None, elements=None) -> None:
         super().__init__(name)
         self.elements: list[ClassDiagramElement] = elements or []
 
     def accept(self, visitor: v.ModelVisitor):
-        visitor.visit_class_diagram(self)
+        """
+        Visits the diagram - and all its elements, if the visitor is walked
+        (see ModelVisitor).
+        """
+        if getattr(visitor, "walked", False):
+            return visitor.walk(self)
+        return visitor.visit_class_diagram(self)
 
 
 class RelationshipType(Enum):
@@ -28,18 +40,126 @@ class RelationshipType(Enum):
 
     Association = "Association"
     Generalization = "Generalization"
+    Realization = "Realization"
+    Dependency = "Dependency"
+
+
+def intern_value(value: Any) -> Any:
+    """
+    Returns the interned instance of the string (other values are returned
+    as they are), so that e.g. type names of all the model's objects share
+    a few string objects and can be compared by identity.
+    """
+    return sys.intern(value) if type(value) is str else value
+
+
+_MULTIPLICITIES: dict[tuple[Any, Any], Multiplicity] = {}
+"""
+Interned multiplicities by their (lower, upper) bounds.
+"""
+
+
+class Multiplicity(NamedTuple):
+    """
+    Immutable range of the relationship side's multiplicity. "inf" stands for
+    the unlimited bound. Instances should be created with Multiplicity.of,
+    which returns the one shared instance for given bounds, so that equal
+    multiplicities are identical.
+    """
+
+    lower: Optional[str]
+    upper: Optional[str]
+
+    @classmethod
+    def of(cls, lower: Optional[str], upper: Optional[str]) -> Multiplicity:
+        if (multiplicity := _MULTIPLICITIES.get((lower, upper))) is None:
+            multiplicity = _MULTIPLICITIES[(lower, upper)] = cls(
+                intern_value(lower), intern_value(upper)
+            )
+        return multiplicity
+
+    def __reduce__(self) -> tuple:
+        return (Multiplicity.of, (self.lower, self.upper))
+
+
+class RelationshipSet(MutableSet):
+    """
+    Insertion ordered set of relationships, backed by a dictionary,
+    so that adding, removing and membership checks take constant time.
+    List-like append, extend and indexing are kept for compatibility.
+    Compared with a sequence, the order of relationships matters.
+    """
+
+    __slots__ = ("_items", "_ordered")
+
+    def __init__(self, relationships: Iterable[ClassRelationship] = ()) -> None:
+        self._items: dict[ClassRelationship, None] = dict.fromkeys(relationships)
+        self._ordered: Optional[list[ClassRelationship]] = None
+        """
+        Relationships in order, built on the first indexing after a change.
+        """
+
+    def __contains__(self, relationship: object) -> bool:
+        return relationship in self._items
+
+    def __iter__(self) -> Iterator[ClassRelationship]:
+        return iter(self._items)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __getitem__(self, index: int) -> ClassRelationship:
+        if (ordered := self._ordered) is None:
+            ordered = self._ordered = list(self._items)
+        return ordered[index]
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, Sequence):
+            return list(self._items) == list(other)
+        return super().__eq__(other)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({list(self._items)!r})"
+
+    def add(self, relationship: ClassRelationship) -> None:
+        self._items[relationship] = None
+        self._ordered = None
+
+    def discard(self, relationship: ClassRelationship) -> None:
+        self._items.pop(relationship, None)
+        self._ordered = None
+
+    def append(self, relationship: ClassRelationship) -> None:
+        self._items[relationship] = None
+        self._ordered = None
+
+    def extend(self, relationships: Iterable[ClassRelationship]) -> None:
+        self._items.update(dict.fromkeys(relationships))
+        self._ordered = None
 
 
 class ClassDiagramElement(sd.SequenceActor):
+    __slots__ = ("relations_to", "relations_from", "methods", "attributes", "_model")
+    _child_fields = ("relations_from", "relations_to", "attributes", "methods")
+
     def __init__(self, name: str) -> None:
         super().__init__(name)
-        self.relations_to: list[ClassRelationship] = []
-        self.relations_from: list[ClassRelationship] = []
+        self.relations_to: RelationshipSet = RelationshipSet()
+        self.relations_from: RelationshipSet = RelationshipSet()
         self.methods: list[ClassDiagramMethod] = []
         self.attributes: list[ClassDiagramAttribute] = []
+        self._model: Optional[UMLModel] = None
+        """
+        Model indexing the element, notified about its new relationships.
+        """
 
-    def accept(self, visitor: v.ModelVisitor) -> None:
-        visitor.visit_class_diagram_element(self)
+    def accept(self, visitor: v.ModelVisitor):
+        if getattr(visitor, "walked", False):
+            return visitor.walk(self)
+        return visitor.visit_class_diagram_element(self)
+
+    def _indexing_model(self) -> Optional[UMLModel]:
+        return self._model
 
     def add_relationship_to(
         self,
@@ -80,7 +200,7 @@ class ClassDiagramElement(sd.SequenceActor):
         self, relationship: ClassRelationship
     ) -> ClassRelationship:
         """
-        Adds relation to self.relations_to list.
+        Adds relation to self.relations_to set (unless it's already there).
         Logic unifying assignment of the element on relationship
         side is applied.
 
@@ -88,8 +208,10 @@ class ClassDiagramElement(sd.SequenceActor):
         During assignment its source side is set to
         the current element, but target side is left as given.
         """
-        self.relations_to.append(relationship)
+        self.relations_to.add(relationship)
         relationship.source = self
+        if self._model is not None:
+            self._model._on_relationship_added(relationship)
         return relationship
 
     def set_as_source_of(self, relationship: ClassRelationship) -> (
@@ -143,7 +265,7 @@ class ClassDiagramElement(sd.SequenceActor):
         self, relationship: ClassRelationship
     ) -> ClassRelationship:
         """
-        Adds relation to self.relations_from list.
+        Adds relation to self.relations_from set (unless it's already there).
         Logic unifying assignment of the element on relationship side is
         applied.
 
@@ -151,8 +273,10 @@ class ClassDiagramElement(sd.SequenceActor):
           assignment its source side is set to
         the current element, but target side is left as given.
         """
-        self.relations_from.append(relationship)
+        self.relations_from.add(relationship)
         relationship.target = self
+        if self._model is not None:
+            self._model._on_relationship_added(relationship)
         return relationship
 
     def set_as_target_of(self, relationship: ClassRelationship) -> (
@@ -167,36 +291,97 @@ class ClassDiagramElement(sd.SequenceActor):
         relationship = self._add_to_relations_from(relationship)
         return relationship
 
+    def remove_relationship(self, relationship: ClassRelationship) -> None:
+        """
+        Removes the relationship from both of its ends.
+
+        :arg relationship - relationship from or to the current element.
+        """
+        if relationship not in self.relations_to and relationship not in self.relations_from:
+            raise InvalidModelInitialization(
+                f"Couldn't remove relationship {str(relationship)} of the class "
+                f"{str(self)}. It isn't connected to the class."
+            )
+        relationship.detach()
+
+    def detach(self) -> None:
+        """
+        Removes all relationships of the element from both of their ends.
+        """
+        for relationship in [*self.relations_to, *self.relations_from]:
+            relationship.detach()
+
 
 class ClassDiagramClass(ClassDiagramElement):
+    __slots__ = ()
+
     def __init__(self, name: str) -> None:
         super().__init__(name)
 
     def accept(self, visitor: v.ModelVisitor):
-        visitor.visit_class_diagram_class(self)
+        if getattr(visitor, "walked", False):
+            return visitor.walk(self)
+        return visitor.visit_class_diagram_class(self)
 
 
 class ClassDiagramInterface(ClassDiagramElement):
+    __slots__ = ()
+
     def __init__(self, name: str) -> None:
         super().__init__(name)
 
     def accept(self, visitor: v.ModelVisitor):
-        visitor.visit_class_diagram_interface(self)
+        if getattr(visitor, "walked", False):
+            return visitor.walk(self)
+        return visitor.visit_class_diagram_interface(self)
 
 
 class ClassRelationship(UMLObject):
-    @dataclass()
+    __slots__ = ("_source_side", "_target_side", "type", "name")
+
     class RelationshipSide:
-        element: Optional[ClassDiagramElement] = None
-        role: Optional[str] = None
-        """
-        Name of the property storing relationship on one side.
-        """
-        min_max_multiplicity: tuple[str, str] = ("0", "1")
-        # TODO: change type to dataclass with values from enum with possible
-        #  values (would be created from config with mapping of name
-        # to python type (change name to multiplicity_range)
-        # TODO: discuss default value
+        __slots__ = ("element", "role", "_min_max_multiplicity")
+        __hash__ = None  # type: ignore[assignment]
+
+        def __init__(
+            self,
+            element: Optional[ClassDiagramElement] = None,
+            role: Optional[str] = None,
+            min_max_multiplicity: tuple[Optional[str], Optional[str]] = Multiplicity.of("0", "1"),
+        ) -> None:
+            # TODO: discuss default value of min_max_multiplicity
+            self.element = element
+            self.role = role
+            """
+            Name of the property storing relationship on one side.
+            """
+            self.min_max_multiplicity = min_max_multiplicity
+
+        @property
+        def min_max_multiplicity(self) -> Multiplicity:
+            """
+            Given (lower, upper) tuples are replaced with interned multiplicities.
+            """
+            return self._min_max_multiplicity
+
+        @min_max_multiplicity.setter
+        def min_max_multiplicity(self, bounds: tuple[Optional[str], Optional[str]]) -> None:
+            self._min_max_multiplicity = Multiplicity.of(*bounds)
+
+        def __eq__(self, other: object) -> bool:
+            if not isinstance(other, ClassRelationship.RelationshipSide):
+                return NotImplemented
+            return (self.element, self.role, self._min_max_multiplicity) == (
+                other.element,
+                other.role,
+                other._min_max_multiplicity,
+            )
+
+        def __repr__(self) -> str:
+            return (
+                f"{type(self).__qualname__}(element={self.element!r}, role={self.role!r}, "
+                f"min_max_multiplicity={self._min_max_multiplicity!r})"
+            )
 
     def __init__(
         self,
@@ -223,16 +408,20 @@ class ClassRelationship(UMLObject):
             element doesn't have current relationship in its relations_to,
             it will be added.
         """
-        self.source_side = source_side or ClassRelationship.RelationshipSide(
+        self.type = type
+        self.name = name
+        super().__init__(**kwargs)
+
+        # Both sides are assigned before the relationship is added to their
+        # elements, as the elements pass it to the model indexing them.
+        self._source_side = source_side or ClassRelationship.RelationshipSide(
             source, source_role, source_minmax
         )
-        self.target_side = target_side or ClassRelationship.RelationshipSide(
+        self._target_side = target_side or ClassRelationship.RelationshipSide(
             target, target_role, target_minmax
         )
-
-        self.type = type
-        self.name = name
-        super().__init__(**kwargs)
+        self.source_side = self._source_side
+        self.target_side = self._target_side
 
     @property
     def source_side(self) -> RelationshipSide:
@@ -244,12 +433,17 @@ class ClassRelationship(UMLObject):
 
     @source_side.setter
     def source_side(self, side: RelationshipSide) -> None:
+        model = None
+        if (previous := self._source_side.element) is not side.element and previous is not None:
+            model = self._indexing_model()
+            previous.relations_to.discard(self)
         self._source_side = side
         if side.element is not None:
             """
             In case given side is a placeholder - not yet initialized.
             """
             side.element.set_as_source_of(self)
+        self._on_end_replaced(model)
 
     @source.setter
     def source(self, new_source_element: ClassDiagramElement) -> None:
@@ -260,8 +454,13 @@ class ClassRelationship(UMLObject):
             return
 
         if isinstance(new_source_element, ClassDiagramElement):
+            model = None
+            if (previous := self.source) is not None:
+                model = self._indexing_model()
+                previous.relations_to.discard(self)
             self._source_side.element = new_source_element
             new_source_element.set_as_source_of(self)
+            self._on_end_replaced(model)
 
         else:
             raise InvalidModelInitialization(
@@ -290,12 +489,17 @@ class ClassRelationship(UMLObject):
 
     @target_side.setter
     def target_side(self, side: RelationshipSide) -> None:
+        model = None
+        if (previous := self._target_side.element) is not side.element and previous is not None:
+            model = self._indexing_model()
+            previous.relations_from.discard(self)
         self._target_side = side
         if side.element is not None:
             """
             In case given side is a placeholder - not yet initialized.
             """
             side.element.set_as_target_of(self)
+        self._on_end_replaced(model)
 
     @target.setter
     def target(self, new_target_element: ClassDiagramElement) -> None:
@@ -306,8 +510,13 @@ class ClassRelationship(UMLObject):
             return
 
         if isinstance(new_target_element, ClassDiagramElement):
+            model = None
+            if (previous := self.target) is not None:
+                model = self._indexing_model()
+                previous.relations_from.discard(self)
             self._target_side.element = new_target_element
             new_target_element.set_as_target_of(self)
+            self._on_end_replaced(model)
 
         else:
             raise InvalidModelInitialization(
@@ -326,42 +535,90 @@ class ClassRelationship(UMLObject):
         )
         self.target_side = new_target_side
 
+    def detach(self) -> None:
+        """
+        Removes the relationship from both of its ends, leaving its sides empty.
+        """
+        model = self._indexing_model()
+        if (source := self.source) is not None:
+            source.relations_to.discard(self)
+            self._source_side.element = None
+        if (target := self.target) is not None:
+            target.relations_from.discard(self)
+            self._target_side.element = None
+        if model is not None:
+            model._on_relationship_removed(self)
+
+    def _on_end_replaced(self, model: Optional[UMLModel]) -> None:
+        """
+        Notifies the model, which indexed the relationship before one of its ends
+        was replaced, about the removal of the old end. The relationship stays
+        indexed (in its package) while any of its ends is indexed by the model.
+        """
+        if model is None:
+            return
+        if self._indexing_model() is model:
+            model.update_index(removed=(self,), added=(self,))
+        else:
+            model._on_relationship_removed(self)
+
     def accept(self, visitor: v.ModelVisitor):
-        visitor.visit_class_relationship(self)
+        if getattr(visitor, "walked", False):
+            return visitor.walk(self)
+        return visitor.visit_class_relationship(self)
+
+    def _indexing_model(self) -> Optional[UMLModel]:
+        for end in (self.source, self.target):
+            if end is not None and end._model is not None:
+                return end._model
+        return None
 
 
 class ClassDiagramMethod(UMLObject):
+    __slots__ = ("name", "parameters", "ret_type")
+    _child_fields = ("parameters",)
+
     def __init__(self, name: str, ret_type: str, parameters=None,
                  **kwargs) -> None:
         self.name = name
         self.parameters: list[ClassDiagramAttribute] = parameters or []
-        self.ret_type = ret_type
+        self.ret_type = intern_value(ret_type)
         super().__init__(**kwargs)
 
     def accept(self, visitor: v.ModelVisitor):
-        visitor.visit_diagram_method(self)
+        if getattr(visitor, "walked", False):
+            return visitor.walk(self)
+        return visitor.visit_diagram_method(self)
 
 
 class ClassDiagramAttribute(UMLObject):
+    __slots__ = ("name", "type", "init_value")
+
     def __init__(self, name: str, type: str, init_value: Any = None,
                  **kwargs) -> None:
         self.name = name
-        self.type = type
+        self.type = intern_value(type)
         self.init_value = init_value
         super().__init__(**kwargs)
 
     def accept(self, visitor: v.ModelVisitor):
-        visitor.visit_class_diagram_attribute(self)
+        if getattr(visitor, "walked", False):
+            return visitor.walk(self)
+        return visitor.visit_class_diagram_attribute(self)
 
 
 class ClassDiagramMethodParameter(UMLObject):
+    __slots__ = ("name", "type", "default_value")
+
     def __init__(
         self, name: Optional[str], type: str, default_value: Any = None,
             **kwargs) -> None:
         self.name = name or ""
-        self.type = type
+        self.type = intern_value(type)
         self.default_value = default_value
         super().__init__(**kwargs)
 
     def accept(self, visitor: v.ModelVisitor):
-        visitor.visit_class_diagram_method_parameter(self)
+        if getattr(visitor, "walked", False):
+            return visitor.walk(self)
+        return visitor.visit_class_diagram_method_parameter(self)
@@ -1,15 +1,45 @@
-from typing import Optional
+from __future__ import annotations
+from typing import Iterable, Iterator, Optional
 
 import uml_interpreter.model.diagrams.abstract as dg
 import uml_interpreter.model.diagrams.class_diagram as cd
 from uml_interpreter.model.abstract import UMLObject
 
+MethodSignature = tuple[str, tuple[str, ...], str]
+"""
+Method's name, types of its parameters and return type.
+"""
+
 
 class ComponentDiagram(dg.StructuralDiagram):
     def __init__(self, name: str) -> None:
         super().__init__(name)
         self.components: list[Component] = []
 
+    def interfaces(self) -> Iterator[ComponentInterface]:
+        """
+        Yields interfaces of all the diagram's components (including nested ones)
+        and their ports.
+        """
+        pending = list(reversed(self.components))
+        visited: set[int] = set()
+        while pending:
+            component = pending.pop()
+            if id(component) in visited:
+                continue
+            visited.add(id(component))
+            yield from component.interfaces
+            for port in component.ports:
+                yield from port.interfaces
+            pending.extend(reversed(component.children))
+
+    def match_interfaces(self) -> list[RequiredComponentInterface]:
+        """
+        Wires the diagram's required interfaces with the provided ones
+        having the same methods. Returns the required interfaces left unmatched.
+        """
+        return match_interfaces(self.interfaces())
+
 
 class ComponentRelationMember(UMLObject):
     def __init__(self, **kwargs) -> None:
@@ -64,3 +94,52 @@ class RequiredComponentInterface(ComponentInterface):
     def __init__(self) -> None:
         super().__init__()
         self.fulfilled_by: list[ProvidedComponentInterface] = []
+
+
+def method_signature(method: cd.ClassDiagramMethod) -> MethodSignature:
+    return (
+        method.name,
+        tuple(parameter.type for parameter in method.parameters),
+        method.ret_type,
+    )
+
+
+def interface_signature(interface: ComponentInterface) -> frozenset[MethodSignature]:
+    """
+    Returns the canonical key of the interface's methods, independent of their order.
+    """
+    return frozenset(method_signature(method) for method in interface.methods)
+
+
+def match_interfaces(
+    interfaces: Iterable[ComponentInterface],
+) -> list[RequiredComponentInterface]:
+    """
+    Wires each required interface with all the provided interfaces having the same
+    methods (in both directions, skipping already wired pairs). Provided interfaces
+    are indexed by their signatures, so the matching takes linear time.
+    Returns the required interfaces left unmatched, including those without methods.
+
+    :arg interfaces - provided and required interfaces, in any order.
+    """
+    provided_by_signature: dict[frozenset[MethodSignature], list[ProvidedComponentInterface]] = {}
+    required: list[RequiredComponentInterface] = []
+    # Interfaces shared by several components or ports are matched once.
+    for interface in dict.fromkeys(interfaces):
+        if isinstance(interface, ProvidedComponentInterface):
+            provided_by_signature.setdefault(interface_signature(interface), []).append(interface)
+        elif isinstance(interface, RequiredComponentInterface):
+            required.append(interface)
+
+    unmatched: list[RequiredComponentInterface] = []
+    for interface in required:
+        providers = interface.methods and provided_by_signature.get(interface_signature(interface))
+        if not providers:
+            unmatched.append(interface)
+            continue
+        wired = {id(provider) for provider in interface.fulfilled_by}
+        for provider in providers:
+            if id(provider) not in wired:
+                interface.fulfilled_by.append(provider)
+                provider.fulfills.append(interface)
+    return unmatched
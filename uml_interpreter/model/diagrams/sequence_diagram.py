@@ -1,23 +1,187 @@
+from __future__ import annotations
+from bisect import bisect_left, bisect_right
 from enum import Enum
-from typing import Optional
+from typing import Iterator, Optional, Union
 from uml_interpreter.model.abstract import UMLObject
 
 import uml_interpreter.model.diagrams.abstract as dg
 import uml_interpreter.model.diagrams.class_diagram as cd
 
 
+class Timeline:
+    """
+    Events kept sorted by their time (events with equal times in the order
+    of insertion), in parallel arrays of times and events. Rank access takes
+    constant time, while range queries and insertions bisect the times.
+    """
+
+    __slots__ = ("_times", "_events", "linked")
+
+    def __init__(self, linked: bool = False) -> None:
+        """
+        :arg linked - whether the timeline keeps the predecessor and successor
+            of each event pointing to its neighbours on the timeline.
+        """
+        # Arrays are allocated on the first insertion, as most actors
+        # (e.g. class diagram elements) never take part in a sequence.
+        self._times: Union[list[int], tuple] = ()
+        self._events: Union[list[LifespanEvent], tuple] = ()
+        self.linked = linked
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    def __iter__(self) -> Iterator[LifespanEvent]:
+        return iter(self._events)
+
+    def __getitem__(self, rank: Union[int, slice]):
+        return self._events[rank]
+
+    def __contains__(self, event: object) -> bool:
+        return isinstance(event, LifespanEvent) and self._position(event) is not None
+
+    def insert(self, event: LifespanEvent) -> None:
+        """
+        Inserts the event after all the events of the same or earlier time.
+        """
+        if not self._events:
+            self._times, self._events = [], []
+        position = bisect_right(self._times, event.time)
+        self._times.insert(position, event.time)
+        self._events.insert(position, event)
+        if self.linked:
+            predecessor = self._events[position - 1] if position else None
+            successor = self._events[position + 1] if position + 1 < len(self._events) else None
+            event.predecessor, event.successor = predecessor, successor
+            if predecessor is not None:
+                predecessor.successor = event
+            if successor is not None:
+                successor.predecessor = event
+
+    append = insert
+
+    def remove(self, event: LifespanEvent) -> None:
+        if (position := self._position(event)) is None:
+            raise ValueError(f"Event {event} isn't on the timeline.")
+        del self._times[position]
+        del self._events[position]
+        if self.linked:
+            predecessor, successor = event.predecessor, event.successor
+            if predecessor is not None:
+                predecessor.successor = successor
+            if successor is not None:
+                successor.predecessor = predecessor
+            event.predecessor = event.successor = None
+
+    def reschedule(self, event: LifespanEvent, time: int) -> None:
+        """
+        Changes the time of the event, moving it to its new place on the timeline.
+        Other timelines holding the event aren't reordered, events of a diagram
+        are rescheduled with SequenceDiagram.reschedule_event instead.
+        """
+        self.remove(event)
+        event.time = time
+        self.insert(event)
+
+    def rank(self, event: LifespanEvent) -> int:
+        """
+        Returns the position of the event on the timeline.
+        """
+        if (position := self._position(event)) is None:
+            raise ValueError(f"Event {event} isn't on the timeline.")
+        return position
+
+    def between(self, start: int, end: int) -> list[LifespanEvent]:
+        """
+        Returns the events of time within the range, including its bounds.
+        """
+        return self._events[bisect_left(self._times, start) : bisect_right(self._times, end)]
+
+    def _position(self, event: LifespanEvent) -> Optional[int]:
+        # Only the events of the same time are compared.
+        start = bisect_left(self._times, event.time)
+        end = bisect_right(self._times, event.time, start)
+        for position in range(start, end):
+            if self._events[position] is event:
+                return position
+        return None
+
+
 class SequenceDiagram(dg.BehavioralDiagram):
-    def __init__(self, name: str) -> None:
+    def __init__(
+        self,
+        name: str,
+        actors: Optional[list[SequenceActor]] = None,
+        timeline: Optional[Timeline] = None,
+    ) -> None:
+        """
+        :arg actors - actors of the diagram, shared with the given list.
+        :arg timeline - timeline of the diagram's events, shared with the given one
+            (e.g. a fragment's timeline is the one of its parent diagram).
+        """
         super().__init__(name)
-        self.actors: list[SequenceActor] = []
+        self.actors: list[SequenceActor] = [] if actors is None else actors
+        self.timeline: Timeline = Timeline(linked=True) if timeline is None else timeline
+
+    def add_event(self, event: LifespanEvent) -> None:
+        """
+        Places the event on the diagram's timeline, and on the timelines
+        of actors sending and receiving it.
+        """
+        self.timeline.insert(event)
+        if isinstance(event, SequenceMessage):
+            event.sender.events.insert(event)
+            if event.receiver is not event.sender:
+                event.receiver.events.insert(event)
+
+    def remove_event(self, event: LifespanEvent) -> None:
+        """
+        Removes the event from the diagram's timeline and from the timelines
+        of its actors. Raises ValueError, leaving all the timelines unchanged,
+        if the event is missing from any of them.
+        """
+        for timeline in self._timelines_of(event):
+            timeline.remove(event)
+
+    def reschedule_event(self, event: LifespanEvent, time: int) -> None:
+        """
+        Changes the time of the event, moving it to its new place on the diagram's
+        timeline and on the timelines of its actors.
+        """
+        timelines = self._timelines_of(event)
+        for timeline in timelines:
+            timeline.remove(event)
+        event.time = time
+        for timeline in timelines:
+            timeline.insert(event)
+
+    def _timelines_of(self, event: LifespanEvent) -> list[Timeline]:
+        """
+        Returns the timelines holding the event, raising ValueError if it's missing
+        from any of them.
+        """
+        timelines = [self.timeline]
+        if isinstance(event, SequenceMessage):
+            timelines.append(event.sender.events)
+            if event.receiver is not event.sender:
+                timelines.append(event.receiver.events)
+        for timeline in timelines:
+            if event not in timeline:
+                raise ValueError(f"Event {event} isn't on the timelines of the diagram.")
+        return timelines
 
 
 class SequenceActor(UMLObject):
+    __slots__ = ("messages_from", "messages_to", "events", "name")
+
     def __init__(self, name: str) -> None:
         super().__init__()
         self.messages_from: list[SequenceMessage] = []
         self.messages_to: list[SequenceMessage] = []
-        self.events: list[LifespanEvent] = []
+        self.events: Timeline = Timeline()
+        """
+        Events the actor takes part in, ordered by time.
+        """
         self.name = name
 
 
@@ -59,8 +223,8 @@ class AsyncSequenceMessage(SequenceMessage):
 
 class SequenceFragment(SequenceDiagram, LifespanEvent):
     def __init__(self, parent: SequenceDiagram, name: str) -> None:
-        super().__init__(name)
-        self.actors = parent.actors
+        super().__init__(name, parent.actors, parent.timeline)
+        self.parent = parent
 
 
 class LoopSequenceFragment(SequenceFragment):
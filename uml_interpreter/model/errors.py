@@ -21,3 +21,44 @@ class InvalidModelInitialization(ModelParsingError):
     """
     Exception thrown when tried to collect data for model member object, but couldn't due to an incompatibility.
     """
+
+
+class FrozenModelError(AttributeError):
+    """
+    Exception thrown when tried to modify an object of a frozen model.
+    """
+
+
+class MergeConflictError(Exception):
+    """
+    Exception thrown when merged models contain objects of the same ID, which can't be unified.
+    """
+
+    def __init__(self, msg: str) -> None:
+        """
+        Arguments:
+            msg {str} -- error message
+        """
+        self.msg = msg
+
+    def __str__(self):
+        return f"Merge Conflict Error: {self.msg}"
+
+
+class CyclicGraphError(Exception):
+    """
+    Exception thrown when an analysis requiring acyclic relationships (e.g. topological order)
+    is run over relationships forming a cycle.
+    """
+
+    def __init__(self, msg: str, cycle: list) -> None:
+        """
+        Arguments:
+            msg {str} -- error message
+            cycle {list} -- elements of the strongly connected component forming the cycle
+        """
+        self.msg = msg
+        self.cycle = cycle
+
+    def __str__(self):
+        return f"Cyclic Graph Error: {self.msg}"
@@ -0,0 +1,559 @@
+"""
+Immutable UML Models
+
+Freezing copies the model: lists of its objects become tuples and every object
+is an instance of its class's frozen subclass, whose attributes can't be set.
+The model given stays mutable. Frozen objects are still instances of their
+original classes, so readers (visitors, index lookups, graph analyses) work
+on them unchanged, and can share one frozen model across threads without
+copying or locking. Read-only views of models (e.g. proxies of model snapshots'
+records) are frozen as well.
+
+Thawing a frozen model (or a view) shares its structure: the mutable model
+refers to thawed objects, which copy each attribute of their frozen original
+on its first access. Only the parts of the model read or changed are copied,
+the frozen model itself is never changed.
+
+The module includes the following:
+- FrozenRelationshipSet
+- frozen_class
+- mutable_class
+- is_frozen
+- freeze_model
+- thaw_model
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Mapping
+from functools import cache
+from itertools import chain
+from operator import attrgetter
+from typing import Any, Callable, Iterator
+
+from uml_interpreter.model.abstract import UMLObject
+from uml_interpreter.model.diagrams.class_diagram import (
+    ClassRelationship,
+    RelationshipSet,
+)
+from uml_interpreter.model.diagrams.sequence_diagram import LifespanEvent, Timeline
+from uml_interpreter.model.errors import FrozenModelError
+from uml_interpreter.model.utils import paused_gc
+
+_MODEL_OBJECTS = (UMLObject, LifespanEvent, ClassRelationship.RelationshipSide, Timeline)
+"""
+Classes of the objects frozen together with the model.
+"""
+
+_BACK_REFERENCES = frozenset({"_model"})
+"""
+Attributes referring back to the model, which are neither followed nor copied.
+"""
+
+_THAWED_SLOTS = ("_original", "_thaw")
+"""
+Slots of the thawed objects, referring to their frozen originals and to the copies
+of the thawed model.
+"""
+
+_UNSET = object()
+
+
+class _Frozen:
+    __slots__ = ()
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise FrozenModelError(
+            f"Can't set {name} of {type(self).__name__}, it's a part of a frozen model."
+        )
+
+    def __delattr__(self, name: str) -> None:
+        raise FrozenModelError(
+            f"Can't delete {name} of {type(self).__name__}, it's a part of a frozen model."
+        )
+
+    def __reduce_ex__(self, protocol: int) -> Any:
+        # Frozen classes are created at runtime, so objects are pickled
+        # as instances of their original classes.
+        _, args, *rest = super().__reduce_ex__(max(protocol, 2))
+        return (_new_object, (mutable_class(type(self)), *args[1:]), *rest)
+
+
+class _ReadOnly:
+    """
+    Base of read-only views of model objects (e.g. proxies of model snapshots'
+    records), which are frozen without being instances of frozen classes.
+    Their mutable_class is the first of their bases which isn't a view.
+    """
+
+    __slots__ = ()
+    _FIELDS: tuple[str, ...] = ()
+    """
+    Attributes of the viewed class, copied when the view is thawed.
+    """
+
+    def _thawed_attribute(self, name: str) -> Any:
+        """
+        Returns the value of the attribute (one of _FIELDS) of the view's thawed copy.
+        """
+        return getattr(self, name)
+
+
+class _Thawed:
+    """
+    Base of the classes of thawed objects (see thaw_model). Attributes not set yet
+    are copied from the frozen original on their first access: collections become
+    mutable ones, and frozen objects are replaced with their thawed copies.
+    """
+
+    __slots__ = ()
+
+    def __getattr__(self, name: str) -> Any:
+        # Called only for attributes without a value, i.e. those not copied yet.
+        if name in _THAWED_SLOTS:
+            raise AttributeError(name)
+        original = self._original
+        if name in _BACK_REFERENCES and name in _back_references(type(self)):
+            value = None
+        elif name in _original_names(original):
+            if isinstance(original, _ReadOnly):
+                value = original._thawed_attribute(name)
+            else:
+                value = getattr(original, name)
+            value = self._thaw.copy(value)
+        else:
+            raise AttributeError(
+                f"'{type(self).__name__}' object has no attribute '{name}'"
+            )
+        object.__setattr__(self, name, value)
+        return value
+
+    def _materialize(self) -> None:
+        """
+        Copies all the attributes not copied yet.
+        """
+        for name in chain(_original_names(self._original), _back_references(type(self))):
+            getattr(self, name)
+
+    def __reduce_ex__(self, protocol: int) -> Any:
+        # Objects are pickled as instances of their original classes,
+        # without the references to the frozen model.
+        self._materialize()
+        _, args, state, *rest = super().__reduce_ex__(max(protocol, 2))
+        if isinstance(state, tuple):
+            instance_dict, slots = state
+            slots = {name: value for name, value in slots.items() if name not in _THAWED_SLOTS}
+            state = (instance_dict, slots or None)
+        return (_new_object, (mutable_class(type(self)), *args[1:]), state, *rest)
+
+
+def _new_object(cls: type, *args: Any) -> Any:
+    return cls.__new__(cls, *args)
+
+
+class FrozenRelationshipSet(RelationshipSet):
+    __slots__ = ()
+
+    def _raise(self, *args: Any) -> None:
+        raise FrozenModelError("Can't change relationships of a frozen model's element.")
+
+    add = discard = append = extend = _raise
+
+
+@cache
+def frozen_class(cls: type) -> type:
+    """
+    Returns the frozen subclass of the class, created once per class.
+    """
+    if issubclass(cls, (_Frozen, FrozenRelationshipSet)):
+        return cls
+    if cls is RelationshipSet:
+        return FrozenRelationshipSet
+    return type(cls)(
+        f"Frozen{cls.__name__}",
+        (_Frozen, cls),
+        {
+            "__slots__": (),
+            "__module__": cls.__module__,
+            "__qualname__": f"Frozen{cls.__qualname__}",
+        },
+    )
+
+
+@cache
+def _thawed_class(cls: type) -> type:
+    """
+    Returns the subclass of the (mutable) class, whose instances are thawed lazily.
+    """
+    return type(cls)(
+        f"Thawed{cls.__name__}",
+        (_Thawed, cls),
+        {
+            "__slots__": _THAWED_SLOTS,
+            "__module__": cls.__module__,
+            "__qualname__": f"Thawed{cls.__qualname__}",
+        },
+    )
+
+
+def mutable_class(cls: type) -> type:
+    """
+    Returns the original class of the frozen (or thawed) class, or the class viewed
+    by the read-only view (other classes are returned as they are).
+    """
+    if cls is FrozenRelationshipSet:
+        return RelationshipSet
+    if issubclass(cls, (_Frozen, _Thawed)):
+        return cls.__mro__[2]
+    if issubclass(cls, _ReadOnly):
+        return _viewed_class(cls)
+    return cls
+
+
+@cache
+def _viewed_class(cls: type) -> type:
+    return next(klass for klass in cls.__mro__ if not issubclass(klass, _ReadOnly))
+
+
+def is_frozen(obj: Any) -> bool:
+    return isinstance(obj, (_Frozen, FrozenRelationshipSet, _ReadOnly))
+
+
+@cache
+def _slot_names(cls: type) -> tuple[str, ...]:
+    names: list[str] = []
+    for klass in reversed(cls.__mro__):
+        slots = klass.__dict__.get("__slots__", ())
+        for name in (slots,) if isinstance(slots, str) else slots:
+            if (
+                name not in ("__dict__", "__weakref__", *_BACK_REFERENCES, *_THAWED_SLOTS)
+                and name not in names
+            ):
+                names.append(name)
+    return tuple(names)
+
+
+def _original_names(original: Any) -> Any:
+    """
+    Returns names of the attributes of the frozen object (or view) copied when it's thawed.
+    """
+    if isinstance(original, _ReadOnly):
+        return original._FIELDS
+    names = _slot_names(type(original))
+    if type(original).__dictoffset__ != 0:
+        return (*names, *(name for name in vars(original) if name not in _BACK_REFERENCES))
+    return names
+
+
+@cache
+def _attribute_reader(cls: type) -> tuple[tuple[str, ...], Callable[[Any], tuple], bool]:
+    """
+    Returns slot names of the class, a function reading their values at once,
+    and whether its instances have dictionaries.
+    """
+    names = _slot_names(cls)
+    if len(names) > 1:
+        read = attrgetter(*names)
+    else:
+        read = lambda obj: tuple(getattr(obj, name) for name in names)  # noqa: E731
+    return names, read, cls.__dictoffset__ != 0
+
+
+def _attributes(obj: Any) -> list[tuple[str, Any]]:
+    """
+    Returns names and values of the object's attributes (slots and dictionary),
+    apart from the back references to the model.
+    """
+    if isinstance(obj, _ReadOnly):
+        return [(name, obj._thawed_attribute(name)) for name in obj._FIELDS]
+    if isinstance(obj, _Thawed):
+        obj._materialize()
+    names, read, has_dict = _attribute_reader(type(obj))
+    try:
+        attributes = list(zip(names, read(obj)))
+    except AttributeError:
+        # Some of the slots aren't set.
+        attributes = [
+            (name, value) for name in names if (value := getattr(obj, name, _UNSET)) is not _UNSET
+        ]
+    if has_dict:
+        attributes.extend(item for item in vars(obj).items() if item[0] not in _BACK_REFERENCES)
+    return attributes
+
+
+@cache
+def _back_references(cls: type) -> tuple[str, ...]:
+    return tuple(name for name in _BACK_REFERENCES if hasattr(cls, name))
+
+
+_VALUE, _OBJECT, _COLLECTION = range(1, 4)
+
+_VALUE_KINDS: dict[type, int] = {}
+"""
+Class -> kind of its values, see _value_kind.
+"""
+
+
+def _value_kind(cls: type) -> int:
+    """
+    Tells whether values of the class are model objects, collections (possibly)
+    holding them, or plain values. Cached per class, as isinstance checks
+    against the abstract UMLObject are slow.
+    """
+    if (kind := _VALUE_KINDS.get(cls)) is None:
+        if issubclass(cls, _MODEL_OBJECTS):
+            kind = _OBJECT
+        elif issubclass(cls, (list, tuple, RelationshipSet)):
+            kind = _COLLECTION
+        else:
+            kind = _VALUE
+        _VALUE_KINDS[cls] = kind
+    return kind
+
+
+def _traverse(model: Any) -> Iterator[tuple[Any, list[tuple[str, Any]]]]:
+    """
+    Yields the model's diagrams and indexed objects, together with all
+    the objects reachable from them, and their attributes. Objects are
+    visited breadth first, without recursion.
+    """
+    visited: set[int] = set()
+    pending: deque[Any] = deque()
+    kinds = _VALUE_KINDS
+
+    for obj in chain(model.diagrams, model.index):
+        if id(obj) not in visited:
+            visited.add(id(obj))
+            pending.append(obj)
+    while pending:
+        obj = pending.popleft()
+        attributes = _attributes(obj)
+        for _, value in attributes:
+            kind = kinds.get(type(value)) or _value_kind(type(value))
+            if kind == _VALUE:
+                continue
+            for item in (value,) if kind == _OBJECT else value:
+                if (
+                    kinds.get(type(item)) or _value_kind(type(item))
+                ) == _OBJECT and id(item) not in visited:
+                    visited.add(id(item))
+                    pending.append(item)
+        yield obj, attributes
+
+
+def freeze_model(model: Any) -> Any:
+    """
+    Returns a frozen copy of the UMLModel, leaving the model itself mutable
+    (frozen models are returned as they are). Lazily loaded diagrams are built,
+    and the copy's index and graph are created upfront, as they can't be attached
+    to the frozen model afterwards.
+    """
+    if is_frozen(model):
+        return model
+
+    with paused_gc():
+        return _freeze_model(_copy_model(model))
+
+
+def _freeze_model(model: Any) -> Any:
+    """
+    Freezes the UMLModel in place (e.g. a copy no one else refers to) and returns it.
+    """
+    diagrams = tuple(model.diagrams)
+    model.index
+    model.graph
+
+    # Lists shared by several objects (e.g. fragments' actors) become one tuple.
+    # Original lists are kept alive, so that their IDs aren't reused.
+    tuples: dict[int, tuple[list, tuple]] = {}
+    for obj, attributes in _traverse(model):
+        for name, value in attributes:
+            if type(value) is list:
+                if (entry := tuples.get(id(value))) is None:
+                    entry = tuples[id(value)] = (value, tuple(value))
+                object.__setattr__(obj, name, entry[1])
+            elif type(value) is RelationshipSet:
+                object.__setattr__(value, "__class__", FrozenRelationshipSet)
+        object.__setattr__(obj, "__class__", frozen_class(type(obj)))
+
+    object.__setattr__(model, "diagrams", diagrams)
+    object.__setattr__(model, "__class__", frozen_class(type(model)))
+    return model
+
+
+def thaw_model(model: Any) -> Any:
+    """
+    Returns a mutable copy of the UMLModel, leaving the model itself intact.
+
+    Frozen models (and read-only views of models) are thawed lazily, in time
+    independent of their size: objects of the copy are created on their first
+    access, and copy each attribute of their frozen original on its first access
+    (collections become mutable, immutable values are shared). Other models
+    are copied as a whole upfront.
+    """
+    with paused_gc():
+        if is_frozen(model):
+            return _thaw_model(model)
+        return _copy_model(model)
+
+
+class _Thaw:
+    """
+    Thawed copies of the objects (and collections) of one frozen model.
+    """
+
+    __slots__ = ("_copies",)
+
+    def __init__(self) -> None:
+        self._copies: dict[int, tuple[Any, Any]] = {}
+        """
+        ID of the frozen object -> the object (kept alive, so that its ID isn't
+        reused) and its thawed copy.
+        """
+
+    def copy(self, value: Any) -> Any:
+        """
+        Returns the thawed copy of the value - values other than model objects
+        and collections are returned as they are.
+        """
+        cls = type(value)
+        if cls is tuple or cls is list or cls is FrozenRelationshipSet or cls is RelationshipSet:
+            # Collections shared by several objects are copied once.
+            if (entry := self._copies.get(id(value))) is None:
+                items = [self.copy(item) for item in value]
+                copy = RelationshipSet(items) if isinstance(value, RelationshipSet) else items
+                entry = self._copies[id(value)] = (value, copy)
+            return entry[1]
+        if (_VALUE_KINDS.get(cls) or _value_kind(cls)) == _OBJECT:
+            if (entry := self._copies.get(id(value))) is None:
+                copy = object.__new__(_thawed_class(mutable_class(cls)))
+                object.__setattr__(copy, "_original", value)
+                object.__setattr__(copy, "_thaw", self)
+                entry = self._copies[id(value)] = (value, copy)
+            return entry[1]
+        return value
+
+
+class _Deferred(Mapping):
+    """
+    Mapping read on its first use, e.g. when the index of the thawed model is built.
+    """
+
+    def __init__(self, read: Callable[[], Mapping]) -> None:
+        self._read = read
+        self._mapping: Any = None
+
+    def _get(self) -> Mapping:
+        if self._mapping is None:
+            self._mapping = self._read()
+        return self._mapping
+
+    def __getitem__(self, key: Any) -> Any:
+        return self._get()[key]
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._get())
+
+    def __len__(self) -> int:
+        return len(self._get())
+
+
+class _ThawedIndexSeed:
+    """
+    Thawed copies of the objects indexed by the frozen model, read when the thawed
+    model's index is built.
+    """
+
+    def __init__(self, model: Any, thaw: _Thaw) -> None:
+        self._model = model
+        self._thaw = thaw
+
+    def __iter__(self) -> Iterator[Any]:
+        return map(self._thaw.copy, self._model.index)
+
+
+def _thaw_model(model: Any) -> Any:
+    thaw = _Thaw()
+    thawed = mutable_class(type(model))(
+        diagrams=[thaw.copy(diagram) for diagram in model.diagrams],
+        filename=model.filename,
+    )
+    thawed.id = model.id
+    thawed.unresolved_references = {
+        ref_id: [(thaw.copy(rel), side) for rel, side in ends]
+        for ref_id, ends in model.unresolved_references.items()
+    }
+
+    def package_ids() -> dict[str, str]:
+        index = model.index
+        return {obj.id: package_id for obj in index if (package_id := index.package_of(obj))}
+
+    thawed.seed_index(
+        _ThawedIndexSeed(model, thaw),
+        _Deferred(package_ids),
+        _Deferred(lambda: model.index.package_names()),
+    )
+    return thawed
+
+
+_COPIED_COLLECTIONS = (list, tuple, RelationshipSet, FrozenRelationshipSet)
+"""
+Collections copied by _copy_model. Tuples of other types (e.g. multiplicities) are values.
+"""
+
+
+def _copy_model(model: Any) -> Any:
+    """
+    Returns a mutable copy of the whole UMLModel. Immutable values (strings,
+    multiplicities, enums) are shared with the model, every object and collection
+    is copied.
+    """
+    copies: dict[int, Any] = {}
+    collections: dict[int, tuple[Any, Any]] = {}
+    kinds = _VALUE_KINDS
+    set_attribute = object.__setattr__
+
+    def copy_of(obj: Any) -> Any:
+        if (copy := copies.get(id(obj))) is None:
+            copy = copies[id(obj)] = object.__new__(mutable_class(type(obj)))
+        return copy
+
+    def copied_collection(value: Any) -> Any:
+        if (entry := collections.get(id(value))) is None:
+            items = [
+                copy_of(item) if kinds[type(item)] == _OBJECT else item for item in value
+            ]
+            copied = RelationshipSet(items) if isinstance(value, RelationshipSet) else items
+            entry = collections[id(value)] = (value, copied)
+        return entry[1]
+
+    # Kinds of all the values are known, once the traversal yields their owner.
+    for obj, attributes in _traverse(model):
+        copy = copy_of(obj)
+        for name, value in attributes:
+            kind = kinds[type(value)]
+            if kind == _OBJECT:
+                value = copy_of(value)
+            elif kind == _COLLECTION and type(value) in _COPIED_COLLECTIONS:
+                value = copied_collection(value)
+            set_attribute(copy, name, value)
+        for name in _back_references(type(copy)):
+            set_attribute(copy, name, None)
+
+    index = model.index
+    copied = mutable_class(type(model))(
+        diagrams=[copies[id(diagram)] for diagram in model.diagrams],
+        filename=model.filename,
+    )
+    copied.id = model.id
+    copied.unresolved_references = {
+        ref_id: [(copies[id(rel)], side) for rel, side in ends if id(rel) in copies]
+        for ref_id, ends in model.unresolved_references.items()
+    }
+    copied.seed_index(
+        [copies[id(obj)] for obj in index],
+        {obj.id: package_id for obj in index if (package_id := index.package_of(obj))},
+        index.package_names(),
+    )
+    return copied
@@ -0,0 +1,346 @@
+"""
+Graph analyses of UML Model's class diagram elements
+
+Elements are the nodes of a directed graph and relationships are its edges,
+leading from the relationship's source to its target (for Generalization -
+from the specific element to the general one). All algorithms are iterative,
+so long chains of relationships don't hit the recursion limit.
+
+The module includes the following:
+- ModelGraph
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Optional, Union
+
+from uml_interpreter.model.diagrams.class_diagram import (
+    ClassDiagramElement,
+    RelationshipType,
+)
+from uml_interpreter.model.errors import CyclicGraphError
+
+if TYPE_CHECKING:
+    from uml_interpreter.model.model import UMLModel
+
+RelationshipTypes = Optional[Iterable[Union[RelationshipType, str]]]
+"""
+Types of relationships followed by an analysis, all types if None.
+"""
+
+_TypesKey = Optional[frozenset[RelationshipType]]
+
+
+class ModelGraph:
+    """
+    Directed graph of the model's class diagram elements (all the elements of its
+    index). Results are memoized until the model's relationships change.
+    """
+
+    def __init__(self, model: UMLModel) -> None:
+        self._model = model
+        self._nodes: Optional[list[ClassDiagramElement]] = None
+        self._node_numbers: dict[ClassDiagramElement, int] = {}
+        self._cache: dict[tuple, Any] = {}
+        """
+        (analysis, relationship types, *arguments) -> memoized result.
+        """
+
+    def invalidate(self) -> None:
+        """
+        Drops all memoized results, called by the model when its relationships change.
+        """
+        self._nodes = None
+        self._node_numbers = {}
+        self._cache.clear()
+
+    @property
+    def nodes(self) -> list[ClassDiagramElement]:
+        return list(self._get_nodes())
+
+    def successors(
+        self, elem: ClassDiagramElement, types: RelationshipTypes = None
+    ) -> list[ClassDiagramElement]:
+        """
+        Returns the targets of the element's relationships.
+        """
+        key = _types_key(types)
+        return self._elements(self._adjacency(key)[self._number(elem)])
+
+    def predecessors(
+        self, elem: ClassDiagramElement, types: RelationshipTypes = None
+    ) -> list[ClassDiagramElement]:
+        """
+        Returns the sources of the relationships leading to the element.
+        """
+        key = _types_key(types)
+        return self._elements(self._adjacency(key, reverse=True)[self._number(elem)])
+
+    def reachable_from(
+        self, elem: ClassDiagramElement, types: RelationshipTypes = None
+    ) -> list[ClassDiagramElement]:
+        """
+        Returns the elements reachable from the element, nearest first.
+        The element itself is included only if it lies on a cycle.
+        """
+        key = _types_key(types)
+        return self._elements(self._reachable(key, self._number(elem), reverse=False))
+
+    def reaching(
+        self, elem: ClassDiagramElement, types: RelationshipTypes = None
+    ) -> list[ClassDiagramElement]:
+        """
+        Returns the elements from which the element is reachable, nearest first.
+        """
+        key = _types_key(types)
+        return self._elements(self._reachable(key, self._number(elem), reverse=True))
+
+    def superclasses(self, elem: ClassDiagramElement) -> list[ClassDiagramElement]:
+        """
+        Returns the inheritance chain of the element - all the elements it
+        generalizes to, direct parents first.
+        """
+        return self.reachable_from(elem, (RelationshipType.Generalization,))
+
+    def subclasses(self, elem: ClassDiagramElement) -> list[ClassDiagramElement]:
+        """
+        Returns all the elements specializing the element, direct children first.
+        """
+        return self.reaching(elem, (RelationshipType.Generalization,))
+
+    def transitive_closure(
+        self, types: RelationshipTypes = None
+    ) -> dict[ClassDiagramElement, frozenset[ClassDiagramElement]]:
+        """
+        Returns element -> elements reachable from it, for all elements.
+        Elements of a strongly connected component share the same set. Size of
+        the result grows quadratically with the length of relationship chains,
+        use reachable_from for queries about single elements of large models.
+        """
+        key = _types_key(types)
+        return self._memoized(("closure", key), lambda: self._closure(key))
+
+    def strongly_connected_components(
+        self, types: RelationshipTypes = None
+    ) -> list[list[ClassDiagramElement]]:
+        """
+        Returns the strongly connected components of the graph, each component
+        placed after all the components reachable from it.
+        """
+        key = _types_key(types)
+        return [self._elements(component) for component in self._components(key)]
+
+    def cycles(self, types: RelationshipTypes = None) -> list[list[ClassDiagramElement]]:
+        """
+        Returns the strongly connected components containing a cycle.
+        """
+        key = _types_key(types)
+        return [self._elements(component) for component in self._cyclic_components(key)]
+
+    def has_cycle(self, types: RelationshipTypes = None) -> bool:
+        return bool(self._cyclic_components(_types_key(types)))
+
+    def topological_order(self, types: RelationshipTypes = None) -> list[ClassDiagramElement]:
+        """
+        Returns the elements ordered so that every relationship's source precedes
+        its target (for Generalization - specific elements precede general ones).
+
+        Raises CyclicGraphError, if the relationships form a cycle.
+        """
+        key = _types_key(types)
+        if cyclic := self._cyclic_components(key):
+            raise CyclicGraphError(
+                "Relationships form a cycle, elements can't be ordered topologically.",
+                self._elements(cyclic[0]),
+            )
+        return self._elements(self._memoized(("topological", key), lambda: self._kahn(key)))
+
+    def _get_nodes(self) -> list[ClassDiagramElement]:
+        if self._nodes is None:
+            self._nodes = self._model.index.elements_of_type(ClassDiagramElement)
+            self._node_numbers = {elem: number for number, elem in enumerate(self._nodes)}
+        return self._nodes
+
+    def _number(self, elem: ClassDiagramElement) -> int:
+        self._get_nodes()
+        try:
+            return self._node_numbers[elem]
+        except KeyError:
+            raise ValueError(f"Element {elem} isn't a part of the model.") from None
+
+    def _elements(self, numbers: Iterable[int]) -> list[ClassDiagramElement]:
+        nodes = self._get_nodes()
+        return [nodes[number] for number in numbers]
+
+    def _memoized(self, key: tuple, compute: Callable[[], Any]) -> Any:
+        if (result := self._cache.get(key)) is None:
+            result = self._cache[key] = compute()
+        return result
+
+    def _adjacency(self, types: _TypesKey, reverse: bool = False) -> list[list[int]]:
+        """
+        Returns node number -> numbers of its successors (or predecessors).
+        """
+        if reverse:
+            return self._memoized(("predecessors", types), lambda: self._reverse(types))
+        return self._memoized(("successors", types), lambda: self._forward(types))
+
+    def _forward(self, types: _TypesKey) -> list[list[int]]:
+        nodes = self._get_nodes()
+        node_numbers = self._node_numbers
+        adjacency: list[list[int]] = []
+        for elem in nodes:
+            successors = []
+            for rel in elem.relations_to:
+                if types is None or rel.type in types:
+                    if (number := node_numbers.get(rel.target)) is not None:
+                        successors.append(number)
+            adjacency.append(successors)
+        return adjacency
+
+    def _reverse(self, types: _TypesKey) -> list[list[int]]:
+        reverse: list[list[int]] = [[] for _ in self._get_nodes()]
+        for number, successors in enumerate(self._adjacency(types)):
+            for successor in successors:
+                reverse[successor].append(number)
+        return reverse
+
+    def _reachable(self, types: _TypesKey, start: int, reverse: bool) -> list[int]:
+        def search() -> list[int]:
+            adjacency = self._adjacency(types, reverse)
+            visited = {start}
+            found: list[int] = []
+            queue = deque(adjacency[start])
+            while queue:
+                number = queue.popleft()
+                if number == start and start not in found:
+                    found.append(start)
+                if number in visited:
+                    continue
+                visited.add(number)
+                found.append(number)
+                queue.extend(adjacency[number])
+            return found
+
+        return self._memoized(("reachable", types, start, reverse), search)
+
+    def _components(self, types: _TypesKey) -> list[list[int]]:
+        return self._memoized(("components", types), lambda: self._tarjan(types))
+
+    def _tarjan(self, types: _TypesKey) -> list[list[int]]:
+        """
+        Tarjan's algorithm with an explicit stack of successor iterators.
+        Components are found in reverse topological order.
+        """
+        adjacency = self._adjacency(types)
+        size = len(adjacency)
+        order = [-1] * size
+        low = [0] * size
+        on_stack = [False] * size
+        stack: list[int] = []
+        components: list[list[int]] = []
+        counter = 0
+
+        for root in range(size):
+            if order[root] != -1:
+                continue
+            order[root] = low[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack[root] = True
+            work = [(root, iter(adjacency[root]))]
+            while work:
+                number, successors = work[-1]
+                for successor in successors:
+                    if order[successor] == -1:
+                        order[successor] = low[successor] = counter
+                        counter += 1
+                        stack.append(successor)
+                        on_stack[successor] = True
+                        work.append((successor, iter(adjacency[successor])))
+                        break
+                    if on_stack[successor] and order[successor] < low[number]:
+                        low[number] = order[successor]
+                else:
+                    work.pop()
+                    if work and low[number] < low[parent := work[-1][0]]:
+                        low[parent] = low[number]
+                    if low[number] == order[number]:
+                        component = []
+                        while True:
+                            member = stack.pop()
+                            on_stack[member] = False
+                            component.append(member)
+                            if member == number:
+                                break
+                        components.append(component)
+        return components
+
+    def _cyclic_components(self, types: _TypesKey) -> list[list[int]]:
+        def find() -> list[list[int]]:
+            adjacency = self._adjacency(types)
+            return [
+                component
+                for component in self._components(types)
+                if len(component) > 1 or component[0] in adjacency[component[0]]
+            ]
+
+        return self._memoized(("cycles", types), find)
+
+    def _kahn(self, types: _TypesKey) -> list[int]:
+        adjacency = self._adjacency(types)
+        in_degree = [0] * len(adjacency)
+        for successors in adjacency:
+            for successor in successors:
+                in_degree[successor] += 1
+
+        queue = deque(number for number, degree in enumerate(in_degree) if not degree)
+        order: list[int] = []
+        while queue:
+            number = queue.popleft()
+            order.append(number)
+            for successor in adjacency[number]:
+                in_degree[successor] -= 1
+                if not in_degree[successor]:
+                    queue.append(successor)
+        return order
+
+    def _closure(
+        self, types: _TypesKey
+    ) -> dict[ClassDiagramElement, frozenset[ClassDiagramElement]]:
+        adjacency = self._adjacency(types)
+        components = self._components(types)
+        component_of = [0] * len(adjacency)
+        for component_number, component in enumerate(components):
+            for number in component:
+                component_of[number] = component_number
+
+        nodes = self._get_nodes()
+        closures: list[frozenset[ClassDiagramElement]] = []
+        # Components reachable from a component precede it, so their closures are known.
+        for component_number, component in enumerate(components):
+            reached: set[ClassDiagramElement] = set()
+            cyclic = len(component) > 1
+            for number in component:
+                for successor in adjacency[number]:
+                    successor_component = component_of[successor]
+                    if successor_component == component_number:
+                        cyclic = True
+                    elif nodes[successor] not in reached:
+                        reached.add(nodes[successor])
+                        reached.update(closures[successor_component])
+            if cyclic:
+                reached.update(nodes[number] for number in component)
+            closures.append(frozenset(reached))
+
+        return {nodes[number]: closures[component_of[number]] for number in range(len(nodes))}
+
+
+def _types_key(types: RelationshipTypes) -> _TypesKey:
+    if types is None:
+        return None
+    return frozenset(
+        RelationshipType(rel_type) if isinstance(rel_type, str) else rel_type
+        for rel_type in types
+    )
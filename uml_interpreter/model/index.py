@@ -0,0 +1,179 @@
+"""
+Lookup indexes of UML Model's objects
+
+The module includes the following:
+- ModelIndex
+"""
+
+from typing import Iterable, Iterator, Optional, TypeVar
+
+from uml_interpreter.model.abstract import UMLObject
+from uml_interpreter.model.diagrams.class_diagram import (
+    ClassDiagramElement,
+    ClassRelationship,
+)
+
+T = TypeVar("T")
+
+
+class ModelIndex:
+    """
+    Class diagram elements and relationships of the model, indexed by their IDs,
+    names, types and packages. Buckets are insertion ordered dictionaries used as
+    sets, so objects are added and removed in constant time.
+    """
+
+    def __init__(self) -> None:
+        self._by_id: dict[str, UMLObject] = {}
+        self._by_name: dict[str, dict[UMLObject, None]] = {}
+        self._by_type: dict[type, dict[UMLObject, None]] = {}
+        self._by_package: dict[str, dict[UMLObject, None]] = {}
+        self._object_to_key: dict[UMLObject, tuple[Optional[str], Optional[str]]] = {}
+        """
+        Object -> (name, package ID) under which it was indexed.
+        """
+        self._package_names: dict[str, str] = {}
+        """
+        Package ID -> package name.
+        """
+
+    def __contains__(self, obj: UMLObject) -> bool:
+        return obj in self._object_to_key
+
+    def __len__(self) -> int:
+        return len(self._object_to_key)
+
+    def __iter__(self) -> Iterator[UMLObject]:
+        return iter(self._object_to_key)
+
+    def add(self, obj: UMLObject, package_id: Optional[str] = None) -> None:
+        if obj in self._object_to_key:
+            return
+
+        name = getattr(obj, "name", None)
+        self._object_to_key[obj] = (name, package_id)
+        if obj.id is not None:
+            self._by_id[obj.id] = obj
+        if name is not None:
+            self._by_name.setdefault(name, {})[obj] = None
+        self._by_type.setdefault(type(obj), {})[obj] = None
+        if package_id is not None:
+            self._by_package.setdefault(package_id, {})[obj] = None
+
+    def remove(self, obj: UMLObject) -> None:
+        if (key := self._object_to_key.pop(obj, None)) is None:
+            return
+
+        name, package_id = key
+        if obj.id is not None and self._by_id.get(obj.id) is obj:
+            del self._by_id[obj.id]
+        if name is not None:
+            self._discard(self._by_name, name, obj)
+        self._discard(self._by_type, type(obj), obj)
+        if package_id is not None:
+            self._discard(self._by_package, package_id, obj)
+
+    def rekey(self, obj: UMLObject, old_id: Optional[str]) -> None:
+        """
+        Indexes the object under its new ID.
+        """
+        if obj not in self._object_to_key:
+            return
+        if old_id is not None and self._by_id.get(old_id) is obj:
+            del self._by_id[old_id]
+        if obj.id is not None:
+            self._by_id[obj.id] = obj
+
+    def add_package(self, package_id: str, name: Optional[str]) -> None:
+        self._package_names[package_id] = name or ""
+
+    def package_names(self) -> dict[str, str]:
+        """
+        Returns package ID -> package name of all known packages.
+        """
+        return dict(self._package_names)
+
+    def get_by_id(self, object_id: str) -> Optional[UMLObject]:
+        return self._by_id.get(object_id)
+
+    def find_by_name(self, name: str) -> list[UMLObject]:
+        return list(self._by_name.get(name, ()))
+
+    def elements_of_type(self, cls: type[T]) -> list[T]:
+        """
+        Returns objects of the given class, including its subclasses.
+        """
+        return [
+            obj
+            for obj_type, objs in self._by_type.items()
+            if issubclass(obj_type, cls)
+            for obj in objs
+        ]
+
+    def elements_in_package(self, package: str) -> list[UMLObject]:
+        """
+        :arg package - ID or name of the package. Elements of all packages
+            with the given name are returned, if no package has such ID.
+        """
+        if package in self._package_names:
+            return list(self._by_package.get(package, ()))
+        return [
+            obj
+            for package_id, name in self._package_names.items()
+            if name == package
+            for obj in self._by_package.get(package_id, ())
+        ]
+
+    def package_of(self, obj: UMLObject) -> Optional[str]:
+        """
+        Returns the ID of the package the object is placed in, if known.
+        """
+        key = self._object_to_key.get(obj)
+        return None if key is None else key[1]
+
+    def add_reachable(
+        self,
+        objects: Iterable[UMLObject],
+        package_ids: Optional[dict[str, str]] = None,
+    ) -> list[ClassDiagramElement]:
+        """
+        Adds the objects together with the relationships, and their ends,
+        reachable from them. Returns the class diagram elements added.
+
+        :arg package_ids - object ID -> ID of the package the object is placed in.
+        """
+        package_ids = package_ids or {}
+        added: list[ClassDiagramElement] = []
+
+        def add(obj: UMLObject) -> None:
+            if obj not in self._object_to_key:
+                self.add(obj, package_ids.get(obj.id))
+                if isinstance(obj, ClassDiagramElement):
+                    added.append(obj)
+
+        for obj in objects:
+            if isinstance(obj, (ClassDiagramElement, ClassRelationship)):
+                add(obj)
+            if isinstance(obj, ClassRelationship):
+                for end in (obj.source, obj.target):
+                    if end is not None:
+                        add(end)
+
+        # Elements list grows while iterating, adding the other ends of relationships.
+        position = 0
+        while position < len(added):
+            elem = added[position]
+            position += 1
+            for rels in (elem.relations_to, elem.relations_from):
+                for rel in rels:
+                    add(rel)
+                    for end in (rel.source, rel.target):
+                        if end is not None:
+                            add(end)
+        return added
+
+    def _discard(self, buckets: dict, key, obj: UMLObject) -> None:
+        if (bucket := buckets.get(key)) is not None:
+            bucket.pop(obj, None)
+            if not bucket:
+                del buckets[key]
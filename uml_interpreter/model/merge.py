@@ -0,0 +1,161 @@
+"""
+Merging of UML Models
+
+Objects of the merged models are unified by their IDs: for each ID one instance
+survives (chosen by the conflict policy), relationships of the other instances
+are moved to it, and duplicated relationships are detached. References left
+unresolved in one model are resolved with the elements of the others.
+All steps take time linear in the total size of the models.
+
+The module includes the following:
+- ConflictPolicy
+- merge_models
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Callable, Iterable, Union
+
+from uml_interpreter.model.abstract import UMLObject
+from uml_interpreter.model.diagrams.abstract import UMLDiagram
+from uml_interpreter.model.diagrams.class_diagram import (
+    ClassDiagram,
+    ClassDiagramElement,
+    ClassRelationship,
+)
+from uml_interpreter.model.errors import MergeConflictError
+from uml_interpreter.model.utils import paused_gc
+
+if TYPE_CHECKING:
+    from uml_interpreter.model.model import RelationshipEnd, UMLModel
+
+ConflictPolicy = Union[str, Callable[[UMLObject, UMLObject], UMLObject]]
+"""
+Chooses the surviving one of two objects with the same ID:
+- "first" - object of the model given earlier,
+- "last" - object of the model given later,
+- "error" - raises MergeConflictError,
+- function called with the object met earlier and the one met later,
+  returning the surviving one.
+"""
+
+
+def _policy_function(on_conflict: ConflictPolicy) -> Callable[[UMLObject, UMLObject], UMLObject]:
+    if callable(on_conflict):
+        return on_conflict
+    if on_conflict == "first":
+        return lambda existing, _: existing
+    if on_conflict == "last":
+        return lambda _, incoming: incoming
+    if on_conflict == "error":
+
+        def raise_conflict(existing: UMLObject, incoming: UMLObject) -> UMLObject:
+            raise MergeConflictError(f"Models contain more than one object with ID {existing.id}.")
+
+        return raise_conflict
+    raise ValueError(f"Unknown conflict policy: {on_conflict}")
+
+
+def merge_models(models: Iterable[UMLModel], on_conflict: ConflictPolicy = "first") -> UMLModel:
+    """
+    Returns a model uniting the objects and concatenating the diagrams of the models.
+    Objects of the models are moved to the merged model (frozen models are thawed
+    first), so the models shouldn't be used afterwards - unless the conflict policy
+    raises, which leaves them unchanged.
+
+    :arg on_conflict - policy choosing the survivor of objects with the same ID,
+        see ConflictPolicy.
+    """
+    with paused_gc():
+        return _merge_models(models, _policy_function(on_conflict))
+
+
+def _merge_models(
+    models: Iterable[UMLModel], resolve: Callable[[UMLObject, UMLObject], UMLObject]
+) -> UMLModel:
+    from uml_interpreter.model.model import UMLModel
+
+    models = [model.thaw() if model.frozen else model for model in models]
+
+    survivors: dict[str, UMLObject] = {}
+    """
+    ID -> surviving object.
+    """
+    objects: dict[UMLObject, None] = {}
+    """
+    All objects of the models, in the order of the models.
+    """
+    package_ids: dict[str, str] = {}
+    package_names: dict[str, str] = {}
+    replaced: dict[UMLObject, UMLObject] = {}
+    """
+    Object which didn't survive -> object of the same ID which did.
+    """
+
+    # Conflicts are resolved (and raised) before any of the models is changed.
+    for model in models:
+        index = model.index
+        for package_id, name in index.package_names().items():
+            package_names.setdefault(package_id, name)
+        for obj in index:
+            objects[obj] = None
+            if obj.id is None:
+                continue
+            if (package_id := index.package_of(obj)) is not None:
+                package_ids.setdefault(obj.id, package_id)
+            if (existing := survivors.get(obj.id)) is None:
+                survivors[obj.id] = obj
+                continue
+            if isinstance(existing, ClassDiagramElement) != isinstance(obj, ClassDiagramElement):
+                raise MergeConflictError(
+                    f"ID {obj.id} is shared by an element and a relationship."
+                )
+            survivor = resolve(existing, obj)
+            loser = obj if survivor is existing else existing
+            survivors[obj.id] = survivor
+            replaced[loser] = survivor
+
+    # Merged model adopts the elements, once its index is built.
+    for obj in objects:
+        if isinstance(obj, ClassDiagramElement):
+            obj._model = None
+
+    # Duplicated relationships are detached, before relationships of the elements
+    # which didn't survive are moved to their survivors.
+    for loser in replaced:
+        if isinstance(loser, ClassRelationship):
+            loser.detach()
+    for loser, survivor in replaced.items():
+        if isinstance(loser, ClassDiagramElement):
+            for rel in list(loser.relations_to):
+                rel.source = survivor
+            for rel in list(loser.relations_from):
+                rel.target = survivor
+
+    unresolved: dict[str, list[RelationshipEnd]] = {}
+    for model in models:
+        for ref_id, ends in model.unresolved_references.items():
+            target = survivors.get(ref_id)
+            for rel, side in ends:
+                if rel in replaced:
+                    continue
+                if isinstance(target, ClassDiagramElement):
+                    setattr(rel, side, target)
+                else:
+                    unresolved.setdefault(ref_id, []).append((rel, side))
+
+    diagrams: list[UMLDiagram] = []
+    for model in models:
+        for diagram in model.diagrams:
+            if isinstance(diagram, ClassDiagram):
+                diagram.elements = list(
+                    dict.fromkeys(replaced.get(elem, elem) for elem in diagram.elements)
+                )
+            diagrams.append(diagram)
+
+    merged = UMLModel(diagrams=diagrams)
+    merged.seed_index(
+        [obj for obj in objects if obj not in replaced], package_ids, package_names
+    )
+    merged.unresolved_references = unresolved
+    return merged
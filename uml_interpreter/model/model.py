@@ -1,18 +1,344 @@
-from typing import Optional
+from collections.abc import Mapping, Sequence
+from itertools import chain
+from typing import Any, Callable, Iterable, Optional, TextIO, TypeVar, Union
 
 from uml_interpreter.visitor.model_visitor import ModelPrinter, ModelVisitor
+from uml_interpreter.visitor.walker import ModelWalk
 from uml_interpreter.model.diagrams.abstract import UMLDiagram
+from uml_interpreter.model.diagrams.class_diagram import (
+    ClassDiagram,
+    ClassDiagramElement,
+    ClassRelationship,
+)
 from uml_interpreter.model.abstract import UMLObject
+from uml_interpreter.model.errors import FrozenModelError
+from uml_interpreter.model.frozen import _ReadOnly, freeze_model, is_frozen, thaw_model
+from uml_interpreter.model.graph import ModelGraph
+from uml_interpreter.model.index import ModelIndex
+from uml_interpreter.model.merge import ConflictPolicy, merge_models
+from uml_interpreter.model.state import get_model_state, set_model_state
+from uml_interpreter.model.snapshot import ModelSnapshot, save_snapshot
+from uml_interpreter.model.utils import paused_gc
+
+
+class LazyDiagrams(Sequence):
+    """
+    Sequence of diagrams, each built on its first access.
+    """
+
+    def __init__(self, names: list[str], load: Callable[[int], UMLDiagram]) -> None:
+        """
+        :arg names - names of the diagrams, known before they are built.
+        :arg load - function building the diagram at given position.
+        """
+        self._names = names
+        self._load = load
+        self._diagrams: list[Optional[UMLDiagram]] = [None] * len(names)
+
+    @property
+    def names(self) -> list[str]:
+        return list(self._names)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __getitem__(self, index: Union[int, slice]) -> Any:
+        if isinstance(index, slice):
+            return [self[position] for position in range(*index.indices(len(self)))]
+
+        if (diagram := self._diagrams[index]) is None:
+            diagram = self._diagrams[index] = self._load(index % len(self))
+        return diagram
+
+    def by_name(self, name: str) -> Optional[UMLDiagram]:
+        """
+        Returns the first diagram with the given name, building only that diagram.
+        """
+        try:
+            return self[self._names.index(name)]
+        except ValueError:
+            return None
+
+    def is_loaded(self, index: int) -> bool:
+        return self._diagrams[index] is not None
+
+
+T = TypeVar("T")
+
+RelationshipEnd = tuple[ClassRelationship, str]
+"""
+Relationship and the name of its side ("source" or "target").
+"""
 
 
 class UMLModel(UMLObject):
+    _child_fields = ("diagrams",)
+
     def __init__(self, diagrams=None, filename=None) -> None:
         super().__init__()
         self.diagrams: list[UMLDiagram] = diagrams or []
         self.filename: Optional[str] = filename
+        self._index: Optional[ModelIndex] = None
+        self._index_seed: tuple[Iterable[UMLObject], Mapping[str, str], Mapping[str, str]] = (
+            (),
+            {},
+            {},
+        )
+        """
+        Objects, object ID -> package ID and package ID -> package name mappings
+        the index is built from (besides the objects reachable from the diagrams).
+        """
+        self._graph: Optional[ModelGraph] = None
+        self.unresolved_references: dict[str, list[RelationshipEnd]] = {}
+        """
+        ID referred to, but not matching any of the model's elements -> ends
+        of the relationships left dangling (e.g. referring to another export).
+        """
+
+    @property
+    def index(self) -> ModelIndex:
+        """
+        Lookup indexes of the model's class diagram elements and relationships,
+        built on first access from the seeded objects and the objects reachable
+        from the diagrams (all diagrams of lazily loaded models are built).
+        Relationships added to the indexed elements are indexed
+        together with their ends.
+        """
+        if self._index is None:
+            self._index = self._build_index()
+        return self._index
+
+    @property
+    def graph(self) -> ModelGraph:
+        """
+        Graph analyses (closures, inheritance chains, cycles, strongly connected
+        components, topological order) of the indexed class diagram elements.
+        Results are memoized until relationships are added to or removed from
+        the indexed elements.
+        """
+        if self._graph is None:
+            self._graph = ModelGraph(self)
+        return self._graph
+
+    def seed_index(
+        self,
+        objects: Iterable[UMLObject],
+        package_ids: Optional[Mapping[str, str]] = None,
+        package_names: Optional[Mapping[str, str]] = None,
+    ) -> None:
+        """
+        Sets the objects (e.g. all the objects built by the deserializer,
+        including those not placed on any diagram) the index is built from.
+
+        :arg package_ids - object ID -> ID of the package the object is placed in.
+        :arg package_names - package ID -> package name.
+        """
+        self._index_seed = (
+            objects,
+            {} if package_ids is None else package_ids,
+            {} if package_names is None else package_names,
+        )
+        self._index = None
+        self._invalidate_graph()
+
+    def reindex(self) -> ModelIndex:
+        """
+        Rebuilds the index, e.g. after the indexed objects were renamed.
+        """
+        self._index = None
+        self._invalidate_graph()
+        return self.index
+
+    def update_index(
+        self, removed: Iterable[UMLObject] = (), added: Iterable[UMLObject] = ()
+    ) -> None:
+        """
+        Updates the index, if it's built, with the objects removed from and added
+        to the model. Objects given as both removed and added are reindexed
+        in the same package.
+        """
+        if (index := self._index) is None:
+            return
+
+        self._invalidate_graph()
+        removed = list(removed)
+        package_ids = {obj.id: index.package_of(obj) for obj in removed}
+        for obj in removed:
+            index.remove(obj)
+            if isinstance(obj, ClassDiagramElement) and obj._model is self:
+                obj._model = None
+        self._adopt(index.add_reachable(added, package_ids))
+
+    def get_by_id(self, object_id: str) -> Optional[UMLObject]:
+        return self.index.get_by_id(object_id)
+
+    def find_by_name(self, name: str) -> list[UMLObject]:
+        return self.index.find_by_name(name)
+
+    def elements_of_type(self, cls: type[T]) -> list[T]:
+        return self.index.elements_of_type(cls)
+
+    def elements_in_package(self, package: str) -> list[UMLObject]:
+        return self.index.elements_in_package(package)
+
+    def _build_index(self) -> ModelIndex:
+        index = ModelIndex()
+        objects, package_ids, package_names = self._index_seed
+        for package_id, name in package_names.items():
+            index.add_package(package_id, name)
+
+        diagram_elements = (
+            elem
+            for diagram in self.diagrams
+            if isinstance(diagram, ClassDiagram)
+            for elem in diagram.elements
+        )
+        # Index's buckets are allocated in bulk.
+        with paused_gc():
+            self._adopt(index.add_reachable(chain(objects, diagram_elements), package_ids))
+        return index
+
+    def _adopt(self, elements: list[ClassDiagramElement]) -> None:
+        """
+        Makes the indexed elements notify the model about their new relationships.
+        """
+        for elem in elements:
+            elem._model = self
+
+    def _on_id_changed(self, obj: UMLObject, old_id: Optional[str]) -> None:
+        if self._index is not None:
+            self._index.rekey(obj, old_id)
+
+    def _on_relationship_added(self, relationship: ClassRelationship) -> None:
+        if self._index is not None:
+            self._adopt(self._index.add_reachable((relationship,)))
+        self._invalidate_graph()
+
+    def _on_relationship_removed(self, relationship: ClassRelationship) -> None:
+        if self._index is not None:
+            self._index.remove(relationship)
+        self._invalidate_graph()
+
+    def _invalidate_graph(self) -> None:
+        if self._graph is not None:
+            self._graph.invalidate()
+
+    def get_diagram(self, name: str) -> Optional[UMLDiagram]:
+        """
+        Returns the first diagram with the given name.
+        Diagrams of lazily loaded models are not built apart from the returned one.
+        """
+        if isinstance(self.diagrams, LazyDiagrams):
+            return self.diagrams.by_name(name)
+        return next((diagram for diagram in self.diagrams if diagram.name == name), None)
+
+    @classmethod
+    def merge(cls, *models: "UMLModel", on_conflict: ConflictPolicy = "first") -> "UMLModel":
+        """
+        Returns a model uniting the objects of the models by their IDs and concatenating
+        their diagrams. Relationships are re-pointed to the surviving elements, and
+        references unresolved in one model are resolved with elements of the others.
+        The models' objects are moved to the merged model.
+
+        :arg on_conflict - "first", "last", "error" or a function choosing
+            the survivor of two objects with the same ID (see model.merge.ConflictPolicy).
+        """
+        return merge_models(models, on_conflict)
+
+    @property
+    def frozen(self) -> bool:
+        return is_frozen(self)
+
+    def freeze(self) -> "UMLModel":
+        """
+        Returns an immutable copy of the model, leaving the model itself mutable
+        (frozen models are returned as they are). Setting any attribute of the copy
+        or changing its relationships raises FrozenModelError, so it can be read
+        by many threads without locking.
+        """
+        return freeze_model(self)
+
+    def thaw(self) -> "UMLModel":
+        """
+        Returns a mutable copy of the model, leaving the model itself intact.
+        Copies of frozen models share their structure, and copy objects' attributes
+        on their first access (see model.frozen.thaw_model).
+        """
+        return thaw_model(self)
+
+    def save_snapshot(self, path: str) -> None:
+        """
+        Saves the model's class diagrams as a binary snapshot (see model.snapshot),
+        which can be opened by many processes sharing one copy of it.
+        """
+        save_snapshot(self, path)
+
+    @staticmethod
+    def open_snapshot(path: str) -> "UMLModel":
+        """
+        Returns the model of the snapshot file, mapped read-only into memory.
+        Its objects are read-only proxies of the snapshot's records.
+        """
+        return ModelSnapshot.open(path).model()
 
     def accept(self, visitor: ModelVisitor):
-        visitor.visit_model(self)
+        """
+        Visits the model - and all its objects, if the visitor is walked
+        (see ModelVisitor).
+        """
+        if getattr(visitor, "walked", False):
+            return visitor.walk(self)
+        return visitor.visit_model(self)
+
+    def walk(self, events: bool = False) -> ModelWalk:
+        """
+        Returns an iterator over the model and all its objects, depth first,
+        yielding (depth, object) pairs - or (event, depth, object) triples
+        with ENTER/LEAVE events, if events is set. Children of the object
+        yielded last are skipped by calling prune() of the iterator.
+        """
+        return ModelWalk(self, events)
+
+    def print(self, indent: int = 0, indent_inc: int = 2, stream: Optional[TextIO] = None):
+        """
+        Prints the model's hierarchical structure to the stream (sys.stdout by default).
+        """
+        ModelPrinter(indent, indent_inc, stream).write(self)
+
+    def __getstate__(self) -> dict[str, Any]:
+        """
+        Model is pickled as flat tables of records (see model.state), as pickling
+        its cyclic object graph directly recurses along chains of relationships.
+        """
+        return get_model_state(self)
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        set_model_state(self, state)
+
+
+class SnapshotModel(_ReadOnly, UMLModel):
+    """
+    Model of a snapshot's proxies (see model.snapshot), frozen apart from
+    its index and graph built on first access. thaw() returns a mutable model,
+    copying the proxies' fields on their first access.
+    """
+
+    _WRITABLE = frozenset({"_index", "_graph"})
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name not in self._WRITABLE:
+            raise FrozenModelError(
+                f"Can't set {name} of {type(self).__name__}, it's a model snapshot."
+            )
+        object.__setattr__(self, name, value)
+
+    def __delattr__(self, name: str) -> None:
+        raise FrozenModelError(
+            f"Can't delete {name} of {type(self).__name__}, it's a model snapshot."
+        )
 
-    def print(self, indent: int = 0, indent_inc: int = 2):
-        self.accept(ModelPrinter(indent, indent_inc))
+    def __reduce_ex__(self, protocol: int) -> Any:
+        raise TypeError(
+            f"Can't pickle {type(self).__name__}, models are shared "
+            f"by pickling their ModelSnapshot instead."
+        )
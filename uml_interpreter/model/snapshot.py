@@ -0,0 +1,748 @@
+"""
+Binary snapshots of UML Models
+
+A snapshot stores the model's class diagrams as a table of UTF-8 strings and
+tables of fixed-width records (elements, relationships, attributes, methods,
+parameters, diagrams), in which objects refer to each other and to strings by
+their numbers. Snapshot files are read through a read-only memory map without
+being copied: records are unpacked only when the objects are accessed, by lazy
+proxies exposing the API of ClassDiagram, ClassDiagramElement etc. Processes
+opening the same file share one physical copy of it (the page cache), each
+keeping only the proxies of the objects it reads.
+
+The module includes the following:
+- SNAPSHOT_VERSION
+- write_snapshot
+- save_snapshot
+- ModelSnapshot
+"""
+
+from __future__ import annotations
+
+import logging
+import mmap
+import sys
+from array import array
+from collections.abc import Sequence
+from itertools import chain
+from struct import Struct
+from typing import TYPE_CHECKING, Any, BinaryIO, Callable, Optional, Union
+
+from uml_interpreter.model.diagrams.class_diagram import (
+    ClassDiagram,
+    ClassDiagramAttribute,
+    ClassDiagramClass,
+    ClassDiagramElement,
+    ClassDiagramInterface,
+    ClassDiagramMethod,
+    ClassDiagramMethodParameter,
+    ClassRelationship,
+    Multiplicity,
+    RelationshipType,
+)
+from uml_interpreter.model.diagrams.sequence_diagram import Timeline
+from uml_interpreter.model.errors import FrozenModelError
+from uml_interpreter.model.frozen import FrozenRelationshipSet, _ReadOnly, mutable_class
+from uml_interpreter.model.state import _collect_elements
+from uml_interpreter.model.utils import paused_gc
+
+if TYPE_CHECKING:
+    from uml_interpreter.model.model import UMLModel
+
+SNAPSHOT_VERSION = 1
+"""
+Version of the snapshot layout, changed whenever records' structure changes.
+"""
+
+_MAGIC = b"UMLSNAP\x00"
+
+_SECTIONS = (
+    "string_offsets",
+    "string_data",
+    "elements",
+    "relationships",
+    "attributes",
+    "methods",
+    "parameters",
+    "diagrams",
+    "diagram_elements",
+    "relationship_refs",
+    "unresolved",
+    "packages",
+    "package_names",
+)
+"""
+Sections of the snapshot, in the order of the file. The header holds
+the offset and the number of items of each section.
+"""
+
+_HEADER = Struct("<8sIIii" + "QQ" * len(_SECTIONS))
+"""
+Magic, version, padding, model's ID and filename, (offset, count) of each section.
+"""
+
+_NO_STRING = -1
+_NO_OBJECT = -1
+
+# Records start with the object's ID and name, the other fields follow.
+_ELEMENT = Struct("<iiBxxx8I")
+"""
+ID, name, kind (see _ELEMENT_CLASSES), (start, count) in relationship_refs
+of relations_to and of relations_from, (start, count) of attributes and of methods.
+"""
+_RELATIONSHIP = Struct("<iiBxxx8i")
+"""
+ID, name, type (see _RELATIONSHIP_TYPES), element, role, lower and upper
+multiplicity of the source side, the same of the target side.
+"""
+_ATTRIBUTE = Struct("<iiii")
+"""
+ID, name, type, initial value.
+"""
+_METHOD = Struct("<iiiII")
+"""
+ID, name, return type, (start, count) of parameters.
+"""
+_PARAMETER = Struct("<iiii")
+"""
+ID, name, type, default value.
+"""
+_DIAGRAM = Struct("<iiII")
+"""
+ID, name, (start, count) in diagram_elements.
+"""
+_UNRESOLVED = Struct("<iIBxxx")
+"""
+ID referred to, relationship, side (0 - source, 1 - target).
+"""
+_PAIR = Struct("<ii")
+"""
+(object ID, package ID) of packages, (package ID, package name) of package_names.
+"""
+
+_REF_TYPECODE = "I"
+"""
+Typecode of the arrays of object numbers (unsigned 32-bit).
+"""
+
+_ELEMENT_CLASSES = (ClassDiagramElement, ClassDiagramClass, ClassDiagramInterface)
+_RELATIONSHIP_TYPES = tuple(RelationshipType)
+_SIDES = ("source", "target")
+_ALIGNMENT = 8
+
+
+class _StringTable:
+    """
+    Numbers the distinct strings written to the snapshot.
+    """
+
+    def __init__(self) -> None:
+        self._numbers: dict[str, int] = {}
+        self.offsets = array(_REF_TYPECODE, [0])
+        self.data = bytearray()
+
+    def __call__(self, value: Optional[str]) -> int:
+        if value is None:
+            return _NO_STRING
+        if type(value) is not str:
+            raise ValueError(
+                f"Can't store {value!r} in a model snapshot, only strings and None are stored."
+            )
+        if (number := self._numbers.get(value)) is None:
+            number = self._numbers[value] = len(self._numbers)
+            self.data += value.encode("utf-8")
+            self.offsets.append(len(self.data))
+        return number
+
+
+def write_snapshot(model: UMLModel, stream: BinaryIO) -> None:
+    """
+    Writes the snapshot of the model's class diagrams to the binary stream.
+    Diagrams of other kinds are left out. Values of attributes and parameters
+    have to be strings (or None).
+    """
+    with paused_gc():
+        _write_snapshot(model, stream)
+
+
+def save_snapshot(model: UMLModel, path: str) -> None:
+    with open(path, "wb") as stream:
+        write_snapshot(model, stream)
+
+
+def _write_snapshot(model: UMLModel, stream: BinaryIO) -> None:
+    diagrams = []
+    for diagram in model.diagrams:
+        if isinstance(diagram, ClassDiagram):
+            diagrams.append(diagram)
+        else:
+            logging.log(
+                logging.INFO,
+                f"Diagram {diagram.name} isn't a class diagram, it's left out of the snapshot.",
+            )
+
+    # Index holds the objects seeded by the deserializer, also those on no diagram.
+    indexed = list(model.index)
+    elem_indices, elems, rel_indices, rels = _collect_elements(
+        diagrams,
+        chain(
+            (rel for ends in model.unresolved_references.values() for rel, _ in ends),
+            (obj for obj in indexed if isinstance(obj, ClassRelationship)),
+        ),
+        (obj for obj in indexed if isinstance(obj, ClassDiagramElement)),
+    )
+    string = _StringTable()
+    relationship_refs = array(_REF_TYPECODE)
+    attributes: list[bytes] = []
+    methods: list[bytes] = []
+    parameters: list[bytes] = []
+
+    elements: list[bytes] = []
+    for elem in elems:
+        try:
+            kind = _ELEMENT_CLASSES.index(mutable_class(type(elem)))
+        except ValueError:
+            raise ValueError(f"Can't store {type(elem).__name__} in a model snapshot.") from None
+        to_start = len(relationship_refs)
+        relationship_refs.extend(rel_indices[id(rel)] for rel in elem.relations_to)
+        from_start = len(relationship_refs)
+        relationship_refs.extend(rel_indices[id(rel)] for rel in elem.relations_from)
+        attr_start, meth_start = len(attributes), len(methods)
+        for attr in elem.attributes:
+            attributes.append(
+                _ATTRIBUTE.pack(
+                    string(attr.id), string(attr.name), string(attr.type), string(attr.init_value)
+                )
+            )
+        for meth in elem.methods:
+            param_start = len(parameters)
+            for param in meth.parameters:
+                parameters.append(
+                    _PARAMETER.pack(
+                        string(param.id),
+                        string(param.name),
+                        string(param.type),
+                        string(param.default_value),
+                    )
+                )
+            methods.append(
+                _METHOD.pack(
+                    string(meth.id),
+                    string(meth.name),
+                    string(meth.ret_type),
+                    param_start,
+                    len(meth.parameters),
+                )
+            )
+        elements.append(
+            _ELEMENT.pack(
+                string(elem.id),
+                string(elem.name),
+                kind,
+                to_start,
+                from_start - to_start,
+                from_start,
+                len(relationship_refs) - from_start,
+                attr_start,
+                len(elem.attributes),
+                meth_start,
+                len(elem.methods),
+            )
+        )
+
+    def side_fields(side: ClassRelationship.RelationshipSide) -> tuple[int, int, int, int]:
+        lower, upper = side.min_max_multiplicity
+        element = _NO_OBJECT if side.element is None else elem_indices[id(side.element)]
+        return element, string(side.role), string(lower), string(upper)
+
+    relationships = [
+        _RELATIONSHIP.pack(
+            string(rel.id),
+            string(rel.name),
+            _RELATIONSHIP_TYPES.index(rel.type),
+            *side_fields(rel.source_side),
+            *side_fields(rel.target_side),
+        )
+        for rel in rels
+    ]
+
+    diagram_elements = array(_REF_TYPECODE)
+    diagram_records = []
+    for diagram in diagrams:
+        diagram_records.append(
+            _DIAGRAM.pack(
+                string(diagram.id), string(diagram.name), len(diagram_elements), len(diagram.elements)
+            )
+        )
+        diagram_elements.extend(elem_indices[id(elem)] for elem in diagram.elements)
+
+    unresolved = [
+        _UNRESOLVED.pack(string(ref_id), rel_indices[id(rel)], _SIDES.index(side))
+        for ref_id, ends in model.unresolved_references.items()
+        for rel, side in ends
+    ]
+
+    index = model.index
+    packages = [
+        _PAIR.pack(string(obj.id), string(package_id))
+        for obj in (*elems, *rels)
+        if obj.id is not None and (package_id := index.package_of(obj)) is not None
+    ]
+    package_names = [
+        _PAIR.pack(string(package_id), string(name))
+        for package_id, name in index.package_names().items()
+    ]
+    model_id, filename = string(model.id), string(model.filename)
+
+    sections: list[tuple[Union[bytes, bytearray, array, list[bytes]], int]] = [
+        (string.offsets, len(string.offsets) - 1),
+        (string.data, len(string.data)),
+        (elements, len(elements)),
+        (relationships, len(relationships)),
+        (attributes, len(attributes)),
+        (methods, len(methods)),
+        (parameters, len(parameters)),
+        (diagram_records, len(diagram_records)),
+        (diagram_elements, len(diagram_elements)),
+        (relationship_refs, len(relationship_refs)),
+        (unresolved, len(unresolved)),
+        (packages, len(packages)),
+        (package_names, len(package_names)),
+    ]
+
+    # Sections are aligned, so that arrays of numbers can be cast in place.
+    contents: list[bytes] = []
+    locations: list[int] = []
+    offset = _HEADER.size
+    for section, count in sections:
+        content = b"".join(section) if isinstance(section, list) else bytes(section)
+        padding = -offset % _ALIGNMENT
+        contents.append(b"\x00" * padding + content)
+        offset += padding
+        locations += (offset, count)
+        offset += len(content)
+
+    stream.write(_HEADER.pack(_MAGIC, SNAPSHOT_VERSION, 0, model_id, filename, *locations))
+    for content in contents:
+        stream.write(content)
+
+
+class _SnapshotObject(_ReadOnly):
+    """
+    Read-only proxy of a snapshot's record. Records begin with the object's ID and name.
+    """
+
+    __slots__ = ()
+    _WRITABLE = frozenset({"_model"})
+    """
+    Back references to the model indexing the object, set by the model's index.
+    """
+    _FIELDS: tuple[str, ...] = ("_id", "name")
+    """
+    Attributes of the proxied class, read from the proxy's properties named
+    alike (without the leading underscore) when the proxy is thawed.
+    """
+
+    def __init__(self, snapshot: ModelSnapshot, record: tuple) -> None:
+        object.__setattr__(self, "_snapshot", snapshot)
+        object.__setattr__(self, "_record", record)
+        object.__setattr__(self, "_values", {})
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name not in self._WRITABLE:
+            raise FrozenModelError(
+                f"Can't set {name} of {type(self).__name__}, it's a part of a model snapshot."
+            )
+        object.__setattr__(self, name, value)
+
+    def __delattr__(self, name: str) -> None:
+        raise FrozenModelError(
+            f"Can't delete {name} of {type(self).__name__}, it's a part of a model snapshot."
+        )
+
+    def __reduce_ex__(self, protocol: int) -> Any:
+        raise TypeError(
+            f"Can't pickle {type(self).__name__}, models are shared "
+            f"by pickling their ModelSnapshot instead."
+        )
+
+    def _thawed_attribute(self, name: str) -> Any:
+        return getattr(self, name.lstrip("_"))
+
+    def _cached(self, name: str, build: Callable[[], Any]) -> Any:
+        """
+        Returns the value of the property (a collection of other proxies),
+        built on its first access and kept by the proxy.
+        """
+        if (value := self._values.get(name)) is None:
+            value = self._values[name] = build()
+        return value
+
+    @property
+    def id(self) -> Optional[str]:
+        return self._snapshot.string(self._record[0])
+
+    @property
+    def name(self) -> Optional[str]:
+        return self._snapshot.string(self._record[1])
+
+
+class _SnapshotElement(_SnapshotObject):
+    __slots__ = ()
+    _FIELDS = (
+        *_SnapshotObject._FIELDS,
+        "relations_to",
+        "relations_from",
+        "attributes",
+        "methods",
+        "messages_from",
+        "messages_to",
+        "events",
+    )
+
+    def __init__(self, snapshot: ModelSnapshot, record: tuple) -> None:
+        super().__init__(snapshot, record)
+        object.__setattr__(self, "_model", None)
+
+    @property
+    def relations_to(self) -> FrozenRelationshipSet:
+        return self._cached("relations_to", lambda: self._relationships(3))
+
+    @property
+    def relations_from(self) -> FrozenRelationshipSet:
+        return self._cached("relations_from", lambda: self._relationships(5))
+
+    def _relationships(self, position: int) -> FrozenRelationshipSet:
+        start, count = self._record[position : position + 2]
+        return FrozenRelationshipSet(self._snapshot._related(start, count))
+
+    @property
+    def attributes(self) -> tuple[ClassDiagramAttribute, ...]:
+        start, count = self._record[7:9]
+        return self._cached(
+            "attributes", lambda: tuple(map(self._snapshot.attribute, range(start, start + count)))
+        )
+
+    @property
+    def methods(self) -> tuple[ClassDiagramMethod, ...]:
+        start, count = self._record[9:11]
+        return self._cached(
+            "methods", lambda: tuple(map(self._snapshot.method, range(start, start + count)))
+        )
+
+    @property
+    def messages_from(self) -> tuple:
+        return ()
+
+    @property
+    def messages_to(self) -> tuple:
+        return ()
+
+    @property
+    def events(self) -> Timeline:
+        return Timeline()
+
+
+class SnapshotElement(_SnapshotElement, ClassDiagramElement):
+    __slots__ = ("_snapshot", "_record", "_values")
+
+
+class SnapshotClass(_SnapshotElement, ClassDiagramClass):
+    __slots__ = ("_snapshot", "_record", "_values")
+
+
+class SnapshotInterface(_SnapshotElement, ClassDiagramInterface):
+    __slots__ = ("_snapshot", "_record", "_values")
+
+
+_ELEMENT_PROXIES = (SnapshotElement, SnapshotClass, SnapshotInterface)
+"""
+Proxy classes of _ELEMENT_CLASSES.
+"""
+
+
+class SnapshotRelationship(_SnapshotObject, ClassRelationship):
+    __slots__ = ("_snapshot", "_record", "_values")
+    _FIELDS = (*_SnapshotObject._FIELDS, "type", "_source_side", "_target_side")
+
+    @property
+    def type(self) -> RelationshipType:
+        return _RELATIONSHIP_TYPES[self._record[2]]
+
+    def _side(self, position: int) -> ClassRelationship.RelationshipSide:
+        element, role, lower, upper = self._record[position : position + 4]
+        snapshot = self._snapshot
+        return ClassRelationship.RelationshipSide(
+            None if element == _NO_OBJECT else snapshot.element(element),
+            snapshot.string(role),
+            Multiplicity.of(snapshot.string(lower), snapshot.string(upper)),
+        )
+
+    @property
+    def source_side(self) -> ClassRelationship.RelationshipSide:
+        return self._side(3)
+
+    @property
+    def target_side(self) -> ClassRelationship.RelationshipSide:
+        return self._side(7)
+
+    @property
+    def source(self) -> Optional[ClassDiagramElement]:
+        element = self._record[3]
+        return None if element == _NO_OBJECT else self._snapshot.element(element)
+
+    @property
+    def target(self) -> Optional[ClassDiagramElement]:
+        element = self._record[7]
+        return None if element == _NO_OBJECT else self._snapshot.element(element)
+
+
+class SnapshotAttribute(_SnapshotObject, ClassDiagramAttribute):
+    __slots__ = ("_snapshot", "_record", "_values")
+    _FIELDS = (*_SnapshotObject._FIELDS, "type", "init_value")
+
+    @property
+    def type(self) -> Optional[str]:
+        return self._snapshot.string(self._record[2], intern=True)
+
+    @property
+    def init_value(self) -> Optional[str]:
+        return self._snapshot.string(self._record[3])
+
+
+class SnapshotMethod(_SnapshotObject, ClassDiagramMethod):
+    __slots__ = ("_snapshot", "_record", "_values")
+    _FIELDS = (*_SnapshotObject._FIELDS, "ret_type", "parameters")
+
+    @property
+    def ret_type(self) -> Optional[str]:
+        return self._snapshot.string(self._record[2], intern=True)
+
+    @property
+    def parameters(self) -> tuple[ClassDiagramMethodParameter, ...]:
+        start, count = self._record[3:5]
+        return self._cached(
+            "parameters",
+            lambda: tuple(map(self._snapshot.parameter, range(start, start + count))),
+        )
+
+
+class SnapshotParameter(_SnapshotObject, ClassDiagramMethodParameter):
+    __slots__ = ("_snapshot", "_record", "_values")
+    _FIELDS = (*_SnapshotObject._FIELDS, "type", "default_value")
+
+    @property
+    def type(self) -> Optional[str]:
+        return self._snapshot.string(self._record[2], intern=True)
+
+    @property
+    def default_value(self) -> Optional[str]:
+        return self._snapshot.string(self._record[3])
+
+
+class SnapshotClassDiagram(_SnapshotObject, ClassDiagram):
+    __slots__ = ("_snapshot", "_record", "_values")
+    _FIELDS = (*_SnapshotObject._FIELDS, "elements")
+
+    @property
+    def elements(self) -> tuple[ClassDiagramElement, ...]:
+        snapshot, (_, _, start, count) = self._snapshot, self._record
+        return self._cached(
+            "elements",
+            lambda: tuple(map(snapshot.element, snapshot._diagram_elements[start : start + count])),
+        )
+
+
+class _Proxies(Sequence):
+    """
+    Sequence of the snapshot's objects of one kind, each created on its first access.
+    """
+
+    def __init__(self, count: int, proxy: Callable[[int], Any]) -> None:
+        self._count = count
+        self._proxy = proxy
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, index: Union[int, slice]) -> Any:
+        if isinstance(index, slice):
+            return [self._proxy(number) for number in range(*index.indices(self._count))]
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("snapshot object index out of range")
+        return self._proxy(index)
+
+
+class ModelSnapshot:
+    """
+    Model snapshot read from a buffer (e.g. a memory map of a file written by
+    write_snapshot) without copying it. Objects are created as proxies on their
+    first access and kept, so that each of them has one proxy. Snapshots opened
+    from files are pickled as their paths, so passing one to worker processes
+    makes each of them map the same file, instead of copying the model.
+    """
+
+    def __init__(self, buffer: Any, path: Optional[str] = None) -> None:
+        """
+        :arg buffer - object supporting the buffer protocol, holding the snapshot.
+        :arg path - path of the file the buffer maps, if any.
+        """
+        self.path = path
+        self._mmap: Optional[mmap.mmap] = None
+        self._buffer = buffer = memoryview(buffer)
+        if bytes(buffer[: len(_MAGIC)]) != _MAGIC:
+            raise ValueError("Given data isn't a model snapshot.")
+        _, version, _, self._model_id, self._filename, *locations = _HEADER.unpack_from(buffer)
+        if version != SNAPSHOT_VERSION:
+            raise ValueError(f"Unsupported model snapshot version: {version}")
+
+        self._offsets: dict[str, int] = {}
+        self._counts: dict[str, int] = {}
+        for position, section in enumerate(_SECTIONS):
+            self._offsets[section], self._counts[section] = locations[2 * position : 2 * position + 2]
+
+        self._string_offsets = self._array("string_offsets", 1)
+        self._diagram_elements = self._array("diagram_elements")
+        self._relationship_refs = self._array("relationship_refs")
+        string_data = self._offsets["string_data"]
+        self._string_data = buffer[string_data : string_data + self._counts["string_data"]]
+
+        self._proxies: dict[tuple[str, int], Any] = {}
+        """
+        (section, record number) -> proxy of the record.
+        """
+
+    @classmethod
+    def open(cls, path: str) -> ModelSnapshot:
+        """
+        Maps the snapshot file read-only, its pages are shared by all the processes mapping it.
+        """
+        with open(path, "rb") as file:
+            mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            snapshot = cls(mapping, path)
+        except Exception:
+            mapping.close()
+            raise
+        snapshot._mmap = mapping
+        return snapshot
+
+    def close(self) -> None:
+        """
+        Releases the buffer (and closes the memory map), proxies can't be read afterwards.
+        """
+        for view in (
+            self._string_offsets,
+            self._diagram_elements,
+            self._relationship_refs,
+            self._string_data,
+            self._buffer,
+        ):
+            view.release()
+        if self._mmap is not None:
+            self._mmap.close()
+
+    def __enter__(self) -> ModelSnapshot:
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def __reduce__(self) -> tuple:
+        if self.path is None:
+            raise TypeError("Only snapshots opened from files can be pickled.")
+        return (ModelSnapshot.open, (self.path,))
+
+    def _array(self, section: str, extra: int = 0) -> memoryview:
+        offset = self._offsets[section]
+        size = (self._counts[section] + extra) * array(_REF_TYPECODE).itemsize
+        return self._buffer[offset : offset + size].cast(_REF_TYPECODE)
+
+    def string(self, number: int, intern: bool = False) -> Optional[str]:
+        """
+        Returns the string of the given number from the string table.
+
+        :arg intern - whether to return the interned instance of the string (e.g. type names).
+        """
+        if number == _NO_STRING:
+            return None
+        offsets = self._string_offsets
+        value = str(self._string_data[offsets[number] : offsets[number + 1]], "utf-8")
+        return sys.intern(value) if intern else value
+
+    def _proxy(self, section: str, record: Struct, number: int, proxy: Callable[..., Any]) -> Any:
+        if (obj := self._proxies.get((section, number))) is None:
+            fields = record.unpack_from(self._buffer, self._offsets[section] + number * record.size)
+            obj = self._proxies[(section, number)] = proxy(self, fields)
+        return obj
+
+    def element(self, number: int) -> ClassDiagramElement:
+        if (obj := self._proxies.get(("elements", number))) is not None:
+            return obj
+        return self._proxy(
+            "elements",
+            _ELEMENT,
+            number,
+            lambda snapshot, fields: _ELEMENT_PROXIES[fields[2]](snapshot, fields),
+        )
+
+    def relationship(self, number: int) -> ClassRelationship:
+        return self._proxy("relationships", _RELATIONSHIP, number, SnapshotRelationship)
+
+    def attribute(self, number: int) -> ClassDiagramAttribute:
+        return self._proxy("attributes", _ATTRIBUTE, number, SnapshotAttribute)
+
+    def method(self, number: int) -> ClassDiagramMethod:
+        return self._proxy("methods", _METHOD, number, SnapshotMethod)
+
+    def parameter(self, number: int) -> ClassDiagramMethodParameter:
+        return self._proxy("parameters", _PARAMETER, number, SnapshotParameter)
+
+    def diagram(self, number: int) -> ClassDiagram:
+        return self._proxy("diagrams", _DIAGRAM, number, SnapshotClassDiagram)
+
+    def _related(self, start: int, count: int) -> list[ClassRelationship]:
+        return list(map(self.relationship, self._relationship_refs[start : start + count]))
+
+    @property
+    def elements(self) -> Sequence[ClassDiagramElement]:
+        return _Proxies(self._counts["elements"], self.element)
+
+    @property
+    def relationships(self) -> Sequence[ClassRelationship]:
+        return _Proxies(self._counts["relationships"], self.relationship)
+
+    @property
+    def diagrams(self) -> Sequence[ClassDiagram]:
+        return _Proxies(self._counts["diagrams"], self.diagram)
+
+    def _pairs(self, section: str) -> dict[str, str]:
+        offset = self._offsets[section]
+        return {
+            self.string(first): self.string(second)
+            for first, second in _PAIR.iter_unpack(
+                self._buffer[offset : offset + self._counts[section] * _PAIR.size]
+            )
+        }
+
+    def model(self) -> UMLModel:
+        """
+        Returns a frozen model of the snapshot's proxies. Its index is built from
+        all the snapshot's elements on first access, as for any other model.
+        """
+        from uml_interpreter.model.model import SnapshotModel, UMLModel
+
+        model = UMLModel(diagrams=list(self.diagrams), filename=self.string(self._filename))
+        model.id = self.string(self._model_id)
+        offset = self._offsets["unresolved"]
+        for ref_id, rel, side in _UNRESOLVED.iter_unpack(
+            self._buffer[offset : offset + self._counts["unresolved"] * _UNRESOLVED.size]
+        ):
+            model.unresolved_references.setdefault(self.string(ref_id), []).append(
+                (self.relationship(rel), _SIDES[side])
+            )
+        model.seed_index(self.elements, self._pairs("packages"), self._pairs("package_names"))
+        object.__setattr__(model, "__class__", SnapshotModel)
+        return model
@@ -0,0 +1,344 @@
+"""
+Flat representation of UML Model's state
+
+The model's object graph is cyclic (elements and their relationships refer to
+each other), so pickling it as is recurses along every chain of relationships.
+The functions below replace the object references with indices into flat
+tables of records, which can be pickled without recursion and restored in
+linear time. Diagrams of other kinds (e.g. sequence diagrams) and the sequence
+data of elements (their messages and events) are pickled as they are, in a nested
+pickle referring to the elements, their members and relationships by the indices
+of their records.
+
+The module includes the following:
+- get_model_state
+- set_model_state
+"""
+
+import io
+import pickle
+from itertools import chain
+from typing import IO, Any, Iterable, Optional
+
+from uml_interpreter.model.diagrams.abstract import UMLDiagram
+from uml_interpreter.model.diagrams.class_diagram import (
+    ClassDiagram,
+    ClassDiagramElement,
+    ClassRelationship,
+)
+from uml_interpreter.model.frozen import _freeze_model, is_frozen, mutable_class
+from uml_interpreter.model.utils import paused_gc
+
+STATE_VERSION = 4
+"""
+Version of the state layout, changed whenever records' structure changes.
+"""
+
+
+def _collect_elements(
+    diagrams: list[UMLDiagram],
+    relationships: Iterable[ClassRelationship] = (),
+    elements: Iterable[ClassDiagramElement] = (),
+) -> tuple[dict[int, int], list[ClassDiagramElement], dict[int, int], list[ClassRelationship]]:
+    """
+    Collects all class diagram elements of the diagrams or given, and all relationships
+    (together with their ends) reachable from them or given, assigning indices to each.
+    """
+    elem_indices: dict[int, int] = {}
+    elems: list[ClassDiagramElement] = []
+    rel_indices: dict[int, int] = {}
+    rels: list[ClassRelationship] = []
+
+    def add_element(elem: Optional[ClassDiagramElement]) -> None:
+        if elem is not None and id(elem) not in elem_indices:
+            elem_indices[id(elem)] = len(elems)
+            elems.append(elem)
+
+    def add_relationship(rel: ClassRelationship) -> None:
+        if id(rel) not in rel_indices:
+            rel_indices[id(rel)] = len(rels)
+            rels.append(rel)
+            add_element(rel.source)
+            add_element(rel.target)
+
+    for rel in relationships:
+        add_relationship(rel)
+    for elem in elements:
+        add_element(elem)
+    for diagram in diagrams:
+        if isinstance(diagram, ClassDiagram):
+            for elem in diagram.elements:
+                add_element(elem)
+
+    # Elements list grows while iterating, adding the other ends of relationships.
+    position = 0
+    while position < len(elems):
+        elem = elems[position]
+        position += 1
+        for rels_list in (elem.relations_to, elem.relations_from):
+            for rel in rels_list:
+                add_relationship(rel)
+
+    return elem_indices, elems, rel_indices, rels
+
+
+_Reference = tuple[Any, ...]
+"""
+Kind of the referred object and the indices of its record (and of its position
+in the element's members).
+"""
+
+
+class _SequencePickler(pickle.Pickler):
+    """
+    Pickles sequence data, referring to the objects recorded in the state's tables.
+    """
+
+    def __init__(self, file: IO[bytes], references: dict[int, _Reference]) -> None:
+        """
+        :arg references - object's id -> its reference.
+        """
+        super().__init__(file, pickle.HIGHEST_PROTOCOL)
+        self._references = references
+
+    def persistent_id(self, obj: Any) -> Optional[_Reference]:
+        return self._references.get(id(obj))
+
+
+class _SequenceUnpickler(pickle.Unpickler):
+    def __init__(self, file: IO[bytes], objects: dict[_Reference, Any]) -> None:
+        """
+        :arg objects - reference -> restored object.
+        """
+        super().__init__(file)
+        self._objects = objects
+
+    def persistent_load(self, reference: _Reference) -> Any:
+        return self._objects[reference]
+
+
+def _references(
+    elems: list[ClassDiagramElement], rels: list[ClassRelationship]
+) -> Iterable[tuple[_Reference, Any]]:
+    """
+    Yields the references and the objects recorded in the state's tables.
+    """
+    for elem_index, elem in enumerate(elems):
+        yield ("element", elem_index), elem
+        for member_index, attr in enumerate(elem.attributes):
+            yield ("attribute", elem_index, member_index), attr
+        for member_index, meth in enumerate(elem.methods):
+            yield ("method", elem_index, member_index), meth
+    for rel_index, rel in enumerate(rels):
+        yield ("relationship", rel_index), rel
+
+
+def get_model_state(model: Any) -> dict[str, Any]:
+    """
+    Returns the state of the UMLModel as flat tables of records, in which elements
+    and relationships refer to each other by their indices.
+    """
+    with paused_gc():
+        return _get_model_state(model)
+
+
+def _get_model_state(model: Any) -> dict[str, Any]:
+    # Index holds the objects seeded by the deserializer, also those on no diagram.
+    index = model.index
+    indexed = list(index)
+    elem_indices, elems, rel_indices, rels = _collect_elements(
+        model.diagrams,
+        chain(
+            (rel for ends in model.unresolved_references.values() for rel, _ in ends),
+            (obj for obj in indexed if isinstance(obj, ClassRelationship)),
+        ),
+        (obj for obj in indexed if isinstance(obj, ClassDiagramElement)),
+    )
+
+    elem_records = [
+        (
+            mutable_class(type(elem)),
+            elem.id,
+            elem.name,
+            # Attributes and methods don't refer back to the element,
+            # so they are pickled as they are.
+            elem.attributes,
+            elem.methods,
+            [rel_indices[id(rel)] for rel in elem.relations_to],
+            [rel_indices[id(rel)] for rel in elem.relations_from],
+        )
+        for elem in elems
+    ]
+
+    rel_records = [
+        (
+            mutable_class(type(rel)),
+            rel.type,
+            rel.name,
+            rel.id,
+            -1 if rel.source is None else elem_indices[id(rel.source)],
+            rel.source_side.role,
+            rel.source_side.min_max_multiplicity,
+            -1 if rel.target is None else elem_indices[id(rel.target)],
+            rel.target_side.role,
+            rel.target_side.min_max_multiplicity,
+        )
+        for rel in rels
+    ]
+
+    # Diagrams of other kinds are left to the nested pickle of sequence data.
+    diag_records = [
+        (
+            mutable_class(type(diagram)),
+            diagram.name,
+            diagram.id,
+            [elem_indices[id(elem)] for elem in diagram.elements],
+        )
+        if isinstance(diagram, ClassDiagram)
+        else None
+        for diagram in model.diagrams
+    ]
+    other_diagrams = [
+        diagram for diagram in model.diagrams if not isinstance(diagram, ClassDiagram)
+    ]
+    elem_sequences = {
+        elem_index: (elem.messages_from, elem.messages_to, elem.events)
+        for elem_index, elem in enumerate(elems)
+        if elem.messages_from or elem.messages_to or elem.events
+    }
+    sequences = None
+    if other_diagrams or elem_sequences:
+        stream = io.BytesIO()
+        _SequencePickler(
+            stream, {id(obj): reference for reference, obj in _references(elems, rels)}
+        ).dump((other_diagrams, elem_sequences))
+        sequences = stream.getvalue()
+
+    return {
+        "version": STATE_VERSION,
+        "id": model.id,
+        "filename": model.filename,
+        "elements": elem_records,
+        "relationships": rel_records,
+        "diagrams": diag_records,
+        "sequences": sequences,
+        "unresolved": [
+            (ref_id, [(rel_indices[id(rel)], side) for rel, side in ends])
+            for ref_id, ends in model.unresolved_references.items()
+        ],
+        "index": [
+            (True, elem_indices[id(obj)])
+            if isinstance(obj, ClassDiagramElement)
+            else (False, rel_indices[id(obj)])
+            for obj in indexed
+        ],
+        "packages": {
+            obj.id: package_id
+            for obj in indexed
+            if obj.id is not None and (package_id := index.package_of(obj)) is not None
+        },
+        "package_names": index.package_names(),
+        "frozen": is_frozen(model),
+    }
+
+
+def _restore_elements(state: dict[str, Any]) -> list[ClassDiagramElement]:
+    elems: list[ClassDiagramElement] = []
+    for ElemClass, elem_id, name, attrs, meths, _, _ in state["elements"]:
+        elem = ElemClass(name)
+        elem.id = elem_id
+        elem.attributes = attrs
+        elem.methods = meths
+        elems.append(elem)
+    return elems
+
+
+def _restore_relationships(
+    state: dict[str, Any], elems: list[ClassDiagramElement]
+) -> list[ClassRelationship]:
+    rels: list[ClassRelationship] = []
+    for (
+        RelClass,
+        rel_type,
+        name,
+        rel_id,
+        source_index,
+        source_role,
+        source_minmax,
+        target_index,
+        target_role,
+        target_minmax,
+    ) in state["relationships"]:
+        # Sides are created as placeholders, elements are assigned directly
+        # afterwards to keep the order of elements' relationships as recorded.
+        rel = RelClass(
+            rel_type,
+            name,
+            source_side=ClassRelationship.RelationshipSide(
+                None, source_role, source_minmax
+            ),
+            target_side=ClassRelationship.RelationshipSide(
+                None, target_role, target_minmax
+            ),
+            object_id=rel_id,
+        )
+        if source_index >= 0:
+            rel.source_side.element = elems[source_index]
+        if target_index >= 0:
+            rel.target_side.element = elems[target_index]
+        rels.append(rel)
+    return rels
+
+
+def set_model_state(model: Any, state: dict[str, Any]) -> None:
+    """
+    Restores the UMLModel from the state returned by get_model_state.
+    """
+    if state.get("version") != STATE_VERSION:
+        raise ValueError(f"Unsupported model state version: {state.get('version')}")
+
+    with paused_gc():
+        _set_model_state(model, state)
+
+
+def _set_model_state(model: Any, state: dict[str, Any]) -> None:
+    elems = _restore_elements(state)
+    rels = _restore_relationships(state, elems)
+
+    for elem, elem_record in zip(elems, state["elements"]):
+        elem.relations_to.extend(rels[index] for index in elem_record[5])
+        elem.relations_from.extend(rels[index] for index in elem_record[6])
+
+    other_diagrams: Iterable[UMLDiagram] = ()
+    if (sequences := state["sequences"]) is not None:
+        other_diagrams, elem_sequences = _SequenceUnpickler(
+            io.BytesIO(sequences), dict(_references(elems, rels))
+        ).load()
+        for elem_index, (messages_from, messages_to, events) in elem_sequences.items():
+            elem = elems[elem_index]
+            elem.messages_from, elem.messages_to, elem.events = messages_from, messages_to, events
+    other_diagrams = iter(other_diagrams)
+
+    diagrams: list[UMLDiagram] = []
+    for diag_record in state["diagrams"]:
+        if diag_record is None:
+            diagrams.append(next(other_diagrams))
+            continue
+        DiagClass, name, diag_id, elem_indices = diag_record
+        diagram = DiagClass(name, [elems[index] for index in elem_indices])
+        diagram.id = diag_id
+        diagrams.append(diagram)
+
+    model.__init__(diagrams=diagrams, filename=state["filename"])
+    model.id = state["id"]
+    model.unresolved_references = {
+        ref_id: [(rels[index], side) for index, side in ends]
+        for ref_id, ends in state["unresolved"]
+    }
+    model.seed_index(
+        [elems[index] if is_element else rels[index] for is_element, index in state["index"]],
+        state["packages"],
+        state["package_names"],
+    )
+    if state.get("frozen"):
+        _freeze_model(model)
@@ -0,0 +1,33 @@
+import gc
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+PAUSE_GC = False
+"""
+Whether building, loading and copying models pauses the cyclic garbage collector.
+Off by default, as gc.disable() affects the whole process, i.e. also the other
+threads of an application using the library. Applications building large models
+in a dedicated process (e.g. a batch job) can set it to speed the builds up.
+"""
+
+
+@contextmanager
+def paused_gc(enabled: Optional[bool] = None) -> Iterator[None]:
+    """
+    Disables the cyclic garbage collector for the duration of the block, if pausing
+    is enabled. Building a model allocates millions of objects, which would
+    otherwise trigger repeated full collections over the whole (still growing) heap.
+
+    :arg enabled - whether to pause the collector, PAUSE_GC by default.
+    """
+    if not (PAUSE_GC if enabled is None else enabled):
+        yield
+        return
+
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if was_enabled:
+            gc.enable()
@@ -0,0 +1,8 @@
+"""
+UML Model serializer module
+
+The module includes the following:
+- Serializer
+- XMLSerializer
+- EnterpriseArchitectXMLSerializer
+"""
@@ -1,17 +1,418 @@
-from model.model import UMLModel
+from __future__ import annotations
 
+import logging
+import uuid
+from abc import ABC, abstractmethod
+from io import BytesIO
+from typing import IO, Any, Iterable, Optional
+from xml.sax.saxutils import XMLGenerator
 
-class Serializer:
-    def __init__(self) -> None:
-        pass
+from uml_interpreter.deserializer.enterprise_architect.constants import (
+    CLASS_IFACE_MAPPING,
+    CLASS_REL_MAPPING_TYPE,
+    CONN_REL_MAPPING_TYPE,
+    DESERIALIZER_CONSTANTS,
+    EA_ATTR_MAPPING,
+)
+from uml_interpreter.model.abstract import UMLObject
+from uml_interpreter.model.diagrams.abstract import UMLDiagram
+from uml_interpreter.model.diagrams.class_diagram import (
+    ClassDiagram,
+    ClassDiagramElement,
+    ClassDiagramMethod,
+    ClassRelationship,
+    RelationshipType,
+)
+from uml_interpreter.model.model import UMLModel
+
+_XMI_NAMESPACE = DESERIALIZER_CONSTANTS["XMI2_1"].strip("{}")
+_UML_NAMESPACE = DESERIALIZER_CONSTANTS["UML2_1"].strip("{}")
+_EXPORTER = {"exporter": "Enterprise Architect", "exporterVersion": "6.5"}
+
+_ELEMENT_TYPES: dict[type[ClassDiagramElement], str] = {
+    cls: elem_type for elem_type, cls in CLASS_IFACE_MAPPING.items()
+}
+"""
+Class of the element -> xmi:type of its packagedElement.
+"""
+
+_UML_RELATIONSHIP_TYPES: dict[RelationshipType, str] = {
+    rel_type: elem_type for elem_type, rel_type in CLASS_REL_MAPPING_TYPE.items()
+}
+"""
+Types of relationships written to the UML section -> xmi:type of their packagedElement.
+Relationships of other types are written as connectors of the extension section.
+"""
+
+_CONNECTOR_TYPES: dict[RelationshipType, str] = {}
+"""
+Relationship type -> ea_type of its connector (the first one mapped to the type).
+"""
+for _connector_type, _rel_type in CONN_REL_MAPPING_TYPE.items():
+    _CONNECTOR_TYPES.setdefault(_rel_type, _connector_type)
+
+_TYPE_REFERENCES: dict[str, str] = {
+    type_name: reference for reference, type_name in EA_ATTR_MAPPING.items()
+}
+"""
+Name of the attribute's or parameter's type -> its EA reference. Types without
+a reference are written as they are (and read back as unknown, empty types).
+"""
+
+_UNLIMITED = "inf"
 
-    def save_to_file(self, path: str) -> UMLModel:
-        raise Exception
+_EA_ID_PREFIX = "EAID_"
+_EA_ID_LENGTH = len(_EA_ID_PREFIX) + 36
+"""
+Length of EA IDs - the prefix followed by a GUID with underscores.
+"""
+
+
+class Serializer(ABC):
+    @abstractmethod
+    def write_model(self, model: UMLModel, stream: IO) -> None:
+        """
+        Writes the model to the binary (or text) stream.
+        """
+
+    def save_to_file(self, model: UMLModel, path: str) -> None:
+        with open(path, "wb") as stream:
+            self.write_model(model, stream)
+
+    def to_bytes(self, model: UMLModel) -> bytes:
+        stream = BytesIO()
+        self.write_model(model, stream)
+        return stream.getvalue()
 
 
 class XMLSerializer(Serializer):
-    pass
+    def __init__(self, encoding: str = "utf-8", indent: Optional[str] = "\t") -> None:
+        """
+        :arg indent - string indenting each level of nested tags,
+            the whole document is written in a single line if None.
+        """
+        self.encoding = encoding
+        self.indent = indent
+
+
+class _XMLWriter:
+    """
+    Writes tags one by one through the incremental XMLGenerator,
+    so no part of the document is kept in memory.
+    """
+
+    def __init__(self, stream: IO, encoding: str, indent: Optional[str]) -> None:
+        self._generator = XMLGenerator(stream, encoding, short_empty_elements=True)
+        self._indent = indent
+        self._depth = 0
+        self._line_started = True
+        """
+        Whether nothing was written since the last line end (the XML declaration's).
+        """
+
+    def start_document(self) -> None:
+        self._generator.startDocument()
+
+    def end_document(self) -> None:
+        if self._indent is not None:
+            self._generator.ignorableWhitespace("\n")
+        self._generator.endDocument()
+
+    def start(self, tag: str, attributes: dict[str, Optional[str]]) -> None:
+        self._new_line()
+        self._generator.startElement(tag, _present(attributes))
+        self._depth += 1
+
+    def end(self, tag: str) -> None:
+        self._depth -= 1
+        self._new_line()
+        self._generator.endElement(tag)
+
+    def empty(self, tag: str, attributes: dict[str, Optional[str]]) -> None:
+        self._new_line()
+        self._generator.startElement(tag, _present(attributes))
+        self._generator.endElement(tag)
+
+    def _new_line(self) -> None:
+        if self._indent is not None and not self._line_started:
+            self._generator.ignorableWhitespace("\n" + self._indent * self._depth)
+        self._line_started = False
+
+
+def _present(attributes: dict[str, Optional[str]]) -> dict[str, str]:
+    """
+    Returns the attributes without the missing (None) values.
+    """
+    return {name: value for name, value in attributes.items() if value is not None}
 
 
 class EnterpriseArchitectXMLSerializer(XMLSerializer):
-    pass
+    """
+    Writes models as Enterprise Architect's XMI 2.1 documents, readable by
+    EAXMLDeserializer. Elements (grouped into their packages) and associations
+    are written to the UML section, other relationships as connectors, and
+    diagrams to the extension section. Objects without IDs get new ones.
+
+    Tags are streamed to the output as they are generated, without building
+    an ElementTree, so memory used doesn't grow with the size of the document.
+    """
+
+    def write_model(self, model: UMLModel, stream: IO) -> None:
+        writer = _XMLWriter(stream, self.encoding, self.indent)
+        ids = _ObjectIds()
+        unresolved = {
+            (rel, side): ref_id
+            for ref_id, ends in model.unresolved_references.items()
+            for rel, side in ends
+        }
+
+        writer.start_document()
+        writer.start(
+            "xmi:XMI",
+            {"xmlns:xmi": _XMI_NAMESPACE, "xmi:version": "2.1", "xmlns:uml": _UML_NAMESPACE},
+        )
+        writer.empty("xmi:Documentation", _EXPORTER)
+
+        index = model.index
+        packaged: dict[Optional[str], list[UMLObject]] = {}
+        """
+        Package ID -> elements and UML section relationships placed in it.
+        """
+        connectors: list[ClassRelationship] = []
+        for obj in index:
+            if isinstance(obj, ClassRelationship) and obj.type not in _UML_RELATIONSHIP_TYPES:
+                connectors.append(obj)
+            elif isinstance(obj, (ClassDiagramElement, ClassRelationship)):
+                packaged.setdefault(index.package_of(obj), []).append(obj)
+
+        writer.start("uml:Model", {"xmi:type": "uml:Model", "name": "EA_Model"})
+        package_names = index.package_names()
+        for package_id, objs in packaged.items():
+            if package_id is not None:
+                writer.start(
+                    "packagedElement",
+                    {
+                        "xmi:type": "uml:Package",
+                        "xmi:id": package_id,
+                        "name": package_names.get(package_id, ""),
+                    },
+                )
+            for obj in objs:
+                if isinstance(obj, ClassRelationship):
+                    self._write_relationship(writer, obj, ids, unresolved)
+                else:
+                    self._write_element(writer, obj, ids)
+            if package_id is not None:
+                writer.end("packagedElement")
+        writer.end("uml:Model")
+
+        writer.start("xmi:Extension", {"extender": "Enterprise Architect", "extenderID": "6.5"})
+        writer.start("connectors", {})
+        for rel in connectors:
+            self._write_connector(writer, rel, ids, unresolved)
+        writer.end("connectors")
+        self._write_diagrams(writer, model.diagrams, ids)
+        writer.end("xmi:Extension")
+
+        writer.end("xmi:XMI")
+        writer.end_document()
+
+    def _write_element(
+        self, writer: _XMLWriter, elem: ClassDiagramElement, ids: _ObjectIds
+    ) -> None:
+        elem_type = next(
+            (elem_type for cls, elem_type in _ELEMENT_TYPES.items() if isinstance(elem, cls)),
+            "uml:Class",
+        )
+        writer.start(
+            "packagedElement",
+            {"xmi:type": elem_type, "xmi:id": ids[elem], "name": elem.name, "visibility": "public"},
+        )
+        for attr in elem.attributes:
+            writer.start("ownedAttribute", {"xmi:type": "uml:Property", "name": attr.name})
+            writer.empty("type", _type_attributes(attr.type))
+            writer.end("ownedAttribute")
+        for meth in elem.methods:
+            self._write_method(writer, meth)
+        writer.end("packagedElement")
+
+    def _write_method(self, writer: _XMLWriter, meth: ClassDiagramMethod) -> None:
+        writer.start("ownedOperation", {"name": meth.name})
+        for param in meth.parameters:
+            writer.start("ownedParameter", {"name": param.name, "direction": "in"})
+            writer.empty("type", _type_attributes(param.type))
+            writer.end("ownedParameter")
+        if meth.ret_type:
+            writer.empty(
+                "ownedParameter",
+                {
+                    "name": "return",
+                    "direction": "return",
+                    "type": _TYPE_REFERENCES.get(meth.ret_type, meth.ret_type),
+                },
+            )
+        writer.end("ownedOperation")
+
+    def _write_relationship(
+        self,
+        writer: _XMLWriter,
+        rel: ClassRelationship,
+        ids: _ObjectIds,
+        unresolved: dict[tuple[ClassRelationship, str], str],
+    ) -> None:
+        """
+        Writes the relationship as packagedElement with an ownedEnd for each side.
+        IDs of the ends are derived from the relationship's ID (see _end_id).
+        """
+        if (ends_ids := _ends_ids(rel, ids, unresolved)) is None:
+            return
+
+        rel_id = ids[rel]
+        writer.start(
+            "packagedElement",
+            {
+                "xmi:type": _UML_RELATIONSHIP_TYPES[rel.type],
+                "xmi:id": rel_id,
+                "name": rel.name,
+                "visibility": "public",
+            },
+        )
+        for prefix, side, elem_id in (
+            ("EAID_dst", rel.target_side, ends_ids[1]),
+            ("EAID_src", rel.source_side, ends_ids[0]),
+        ):
+            end_id = _end_id(prefix, rel_id)
+            writer.empty("memberEnd", {"xmi:idref": end_id})
+            writer.start(
+                "ownedEnd",
+                {
+                    "xmi:type": "uml:Property",
+                    "xmi:id": end_id,
+                    "name": side.role,
+                    "association": rel_id,
+                },
+            )
+            writer.empty("type", {"xmi:idref": elem_id})
+            low, high = side.min_max_multiplicity
+            writer.empty("lowerValue", _bound_attributes(low))
+            writer.empty("upperValue", _bound_attributes(high))
+            writer.end("ownedEnd")
+        writer.end("packagedElement")
+
+    def _write_connector(
+        self,
+        writer: _XMLWriter,
+        rel: ClassRelationship,
+        ids: _ObjectIds,
+        unresolved: dict[tuple[ClassRelationship, str], str],
+    ) -> None:
+        if (connector_type := _CONNECTOR_TYPES.get(rel.type)) is None:
+            logging.log(
+                logging.INFO,
+                f"Relationship {rel.id} is of type {rel.type} without a connector type - skipped.",
+            )
+            return
+        if (ends_ids := _ends_ids(rel, ids, unresolved)) is None:
+            return
+
+        writer.start("connector", {"xmi:idref": ids[rel], "name": rel.name})
+        for tag, side, elem_id in (
+            ("source", rel.source_side, ends_ids[0]),
+            ("target", rel.target_side, ends_ids[1]),
+        ):
+            writer.start(tag, {"xmi:idref": elem_id})
+            if side.role is not None:
+                writer.empty("role", {"name": side.role})
+            writer.empty("type", {"multiplicity": _multiplicity_text(side.min_max_multiplicity)})
+            writer.end(tag)
+        writer.empty("properties", {"ea_type": connector_type, "direction": "Source -> Destination"})
+        writer.end("connector")
+
+    def _write_diagrams(
+        self, writer: _XMLWriter, diagrams: Iterable[UMLDiagram], ids: _ObjectIds
+    ) -> None:
+        """
+        Writes the diagrams, class diagrams with their elements
+        (other diagrams are written without any).
+        """
+        writer.start("diagrams", {})
+        for diagram in diagrams:
+            writer.start("diagram", {"xmi:id": ids[diagram]})
+            writer.empty("properties", {"name": diagram.name, "type": "Logical"})
+            if isinstance(diagram, ClassDiagram):
+                writer.start("elements", {})
+                for elem in diagram.elements:
+                    writer.empty("element", {"subject": ids[elem]})
+                writer.end("elements")
+            writer.end("diagram")
+        writer.end("diagrams")
+
+
+class _ObjectIds:
+    """
+    Object -> its ID, or a new EA-like ID generated once for objects without one.
+    """
+
+    def __init__(self) -> None:
+        self._generated: dict[int, tuple[Any, str]] = {}
+
+    def __getitem__(self, obj: UMLObject) -> str:
+        if obj.id is not None:
+            return obj.id
+        if (entry := self._generated.get(id(obj))) is None:
+            new_id = _EA_ID_PREFIX + str(uuid.uuid4()).upper().replace("-", "_")
+            # Objects are kept alive, so that their python ids aren't reused.
+            entry = self._generated[id(obj)] = (obj, new_id)
+        return entry[1]
+
+
+def _ends_ids(
+    rel: ClassRelationship,
+    ids: _ObjectIds,
+    unresolved: dict[tuple[ClassRelationship, str], str],
+) -> Optional[tuple[str, str]]:
+    """
+    Returns IDs of the elements on the relationship's ends. Unset ends referring
+    to unresolved IDs are written with these IDs, relationships with other unset
+    ends are skipped.
+    """
+    ends_ids: list[str] = []
+    for side, elem in (("source", rel.source), ("target", rel.target)):
+        if elem is not None:
+            ends_ids.append(ids[elem])
+        elif (ref_id := unresolved.get((rel, side))) is not None:
+            ends_ids.append(ref_id)
+        else:
+            logging.log(
+                logging.INFO,
+                f"Relationship {rel.id} has no {side} element - skipped.",
+            )
+            return None
+    return ends_ids[0], ends_ids[1]
+
+
+def _end_id(prefix: str, rel_id: str) -> str:
+    """
+    Returns the ID of the relationship's end. Like in EA exports, the prefix
+    replaces the first characters of EA IDs. Other IDs are appended
+    to the prefix whole, so that the ends of different relationships
+    don't share IDs.
+    """
+    if rel_id.startswith(_EA_ID_PREFIX) and len(rel_id) == _EA_ID_LENGTH:
+        return prefix + rel_id[len(_EA_ID_PREFIX) + 2 :]
+    return f"{prefix}_{rel_id}"
+
+
+def _type_attributes(type_name: str) -> dict[str, Optional[str]]:
+    return {"xmi:type": "uml:PrimitiveType", "href": _TYPE_REFERENCES.get(type_name, type_name)}
+
+
+def _bound_attributes(bound: Optional[str]) -> dict[str, Optional[str]]:
+    if bound == _UNLIMITED:
+        return {"xmi:type": "uml:LiteralUnlimitedNatural", "value": "-1"}
+    return {"xmi:type": "uml:LiteralInteger", "value": bound}
+
+
+def _multiplicity_text(multiplicity: tuple[Optional[str], Optional[str]]) -> str:
+    low, high = ("*" if bound == _UNLIMITED else bound or "0" for bound in multiplicity)
+    return f"{low}..{high}"
@@ -1,6 +1,12 @@
+from __future__ import annotations
+
 from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, Iterator, Optional
 import xml.etree.ElementTree as ET
 
+if TYPE_CHECKING:
+    from uml_interpreter.source.cache import ParseCache
+
 
 class Source(ABC):
     @abstractmethod
@@ -9,6 +15,37 @@ class Source(ABC):
 
 
 class XMLSource(Source):
+    STREAM_EVENTS = ("start", "end")
+    """
+    Parser events emitted by read_events.
+    """
+
+    cache: Optional[ParseCache] = None
+    """
+    Cache of models parsed from the source, if the source supports it.
+    """
+
     @abstractmethod
     def read_tree(self) -> ET.ElementTree:
         pass
+
+    def read_events(self) -> Iterator[tuple[str, ET.Element]]:
+        """
+        Yields (event, element) pairs for every start and end tag of the document.
+        By default they are replayed from the tree returned by read_tree, sources
+        override it to parse the document incrementally instead of building
+        the whole tree upfront.
+        """
+        stack: list[tuple[ET.Element, Iterator[ET.Element]]] = []
+        root = self.read_tree().getroot()
+        yield "start", root
+        stack.append((root, iter(root)))
+        while stack:
+            parent, children = stack[-1]
+            child = next(children, None)
+            if child is None:
+                stack.pop()
+                yield "end", parent
+            else:
+                yield "start", child
+                stack.append((child, iter(child)))
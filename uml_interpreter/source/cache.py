@@ -0,0 +1,187 @@
+"""
+On-disk cache of parsed UML Models
+
+Entries are addressed by the hash of the source file's content, the library
+version, the version of the pickled model's state and the reader (deserializer
+class, hash of its code and mode), so a changed file, a library upgrade,
+a changed parser (also in source-tree installs, whose version never changes)
+or a different reader never hits a stale entry.
+Hashing is skipped when the file's mtime and size match the ones recorded
+when it was last hashed.
+
+The module includes the following:
+- ParseCache
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import pickle
+import tempfile
+from typing import TYPE_CHECKING, Optional
+
+from uml_interpreter import __version__
+from uml_interpreter.model.state import STATE_VERSION
+from uml_interpreter.model.utils import paused_gc
+
+if TYPE_CHECKING:
+    from uml_interpreter.model.model import UMLModel
+
+
+class ParseCache:
+    ENTRY_SUFFIX = ".model"
+    ENTRY_MAGIC = b"UMLIMDL1"
+    CHECKSUM_SIZE = 32
+    PATHS_INDEX = "paths.json"
+    HASH_CHUNK_SIZE = 1 << 20
+
+    def __init__(self, directory: str, max_size: int = 1 << 30) -> None:
+        """
+        :arg directory - directory storing the entries, created if missing.
+        :arg max_size - size budget of all entries in bytes. Least recently
+            used entries are evicted when it is exceeded.
+        """
+        self.directory = directory
+        self.max_size = max_size
+        os.makedirs(directory, exist_ok=True)
+        self._paths_index: Optional[dict[str, list]] = None
+        """
+        Path -> [mtime_ns, size, content hash] of the files hashed so far.
+        """
+
+    def get(self, path: str, reader: str = "") -> Optional[UMLModel]:
+        """
+        Returns the model cached for the current content of the file, or None.
+        Corrupted entries are removed.
+
+        :arg reader - identifies the way the model is read (e.g. deserializer class,
+            its code and mode), models read differently are cached separately.
+        """
+        entry_path = self._entry_path(path, reader)
+        try:
+            with open(entry_path, "rb") as entry:
+                data = entry.read()
+        except FileNotFoundError:
+            return None
+
+        try:
+            model = self._decode(data)
+        except Exception as exc:
+            logging.log(logging.INFO, f"Removing corrupted cache entry {entry_path}: {exc}")
+            self._remove(entry_path)
+            return None
+
+        # Entry's modification time orders the least recently used eviction.
+        os.utime(entry_path)
+        model.filename = path
+        return model
+
+    def put(self, path: str, model: UMLModel, reader: str = "") -> None:
+        """
+        Stores the model as parsed from the current content of the file
+        (see get for the reader).
+        """
+        entry_path = self._entry_path(path, reader)
+        self._write_atomic(entry_path, self._encode(model))
+        self._evict()
+
+    def clear(self) -> None:
+        for name in os.listdir(self.directory):
+            if name.endswith(self.ENTRY_SUFFIX) or name == self.PATHS_INDEX:
+                self._remove(os.path.join(self.directory, name))
+        self._paths_index = None
+
+    def size(self) -> int:
+        return sum(size for _, size, _ in self._entries())
+
+    def _encode(self, model: UMLModel) -> bytes:
+        payload = pickle.dumps(model, protocol=pickle.HIGHEST_PROTOCOL)
+        checksum = hashlib.blake2b(payload, digest_size=self.CHECKSUM_SIZE).digest()
+        return self.ENTRY_MAGIC + checksum + payload
+
+    def _decode(self, data: bytes) -> UMLModel:
+        header_size = len(self.ENTRY_MAGIC) + self.CHECKSUM_SIZE
+        if len(data) < header_size or not data.startswith(self.ENTRY_MAGIC):
+            raise ValueError("invalid header")
+
+        checksum, payload = data[len(self.ENTRY_MAGIC) : header_size], data[header_size:]
+        if hashlib.blake2b(payload, digest_size=self.CHECKSUM_SIZE).digest() != checksum:
+            raise ValueError("checksum mismatch")
+
+        with paused_gc():
+            return pickle.loads(payload)
+
+    def _entry_path(self, path: str, reader: str = "") -> str:
+        key = hashlib.sha256(
+            f"{self._content_hash(path)}:{__version__}:{STATE_VERSION}:{reader}".encode()
+        ).hexdigest()
+        return os.path.join(self.directory, key + self.ENTRY_SUFFIX)
+
+    def _content_hash(self, path: str) -> str:
+        real_path = os.path.realpath(path)
+        stat = os.stat(real_path)
+        paths_index = self._load_paths_index()
+
+        recorded = paths_index.get(real_path)
+        if recorded is not None and recorded[:2] == [stat.st_mtime_ns, stat.st_size]:
+            return recorded[2]
+
+        digest = hashlib.sha256()
+        with open(real_path, "rb") as source_file:
+            while chunk := source_file.read(self.HASH_CHUNK_SIZE):
+                digest.update(chunk)
+
+        paths_index[real_path] = [stat.st_mtime_ns, stat.st_size, digest.hexdigest()]
+        self._write_atomic(
+            os.path.join(self.directory, self.PATHS_INDEX),
+            json.dumps(paths_index).encode(),
+        )
+        return digest.hexdigest()
+
+    def _load_paths_index(self) -> dict[str, list]:
+        if self._paths_index is None:
+            try:
+                with open(os.path.join(self.directory, self.PATHS_INDEX), "rb") as index:
+                    self._paths_index = json.load(index)
+            except (FileNotFoundError, ValueError):
+                self._paths_index = {}
+        return self._paths_index
+
+    def _entries(self) -> list[tuple[float, int, str]]:
+        entries = []
+        for dir_entry in os.scandir(self.directory):
+            if dir_entry.name.endswith(self.ENTRY_SUFFIX):
+                try:
+                    stat = dir_entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, dir_entry.path))
+        return entries
+
+    def _evict(self) -> None:
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, entry_path in entries:
+            if total <= self.max_size:
+                break
+            self._remove(entry_path)
+            total -= size
+
+    def _write_atomic(self, path: str, data: bytes) -> None:
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as tmp_file:
+                tmp_file.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            self._remove(tmp_path)
+            raise
+
+    def _remove(self, path: str) -> None:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
@@ -1,13 +1,146 @@
+import gzip
+import io
+import lzma
+import mmap
+import zipfile
+from abc import abstractmethod
+from contextlib import contextmanager
+from typing import BinaryIO, ContextManager, Iterator, Optional, Union
 import xml.etree.ElementTree as ET
 from uml_interpreter.source.abstract import XMLSource
+from uml_interpreter.source.cache import ParseCache
 
 
-class FileSource(XMLSource):
-    def __init__(self, path: str) -> None:
-        self.path = path
+class BinaryStreamSource(XMLSource):
+    """
+    Source reading the document from a binary stream. The parser pulls the stream
+    in chunks, so the document is never held in memory as a whole apart from
+    the tree built from it.
+    """
+
+    @abstractmethod
+    def _open(self) -> ContextManager[BinaryIO]:
+        """
+        Opens a new binary stream of the document, closed on exiting the context.
+        """
+        pass
 
     def read_tree(self) -> ET.ElementTree:
-        return ET.parse(self.path)
+        with self._open() as stream:
+            return ET.parse(stream)
+
+    def read_events(self) -> Iterator[tuple[str, ET.Element]]:
+        with self._open() as stream:
+            yield from ET.iterparse(stream, events=self.STREAM_EVENTS)
+
+
+class FileSource(BinaryStreamSource):
+    def __init__(self, path: str, cache: Optional[ParseCache] = None) -> None:
+        self.path = path
+        self.cache = cache
+
+    def _open(self) -> ContextManager[BinaryIO]:
+        return open(self.path, "rb")
+
+
+class MmapFileSource(FileSource):
+    """
+    File source reading the document through a read-only memory map,
+    leaving the file's pages to the OS page cache instead of copying them
+    into read buffers.
+    """
+
+    @contextmanager
+    def _open(self) -> Iterator[BinaryIO]:
+        with open(self.path, "rb") as file, mmap.mmap(
+            file.fileno(), 0, access=mmap.ACCESS_READ
+        ) as mapped:
+            yield mapped
+
+
+class GzipFileSource(FileSource):
+    """
+    Source of a gzip compressed file, decompressed in chunks while being parsed.
+    """
+
+    def _open(self) -> ContextManager[BinaryIO]:
+        return gzip.open(self.path, "rb")
+
+
+class XzFileSource(FileSource):
+    """
+    Source of an xz (or lzma) compressed file, decompressed in chunks while being parsed.
+    """
+
+    def _open(self) -> ContextManager[BinaryIO]:
+        return lzma.open(self.path, "rb")
+
+
+class ZipFileSource(FileSource):
+    """
+    Source of a document stored in a zip archive, decompressed in chunks while being parsed.
+    """
+
+    def __init__(
+        self, path: str, member: Optional[str] = None, cache: Optional[ParseCache] = None
+    ) -> None:
+        """
+        :arg member - name of the archive's member holding the document.
+            If not given, the archive has to contain a single file.
+        """
+        super().__init__(path, cache)
+        self.member = member
+
+    @contextmanager
+    def _open(self) -> Iterator[BinaryIO]:
+        with zipfile.ZipFile(self.path) as archive:
+            member = self.member
+            if member is None:
+                files = [info for info in archive.infolist() if not info.is_dir()]
+                if len(files) != 1:
+                    raise ValueError(
+                        f"Archive {self.path} contains {len(files)} files, member name is required."
+                    )
+                member = files[0]
+            with archive.open(member) as stream:
+                yield stream
+
+
+class _BufferReader(io.RawIOBase):
+    """
+    Read-only stream over a buffer, returning slices of it without copying
+    the whole buffer upfront.
+    """
+
+    def __init__(self, buffer: memoryview) -> None:
+        self._buffer = buffer
+        self._position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, target) -> int:
+        chunk = self._buffer[self._position : self._position + len(target)]
+        target[: len(chunk)] = chunk
+        self._position += len(chunk)
+        return len(chunk)
+
+    def close(self) -> None:
+        # Releases the export of the buffer, so that e.g. an mmap can be closed.
+        self._buffer.release()
+        super().close()
+
+
+class BytesSource(BinaryStreamSource):
+    def __init__(self, data: Union[bytes, bytearray, memoryview]) -> None:
+        """
+        :arg data - encoded document. Any object supporting the buffer protocol is
+            accepted (e.g. an mmap), and is read without being copied as a whole.
+        """
+        self.data = data
+
+    def _open(self) -> ContextManager[BinaryIO]:
+        return io.BufferedReader(_BufferReader(memoryview(self.data).cast("B")))
 
 
 class StringSource(XMLSource):
@@ -16,3 +149,6 @@ class StringSource(XMLSource):
 
     def read_tree(self) -> ET.ElementTree:
         return ET.ElementTree(ET.fromstring(self.xmlstring))
+
+    def read_events(self) -> Iterator[tuple[str, ET.Element]]:
+        return ET.iterparse(io.StringIO(self.xmlstring), events=self.STREAM_EVENTS)
@@ -4,4 +4,7 @@ UML Model visitors module
 The module includes the following:
 - ModelVisitor
 - ModelPrinter
+- ModelWalk
+- walk_visitor
+- walk_visitors
 """
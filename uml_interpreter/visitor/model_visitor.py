@@ -1,7 +1,11 @@
 from __future__ import annotations
 
-from abc import ABC, abstractmethod
-from typing import TYPE_CHECKING
+import sys
+from abc import ABC
+from collections import deque
+from typing import TYPE_CHECKING, Any, Iterator, Optional, TextIO
+
+from uml_interpreter.visitor.walker import WalkAction, visiting, walk_visitor
 
 if TYPE_CHECKING:
     from uml_interpreter.model.model import UMLDiagram, UMLModel
@@ -14,157 +18,292 @@ if TYPE_CHECKING:
         ClassDiagramMethod,
         ClassDiagramMethodParameter,
         ClassRelationship,
+        Multiplicity,
+        RelationshipType,
     )
 
 
 class ModelVisitor(ABC):
-    @abstractmethod
+    """
+    Visits objects of the model, in one of two ways:
+
+    - walked visitors (setting walked) visit single objects - children of the
+      objects are walked by walk_visitor (or UMLModel.walk), which calls
+      visit_* methods on entering the objects and leave on leaving them.
+      visit_* methods can return WalkAction.PRUNE to skip the children
+      of the visited object. accept() of any object of the model walks its
+      whole subtree with such visitors (see walk).
+    - other visitors descend to the children themselves, calling their accept()
+      in visit_* methods, which visits only the given object. walk_visitor
+      doesn't walk them, but passes them once to accept() of the root.
+
+    visit_* methods do nothing by default, subclasses override the ones of the
+    objects they handle - the others aren't called by walk_visitors at all.
+    """
+
+    walked: bool = False
+    """
+    Whether the visitor leaves walking the children of the objects to the walker.
+    """
+
     def visit_model(self, model: UMLModel):
         pass
 
-    @abstractmethod
     def visit_diagram(self, diag: UMLDiagram):
         pass
 
-    @abstractmethod
     def visit_class_diagram(self, diag: ClassDiagram):
         pass
 
-    @abstractmethod
     def visit_class_diagram_element(self, elem: ClassDiagramElement):
         pass
 
-    @abstractmethod
     def visit_class_diagram_class(self, elem: ClassDiagramClass):
         pass
 
-    @abstractmethod
     def visit_class_diagram_interface(self, elem: ClassDiagramInterface):
         pass
 
-    @abstractmethod
     def visit_class_relationship(self, diag: ClassRelationship):
         pass
 
-    @abstractmethod
     def visit_class_diagram_attribute(self, diag: ClassDiagramAttribute):
         pass
 
-    @abstractmethod
     def visit_diagram_method(self, diag: ClassDiagramMethod):
         pass
 
-    @abstractmethod
     def visit_class_diagram_method_parameter(self, diag: ClassDiagramMethodParameter):
         pass
 
+    def leave(self, obj: Any) -> None:
+        """
+        Called after visiting the object and all its children.
+        """
+
+    def walk(self, root: Any) -> None:
+        """
+        Visits the root and all its descendants, called by accept()
+        of the model's objects for walked visitors.
+        """
+        walk_visitor(self, root)
+
 
 class ModelPrinter(ModelVisitor):
     """
-    Used to print out UML Model's hierarchical structure to the user's console.
+    Used to print out UML Model's hierarchical structure to the user's console
+    (or any other text stream). Objects are printed on entering them during
+    the walk (see walk_visitor), indented by their level in the model's
+    hierarchy, relative to the walk's root.
+
+    Lines are buffered and written to the stream in chunks of about buffer_size
+    characters - call flush() after walking, or use write(), which does it.
+    lines() yields the lines lazily instead, without writing them anywhere.
+    accept() of any object of the model prints it as write() does.
+    """
+
+    walked = True
+
+    _MODEL_LEVEL, _DIAGRAM_LEVEL, _ELEMENT_LEVEL = range(3)
+    _GROUP_LEVEL, _MEMBER_LEVEL, _PARAMETER_LEVEL = range(3, 6)
+    """
+    Levels of the objects in the model's hierarchy, group headers placed between
+    elements and their members.
     """
 
-    def __init__(self, indent: int = 0, indent_inc: int = 2) -> None:
+    def __init__(
+        self,
+        indent: int = 0,
+        indent_inc: int = 2,
+        stream: Optional[TextIO] = None,
+        buffer_size: int = 1 << 16,
+    ) -> None:
+        """
+        :arg stream - stream the lines are written to, sys.stdout (at the time
+            of writing) if not given.
+        :arg buffer_size - number of buffered characters, after which the lines
+            are written to the stream.
+        """
         self._indent = indent
         self._indent_inc = indent_inc
+        self._stream = stream
+        self._buffer_size = buffer_size
+        self._lines: list[str] = []
+        """
+        Lines printed, not written to the stream yet.
+        """
+        self._buffered = 0
+        self._yielding = False
+        """
+        Whether the lines are yielded by lines() instead of being written to the stream.
+        """
+        self._prefixes: dict[int, str] = {}
+        """
+        Indentation -> prefix of the lines.
+        """
+        self._relationship_lines: dict[ClassRelationship, str] = {}
+        """
+        Relationship -> its line, built at the first of its ends and reused at the other.
+        """
+        self._type_names: dict[RelationshipType, str] = {}
+        self._multiplicity_texts: dict[Multiplicity, str] = {}
+        self._base_indent = indent
+        self._root_level: Optional[int] = None
+        """
+        Level of the first visited object, printed with the initial indentation.
+        """
+        self._groups: deque[tuple[str, int]] = deque()
+        """
+        Headers and sizes of the member groups of the visited element, not printed yet.
+        """
+        self._group_left = 0
+        """
+        Number of members of the current group, not printed yet.
+        """
 
     def visit_model(self, model: UMLModel) -> None:
+        self._indent_to(self._MODEL_LEVEL)
         self.print("Model:")
 
-        self.incr_ident()
-        for diagram in model.diagrams:
-            diagram.accept(self)
-        self.decr_ident()
-
     def visit_diagram(self, diagram: UMLDiagram) -> None:
+        self._indent_to(self._DIAGRAM_LEVEL)
         self.print(f'UML Diagram: "{diagram.name}"')
 
     def visit_class_diagram(self, diagram: ClassDiagram) -> None:
+        self._indent_to(self._DIAGRAM_LEVEL)
         self.print(f'Class Diagram: "{diagram.name}"')
 
-        self.incr_ident()
-        for elem in diagram.elements:
-            elem.accept(self)
-        self.decr_ident()
-
     def visit_class_diagram_element(self, elem: ClassDiagramElement):
-        self.print(f'Element: "{elem.name}" id: {elem.id}')
-
-        self.incr_ident()
-        self._visit_class_diagram_element_data(elem)
-        self.decr_ident()
+        self._visit_element(elem, f'Element: "{elem.name}" id: {elem.id}')
 
     def visit_class_diagram_class(self, elem: ClassDiagramClass):
-        self.print(f'Class: "{elem.name}" id: {elem.id}')
-
-        self.incr_ident()
-        self._visit_class_diagram_element_data(elem)
-        self.decr_ident()
+        self._visit_element(elem, f'Class: "{elem.name}" id: {elem.id}')
 
     def visit_class_diagram_interface(self, elem: ClassDiagramInterface):
-        self.print(f'Interface: "{elem.name}" id: {elem.id}')
-
-        self.incr_ident()
-        self._visit_class_diagram_element_data(elem)
-        self.decr_ident()
-
-    def _visit_class_diagram_element_data(self, elem: ClassDiagramElement):
-        if elem.relations_from:
-            self.print("Relationships (target):")
-            self.incr_ident()
-            for rel in elem.relations_from:
-                rel.accept(self)
-            self.decr_ident()
-
-        if elem.relations_to:
-            self.print("Relationships (source):")
-            self.incr_ident()
-            for rel in elem.relations_to:
-                rel.accept(self)
-            self.decr_ident()
-
-        if elem.attributes:
-            self.print("Attributes:")
-            self.incr_ident()
-            for attr in elem.attributes:
-                attr.accept(self)
-            self.decr_ident()
-
-        if elem.methods:
-            self.print("Methods:")
-            self.incr_ident()
-            for meth in elem.methods:
-                meth.accept(self)
-            self.decr_ident()
+        self._visit_element(elem, f'Interface: "{elem.name}" id: {elem.id}')
+
+    def _visit_element(self, elem: ClassDiagramElement, mess: str) -> None:
+        """
+        Members of the element are walked in the order of the groups, the first
+        member of each group is preceded by the group's header.
+        """
+        self._indent_to(self._ELEMENT_LEVEL)
+        self.print(mess)
+        self._groups = deque(
+            (header, len(members))
+            for header, members in (
+                ("Relationships (target):", elem.relations_from),
+                ("Relationships (source):", elem.relations_to),
+                ("Attributes:", elem.attributes),
+                ("Methods:", elem.methods),
+            )
+            if members
+        )
+        self._group_left = 0
+
+    def _visit_member(self) -> None:
+        if not self._group_left and self._groups:
+            header, self._group_left = self._groups.popleft()
+            self._indent_to(self._GROUP_LEVEL)
+            self.print(header)
+        self._group_left -= 1
+        self._indent_to(self._MEMBER_LEVEL)
 
     def visit_class_relationship(self, rel: ClassRelationship):
         from uml_interpreter.model.diagrams.class_diagram import ClassDiagramElement
 
+        self._visit_member()
         if isinstance(rel.source, ClassDiagramElement) and isinstance(
             rel.target, ClassDiagramElement
         ):
-            self.print(
-                f"{rel.type} ({rel.name}) - {rel.source.name} ({rel.source_side.role})[{rel.source_side.min_max_multiplicity[0]}..."
-                + f"{rel.source_side.min_max_multiplicity[1]}] -> [{rel.target_side.min_max_multiplicity[0]}..."
-                + f"{rel.target_side.min_max_multiplicity[1]}] ({rel.target_side.role}) {rel.target.name}"
+            if (line := self._relationship_lines.pop(rel, None)) is None:
+                line = self._relationship_lines[rel] = self._relationship_line(rel)
+            self.print(line)
+
+    def _relationship_line(self, rel: ClassRelationship) -> str:
+        if (type_name := self._type_names.get(rel.type)) is None:
+            type_name = self._type_names[rel.type] = str(rel.type)
+        source, target = rel.source_side, rel.target_side
+        return (
+            f"{type_name} ({rel.name}) - {source.element.name} ({source.role})"
+            f"{self._multiplicity_text(source.min_max_multiplicity)} -> "
+            f"{self._multiplicity_text(target.min_max_multiplicity)}"
+            f" ({target.role}) {target.element.name}"
+        )
+
+    def _multiplicity_text(self, multiplicity: Multiplicity) -> str:
+        if (text := self._multiplicity_texts.get(multiplicity)) is None:
+            text = self._multiplicity_texts[multiplicity] = (
+                f"[{multiplicity[0]}...{multiplicity[1]}]"
             )
+        return text
 
     def visit_class_diagram_attribute(self, attr: ClassDiagramAttribute):
+        self._visit_member()
         self.print(f"{attr.name}: {attr.type}")
 
     def visit_diagram_method(self, meth: ClassDiagramMethod):
+        self._visit_member()
         self.print(
             f"{meth.name}: {[f'{param.name}: {param.type}' for param in meth.parameters]} -> {meth.ret_type}"
         )
+        # Parameters are printed together with the method.
+        return WalkAction.PRUNE
 
     def visit_class_diagram_method_parameter(self, param: ClassDiagramMethodParameter):
+        self._indent_to(self._PARAMETER_LEVEL)
         self.print(f"{param.name}: {param.type}")
 
+    def _indent_to(self, level: int) -> None:
+        if self._root_level is None:
+            self._root_level = level
+        self._indent = self._base_indent + (level - self._root_level) * self._indent_inc
+
     def incr_ident(self) -> None:
         self._indent = self._indent + self._indent_inc
 
     def decr_ident(self) -> None:
         self._indent = self._indent - self._indent_inc
 
+    def write(self, root: Any) -> None:
+        """
+        Prints the root (e.g. UMLModel) and all its descendants to the stream.
+        """
+        self._yielding = False
+        walk_visitor(self, root)
+        self.flush()
+
+    def walk(self, root: Any) -> None:
+        self.write(root)
+
+    def lines(self, root: Any) -> Iterator[str]:
+        """
+        Yields the lines (without line ends) printing the root and its descendants,
+        walking only as far as the lines are consumed.
+        """
+        lines = self._lines
+        self._yielding = True
+        for _ in visiting((self,), root):
+            if lines:
+                yield from lines
+                lines.clear()
+                self._buffered = 0
+
+    def flush(self) -> None:
+        """
+        Writes the buffered lines to the stream.
+        """
+        if self._lines:
+            stream = self._stream or sys.stdout
+            self._lines.append("")
+            stream.write("\n".join(self._lines))
+            self._lines.clear()
+            self._buffered = 0
+
     def print(self, mess: str) -> None:
-        print("|" + "-" * self._indent + mess)
+        if (prefix := self._prefixes.get(self._indent)) is None:
+            prefix = self._prefixes[self._indent] = "|" + "-" * self._indent
+        self._lines.append(prefix + mess)
+        self._buffered += len(mess)
+        if self._buffered >= self._buffer_size and not self._yielding:
+            self.flush()
@@ -0,0 +1,257 @@
+"""
+Iterative traversal of UML Models
+
+Objects are walked depth first with an explicit stack of child iterators, so
+neither deep models nor long chains of nested objects grow the call stack.
+Children of an object are the items of its collections named by the class's
+_child_fields (e.g. diagrams of a model, elements of a class diagram).
+
+The module includes the following:
+- WalkEvent
+- WalkAction
+- ModelWalk
+- walk_visitor
+- walk_visitors
+- visiting
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from enum import Enum
+from functools import cache
+from itertools import chain
+from operator import attrgetter
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Iterator, Optional
+
+if TYPE_CHECKING:
+    from uml_interpreter.visitor.model_visitor import ModelVisitor
+
+
+class WalkEvent(Enum):
+    ENTER = "enter"
+    """
+    Object is reached, before its children.
+    """
+    LEAVE = "leave"
+    """
+    Object is left, after its children (or right after entering it, if pruned).
+    """
+
+
+class WalkAction(Enum):
+    PRUNE = "prune"
+    """
+    Returned by a visitor's visit_* method, skips the children of the visited object.
+    """
+
+
+_CHILD_READERS: dict[type, Optional[Callable[[Any], Iterable[Any]]]] = {}
+"""
+Class -> function returning the children of its instances, None for classes without children.
+"""
+
+
+def _child_reader(cls: type) -> Optional[Callable[[Any], Iterable[Any]]]:
+    if cls not in _CHILD_READERS:
+        fields: tuple[str, ...] = getattr(cls, "_child_fields", ())
+        if not fields:
+            reader = None
+        elif len(fields) == 1:
+            reader = attrgetter(fields[0])
+        else:
+            read = attrgetter(*fields)
+            reader = lambda obj: chain.from_iterable(read(obj))  # noqa: E731
+        _CHILD_READERS[cls] = reader
+    return _CHILD_READERS[cls]
+
+
+class ModelWalk(Iterator):
+    """
+    Depth first, pre-order walk over an object of the model and its descendants.
+
+    Yields (depth, object) pairs, the root being at depth 0. If created with
+    events, yields (event, depth, object) triples instead - ENTER before and
+    LEAVE after the object's descendants.
+    """
+
+    __slots__ = ("_root", "_events", "_pruned", "_steps")
+
+    def __init__(self, root: Any, events: bool = False) -> None:
+        self._root = root
+        self._events = events
+        self._pruned = False
+        self._steps = self._walk()
+
+    def __iter__(self) -> Iterator[tuple]:
+        # Loops step the generator directly, without calls of __next__.
+        return self._steps
+
+    def __next__(self) -> tuple:
+        return next(self._steps)
+
+    def prune(self) -> None:
+        """
+        Skips the descendants of the object yielded (entered) last.
+        """
+        self._pruned = True
+
+    def _walk(self) -> Iterator[tuple]:
+        events = self._events
+        enter, leave = WalkEvent.ENTER, WalkEvent.LEAVE
+        readers = _CHILD_READERS
+        root = self._root
+
+        yield (enter, 0, root) if events else (0, root)
+        stack: list[tuple[Any, Iterator[Any]]] = []
+        if not self._pruned and (read := _child_reader(type(root))) is not None:
+            stack.append((root, iter(read(root))))
+        elif events:
+            yield leave, 0, root
+
+        while stack:
+            parent, children = stack[-1]
+            depth = len(stack)
+            for child in children:
+                self._pruned = False
+                yield (enter, depth, child) if events else (depth, child)
+                if not self._pruned:
+                    cls = type(child)
+                    read = readers[cls] if cls in readers else _child_reader(cls)
+                    if read is not None:
+                        stack.append((child, iter(read(child))))
+                        break
+                if events:
+                    yield leave, depth, child
+            else:
+                stack.pop()
+                if events:
+                    yield leave, depth - 1, parent
+
+
+class _VisitRecorder:
+    """
+    Stands in for a visitor, telling which of the visit_* methods accept() calls.
+    """
+
+    walked = False
+
+    def __getattr__(self, name: str) -> Callable[[Any], str]:
+        return lambda obj: name
+
+
+@cache
+def _visit_method_name(cls: type) -> Optional[str]:
+    """
+    Returns the name of the visitor's method called by accept() of the class,
+    None if accept() doesn't call a single visitor's method.
+    """
+    try:
+        name = cls.accept(None, _VisitRecorder())
+    except Exception:
+        return None
+    return name if isinstance(name, str) else None
+
+
+class _DispatchTable(dict):
+    """
+    Class -> (visitor number, bound visit_* method) pairs of the visitors
+    overriding the method called by accept() of the class. Built once per
+    class met during the walk.
+    """
+
+    def __init__(self, visitors: list[ModelVisitor]) -> None:
+        super().__init__()
+        self._visitors = visitors
+
+    def __missing__(self, cls: type) -> tuple[tuple[int, Callable[[Any], Any]], ...]:
+        from uml_interpreter.visitor.model_visitor import ModelVisitor
+
+        name = _visit_method_name(cls)
+        handlers: list[tuple[int, Callable[[Any], Any]]] = []
+        for number, visitor in enumerate(self._visitors):
+            if name is None:
+                handlers.append((number, lambda obj, visitor=visitor: obj.accept(visitor)))
+            elif getattr(type(visitor), name, None) is not getattr(ModelVisitor, name, None):
+                handlers.append((number, getattr(visitor, name)))
+        self[cls] = handlers = tuple(handlers)
+        return handlers
+
+
+def walk_visitor(visitor: ModelVisitor, root: Any) -> None:
+    """
+    Visits the root and all its descendants, calling visit_* methods of the visitor
+    on entering, and its leave method on leaving the objects. Walked visitors
+    (see ModelVisitor.walked) don't descend to the children themselves, and can
+    return WalkAction.PRUNE to skip the children of the visited object. Other
+    visitors are passed to accept() of the root only, before the walk.
+    """
+    walk_visitors((visitor,), root)
+
+
+def walk_visitors(visitors: Iterable[ModelVisitor], root: Any) -> None:
+    """
+    Runs all the visitors in a single walk over the root and its descendants,
+    calling the visitors in the given order on each object (see walk_visitor).
+    Children of an object pruned by some of the visitors are visited only by
+    the others, and aren't walked at all if all the visitors prune them.
+    """
+    deque(visiting(visitors, root), maxlen=0)
+
+
+def visiting(visitors: Iterable[ModelVisitor], root: Any) -> Iterator[Any]:
+    """
+    Generator form of walk_visitors, yielding each object once the visitors
+    visited it, so that the walk can be interleaved with consuming its results
+    or stopped early.
+    """
+    from uml_interpreter.visitor.model_visitor import ModelVisitor
+
+    visitors = list(visitors)
+    for visitor in visitors:
+        if not getattr(visitor, "walked", False):
+            # Visitor descends to the children itself.
+            root.accept(visitor)
+    visitors = [visitor for visitor in visitors if getattr(visitor, "walked", False)]
+    if not visitors:
+        return
+    dispatch = _DispatchTable(visitors)
+    leaves = tuple(
+        (number, visitor.leave)
+        for number, visitor in enumerate(visitors)
+        if type(visitor).leave is not ModelVisitor.leave
+    )
+    prune = WalkAction.PRUNE
+    enter = WalkEvent.ENTER
+    skipped: list[Optional[int]] = [None] * len(visitors)
+    """
+    Visitor number -> depth of the object whose children the visitor pruned.
+    """
+    skipping = 0
+
+    walk = ModelWalk(root, events=bool(leaves))
+    for step in walk:
+        if leaves:
+            event, depth, obj = step
+        else:
+            (depth, obj), event = step, enter
+
+        if skipping:
+            # Walk got out of the pruned subtrees (or back to the pruned object).
+            for number, pruned_depth in enumerate(skipped):
+                if pruned_depth is not None and depth <= pruned_depth:
+                    skipped[number] = None
+                    skipping -= 1
+
+        if event is enter:
+            for number, visit in dispatch[type(obj)]:
+                if skipped[number] is None and visit(obj) is prune:
+                    skipped[number] = depth
+                    skipping += 1
+            if skipping == len(visitors):
+                walk.prune()
+            yield obj
+        else:
+            for number, leave in leaves:
+                if skipped[number] is None:
+                    leave(obj)